@@ -1,24 +1,34 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 import os
 import sys
 import jwt
 import logging
+from typing import Any, Dict, Optional
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Importar configuración y componentes
-from config import DB_CONFIG, IMAGE_STORAGE_PATH, GEMINI_API_KEY, STABILITY_API_KEY, JWT_SECRET_KEY
+from config import (
+    DB_CONFIG, IMAGE_STORAGE_PATH, IMAGE_BLOB_GRACE_SECONDS, IMAGE_GC_GRACE_SECONDS, IMAGE_GC_INTERVAL_SECONDS,
+    IMAGE_STORAGE_LAYOUT, IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH,
+    PREVIEW_STORAGE_PATH, PREVIEW_TTL_SECONDS, PREVIEW_MAX_BYTES, IMAGE_SERVING_MODE, IMAGE_ACCEL_PREFIX,
+    GEMINI_API_KEY, STABILITY_API_KEY, JWT_SECRET_KEY, REPOSITORY_BACKEND, SQLITE_PATH, LOG_LEVEL, LOG_CONSOLE,
+    IMAGE_GC_RUN_IN_APP,
+    JSON_PROVIDER, COMPRESSION_ENABLED, REQUEST_MAX_DECOMPRESSED_BYTES
+)
 from domain.exceptions.domain_exceptions import DomainException
 # Importar implementaciones de repositorios
-from infrastructure.repositories.mysql_story_repository import MySQLStoryRepository
-from infrastructure.repositories.mysql_scenario_repository import MySQLScenarioRepository
-from infrastructure.repositories.mysql_image_repository import MySQLImageRepository
-from infrastructure.repositories.mysql_teacher_repository import MySQLTeacherRepository
+from infrastructure.repositories.repository_factory import create_repositories
 # Importar implementaciones de servicios
 from infrastructure.services.gemini_story_generator import GeminiStoryGenerator
 from infrastructure.services.gemini_scenario_extractor import GeminiScenarioExtractor
 from infrastructure.services.stability_ai_image_generator import StabilityAIImageGenerator
 from infrastructure.services.jwt_auth_service import JWTAuthService
+from infrastructure.storage.content_addressed_store import ContentAddressedImageStore
+from infrastructure.storage.image_garbage_collector import ImageGarbageCollector
+from infrastructure.storage.preview_image_store import PreviewImageStore
+from infrastructure.storage.storage_layout import StorageLayout
 # Importar servicios de aplicación
 from application.services.story_service import StoryService
 from application.services.scenario_service import ScenarioService
@@ -31,78 +41,165 @@ from presentation.api.story_routes import story_routes, init_routes as init_stor
 from presentation.api.image_routes import image_routes, init_routes as init_image_routes
 from presentation.api.auth_routes import auth_routes, init_routes as init_auth_routes
 from presentation.api.profile_routes import profile_routes, init_routes as init_profile_routes
+from presentation.api.static_routes import static_routes, init_routes as init_static_routes
+from presentation.middleware.read_your_writes import init_read_your_writes
+from presentation.middleware.query_profiler import init_query_profiler, PROFILE_HEADERS
+from presentation.middleware.json_provider import init_json_provider
+from presentation.middleware.compression import init_compression, create_response_compressor
 # Configuración de logging
 from utils.logging_config import configure_logging
+from utils.post_fork import register_post_fork_hook
 
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-CORS(app)
-# Configurar logging
-configure_logging(app)
 
-@app.errorhandler(Exception)
-def handle_exception(e):
-    if isinstance(e, DomainException):
+def create_app(config: Optional[Dict[str, Any]] = None) -> Flask:
+    """
+    Crea la aplicación con todos sus repositorios, servicios y rutas.
+
+    config sobrescribe valores de app.config, incluidos los que se toman de
+    config.py (REPOSITORY_BACKEND, SQLITE_PATH, GEMINI_API_KEY, STABILITY_API_KEY,
+    IMAGE_GC_INTERVAL_SECONDS, IMAGE_GC_RUN_IN_APP, JSON_PROVIDER, COMPRESSION_ENABLED).
+    Nada se construye al importar este módulo.
+
+    Los servicios de las rutas se guardan en app.extensions (ver
+    presentation/api/route_services.py): cada aplicación creada usa los suyos.
+
+    Los recursos que no pueden compartirse entre procesos (pools de conexiones,
+    canales gRPC de Gemini, locks) registran un hook post-fork: si un servidor
+    como gunicorn crea la aplicación antes de hacer fork de sus workers
+    (preload_app), cada worker los reinicializa al arrancar.
+    """
+    app = Flask(__name__)
+    app.config.update(
+        REPOSITORY_BACKEND=REPOSITORY_BACKEND,
+        SQLITE_PATH=SQLITE_PATH,
+        GEMINI_API_KEY=GEMINI_API_KEY,
+        STABILITY_API_KEY=STABILITY_API_KEY,
+        IMAGE_GC_INTERVAL_SECONDS=IMAGE_GC_INTERVAL_SECONDS,
+        IMAGE_GC_RUN_IN_APP=IMAGE_GC_RUN_IN_APP,
+        JSON_PROVIDER=JSON_PROVIDER,
+        COMPRESSION_ENABLED=COMPRESSION_ENABLED,
+        # En modo x-sendfile, send_file responde con la cabecera X-Sendfile en lugar de los bytes
+        USE_X_SENDFILE=IMAGE_SERVING_MODE == 'x-sendfile'
+    )
+    app.config.update(config or {})
+    backend = app.config['REPOSITORY_BACKEND']
+    # Serialización JSON rápida (orjson) para jsonify y request.get_json
+    init_json_provider(app, app.config['JSON_PROVIDER'])
+    CORS(app, expose_headers=["X-Primary-Pinned-Until", *PROFILE_HEADERS])
+    # Respuestas grandes comprimidas según Accept-Encoding y cuerpos de petición comprimidos
+    init_compression(
+        app, create_response_compressor() if app.config['COMPRESSION_ENABLED'] else None,
+        max_request_bytes=REQUEST_MAX_DECOMPRESSED_BYTES
+    )
+    # Configurar logging
+    configure_logging(app, LOG_LEVEL, LOG_CONSOLE)
+
+    @app.errorhandler(Exception)
+    def handle_exception(e):
+        # Respuestas HTTP (404, 416 de rangos no satisfacibles, etc.) se respetan tal cual
+        if isinstance(e, HTTPException):
+            return e
+        if isinstance(e, DomainException):
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'type': e.__class__.__name__
+            }), 400
+        
+        app.logger.exception("Error no manejado: %s", e)
         return jsonify({
             'success': False,
-            'error': str(e),
-            'type': e.__class__.__name__
-        }), 400
-    
-    app.logger.error(f"Error no manejado: {e}")
-    return jsonify({
-        'success': False,
-        'error': 'Error interno del servidor'
-    }), 500
-# Inicializar repositorios
-story_repository = MySQLStoryRepository()
-scenario_repository = MySQLScenarioRepository()
-image_repository = MySQLImageRepository()
-teacher_repository = MySQLTeacherRepository()
-# Inicializar servicios de dominio
-story_generator = GeminiStoryGenerator(GEMINI_API_KEY)
-scenario_extractor = GeminiScenarioExtractor(GEMINI_API_KEY)
-image_generator = StabilityAIImageGenerator(STABILITY_API_KEY, IMAGE_STORAGE_PATH)
-jwt_auth_service = JWTAuthService(teacher_repository)
-# Inicializar servicios de aplicación
-story_service = StoryService(story_generator, story_repository)
-scenario_service = ScenarioService(scenario_extractor, scenario_repository)
-image_service = ImageService(image_generator, image_repository)
-illustration_orchestrator = IllustrationOrchestratorService(
-    story_service, scenario_service, image_service
-)
-auth_service = AuthenticationService(jwt_auth_service, teacher_repository)
-profile_service = TeacherProfileService(teacher_repository)
-# Inicializar rutas con sus respectivos servicios
-init_story_routes(story_service, illustration_orchestrator, scenario_service, image_service)
-init_image_routes(image_service, IMAGE_STORAGE_PATH, story_service, scenario_service)
-init_auth_routes(auth_service)
-init_profile_routes(profile_service)
-# Registrar blueprints
-app.register_blueprint(story_routes, url_prefix='/api')
-app.register_blueprint(image_routes, url_prefix='/api')
-app.register_blueprint(auth_routes, url_prefix='/api/auth')
-app.register_blueprint(profile_routes, url_prefix='/api')
-# Exponer el servicio de autenticación globalmente
-app.auth_service = auth_service
+            'error': 'Error interno del servidor'
+        }), 500
+    # Inicializar repositorios (backend según REPOSITORY_BACKEND)
+    repositories = create_repositories(backend, app.config['SQLITE_PATH'])
+    # Inicializar servicios de dominio
+    story_generator = GeminiStoryGenerator(app.config['GEMINI_API_KEY'])
+    scenario_extractor = GeminiScenarioExtractor(app.config['GEMINI_API_KEY'])
+    storage_layout = StorageLayout.from_config(IMAGE_STORAGE_LAYOUT, IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH)
+    image_store = ContentAddressedImageStore(
+        IMAGE_STORAGE_PATH, grace_seconds=IMAGE_BLOB_GRACE_SECONDS, layout=storage_layout,
+        track_blobs=backend == 'mysql'
+    )
+    preview_store = PreviewImageStore(
+        PREVIEW_STORAGE_PATH, ttl_seconds=PREVIEW_TTL_SECONDS, max_bytes=PREVIEW_MAX_BYTES
+    )
+    image_generator = StabilityAIImageGenerator(
+        app.config['STABILITY_API_KEY'], IMAGE_STORAGE_PATH, image_store, preview_store
+    )
+    jwt_auth_service = JWTAuthService(repositories.teacher)
+    # Reinicializar en cada worker lo que no puede heredarse de un fork
+    for resource in (repositories.database, story_generator, scenario_extractor, preview_store):
+        register_post_fork_hook(resource.reset_after_fork)
+    # Inicializar servicios de aplicación
+    story_service = StoryService(story_generator, repositories.story, repositories.unit_of_work)
+    scenario_service = ScenarioService(scenario_extractor, repositories.scenario, repositories.unit_of_work)
+    image_service = ImageService(image_generator, repositories.image, repositories.unit_of_work)
+    illustration_orchestrator = IllustrationOrchestratorService(
+        story_service, scenario_service, image_service, repositories.unit_of_work
+    )
+    auth_service = AuthenticationService(jwt_auth_service, repositories.teacher)
+    profile_service = TeacherProfileService(repositories.teacher, repositories.teacher_stats)
+    # Inicializar rutas con sus respectivos servicios
+    init_story_routes(app, story_service, illustration_orchestrator, scenario_service, image_service)
+    init_image_routes(app, image_service, story_service, scenario_service)
+    init_auth_routes(app, auth_service)
+    init_profile_routes(app, profile_service)
+    init_static_routes(
+        app, IMAGE_STORAGE_PATH, PREVIEW_STORAGE_PATH, storage_layout,
+        mode=IMAGE_SERVING_MODE, internal_prefix=IMAGE_ACCEL_PREFIX, preview_cache_seconds=PREVIEW_TTL_SECONDS
+    )
+    # Registrar blueprints
+    app.register_blueprint(story_routes, url_prefix='/api')
+    app.register_blueprint(image_routes, url_prefix='/api')
+    app.register_blueprint(auth_routes, url_prefix='/api/auth')
+    app.register_blueprint(profile_routes, url_prefix='/api')
+    app.register_blueprint(static_routes)
+    # Lecturas en réplicas con consistencia de lectura tras escritura (ver DB_REPLICA_HOSTS)
+    init_read_your_writes(app)
+    # Conteo y tiempo de consultas por petición, consultas lentas y detección de N+1
+    init_query_profiler(app)
+    # Exponer el servicio de autenticación (auth_middleware lo usa vía current_app)
+    app.auth_service = auth_service
+    # Exponer lo que reutiliza el pipeline asíncrono de generación (ver asgi.py)
+    app.illustration_orchestrator = illustration_orchestrator
+    app.image_generator = image_generator
+    # Recolector de imágenes huérfanas en disco (opcional, ver IMAGE_GC_INTERVAL_SECONDS).
+    # Cada proceso que crea la aplicación programaría el suyo: con gunicorn corre
+    # solo en el maestro (when_ready en gunicorn.conf.py) y con uvicorn --workers N
+    # debe desactivarse (IMAGE_GC_RUN_IN_APP=false) y ejecutarse aparte. El
+    # recolector consulta la tabla images de MySQL: con otros backends no corre.
+    if backend == 'mysql' and app.config['IMAGE_GC_RUN_IN_APP'] and app.config['IMAGE_GC_INTERVAL_SECONDS'] > 0:
+        image_garbage_collector = ImageGarbageCollector(
+            IMAGE_STORAGE_PATH, grace_seconds=IMAGE_GC_GRACE_SECONDS, blob_store=image_store
+        )
+        image_garbage_collector.start_schedule(app.config['IMAGE_GC_INTERVAL_SECONDS'])
+
+    @app.route('/')
+    def index():
+        return jsonify({
+            'status': 'online',
+            'message': 'API de generación de cuentos ilustrados',
+            'version': '1.0.0'
+        })
 
-@app.route('/static/images/<path:filename>')
-def serve_image(filename):
-    return send_from_directory(IMAGE_STORAGE_PATH, filename)
+    @app.route('/health/db')
+    def database_health():
+        return jsonify({
+            'status': 'online',
+            'backend': backend,
+            'pool': repositories.database.stats() if backend == 'mysql' else None
+        })
 
-@app.route('/')
-def index():
-    return jsonify({
-        'status': 'online',
-        'message': 'API de generación de cuentos ilustrados',
-        'version': '1.0.0'
-    })
-# Punto de entrada principal
+    return app
+# Punto de entrada para desarrollo (en producción: gunicorn -c gunicorn.conf.py, ver README)
 if __name__ == '__main__':
     # Crear directorios necesarios
     os.makedirs(IMAGE_STORAGE_PATH, exist_ok=True)
     os.makedirs('logs', exist_ok=True)
+    app = create_app()
     # Verificar configuración crítica
     if not JWT_SECRET_KEY:
         logger.warning("JWT_SECRET_KEY no configurada. Se usará una clave predeterminada.")
@@ -117,4 +214,4 @@ if __name__ == '__main__':
     print(f"===========================")
     print(f"Servidor iniciado en http://localhost:5000")
     # Iniciar aplicación
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
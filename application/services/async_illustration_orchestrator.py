@@ -0,0 +1,185 @@
+import logging
+import asyncio
+from typing import Dict, Any, List
+from uuid import UUID
+
+from domain.entities.story import Story
+from domain.interfaces.services.image_generator import AsyncImageGeneratorService
+from domain.interfaces.services.scenario_extractor import AsyncScenarioExtractorService
+from domain.interfaces.services.story_generator import AsyncStoryGeneratorService
+from application.dtos.request_dtos import GenerateStoryRequest
+from application.services.illustration_orchestrator import IllustrationOrchestratorService
+
+logger = logging.getLogger(__name__)
+
+class AsyncIllustrationOrchestratorService:
+    """
+    Versión asíncrona del flujo de IllustrationOrchestratorService (cuento,
+    escenarios, imágenes y guardado) para el servidor ASGI.
+
+    Mientras espera a Gemini o a Stability AI la petición no ocupa un hilo, así que
+    un proceso puede sostener cientos de generaciones a la vez. Las imágenes de un
+    cuento se generan en paralelo con asyncio.gather, y cada paso tiene su propio
+    tiempo máximo: si se agota, el paso falla igual que si la API hubiera fallado.
+    La persistencia reutiliza el orquestador síncrono en un hilo del executor.
+    """
+
+    def __init__(
+        self,
+        story_generator: AsyncStoryGeneratorService,
+        scenario_extractor: AsyncScenarioExtractorService,
+        image_generator: AsyncImageGeneratorService,
+        orchestrator: IllustrationOrchestratorService,
+        story_timeout: float = 60,
+        scenarios_timeout: float = 60,
+        image_timeout: float = 90
+    ):
+        self.story_generator = story_generator
+        self.scenario_extractor = scenario_extractor
+        self.image_generator = image_generator
+        self.orchestrator = orchestrator
+        self.story_timeout = story_timeout
+        self.scenarios_timeout = scenarios_timeout
+        self.image_timeout = image_timeout
+
+    async def create_illustrated_story(self, request: GenerateStoryRequest, save_to_db: bool = True) -> Dict[str, Any]:
+        """
+        Crea un cuento ilustrado completo. Mismo resultado que
+        IllustrationOrchestratorService.create_illustrated_story.
+        """
+        try:
+            logger.info("Iniciando generación asíncrona de cuento ilustrado (save_to_db=%s)", save_to_db)
+
+            # Paso 1: Generar el cuento
+            story_result = await self._with_timeout(
+                self.story_generator.generate_story_async(
+                    context=request.context,
+                    category=request.category,
+                    pedagogical_approach=request.pedagogical_approach,
+                    target_age=request.target_age,
+                    max_length=request.max_length
+                ),
+                self.story_timeout,
+                {"success": False, "error": f"La generación del cuento superó {self.story_timeout:g}s"}
+            )
+
+            if not story_result.get("success", False):
+                logger.error("Error en generación de cuento: %s", story_result.get('error'))
+                return {
+                    "success": False,
+                    "error": story_result.get("error", "Error al generar el cuento"),
+                    "step": "story_generation"
+                }
+
+            story = Story(
+                title=story_result["title"],
+                content=story_result["content"],
+                context=request.context,
+                category=request.category,
+                pedagogical_approach=request.pedagogical_approach,
+                teacher_id=UUID(request.teacher_id) if request.teacher_id else None
+            )
+            logger.info("Cuento generado: %s", story.title)
+
+            # Paso 2: Extraer escenarios clave del cuento
+            scenarios_data = await self._with_timeout(
+                self.scenario_extractor.extract_scenarios_async(
+                    title=story.title,
+                    content=story.content,
+                    num_scenarios=request.num_illustrations or 6,
+                    pedagogical_approach=request.pedagogical_approach
+                ),
+                self.scenarios_timeout,
+                []
+            )
+
+            if not scenarios_data:
+                logger.warning("No se pudieron extraer escenarios")
+                return {
+                    "success": False,
+                    "error": "No se pudieron extraer escenarios del cuento",
+                    "step": "scenario_extraction",
+                    "story": story.to_dict()
+                }
+
+            scenarios = self.orchestrator.to_temp_scenarios(story, scenarios_data)
+            logger.debug("Se extrajeron %d escenarios", len(scenarios))
+
+            # Paso 3: Generar las imágenes de todos los escenarios en paralelo
+            images = await self._generate_images(scenarios, request.pedagogical_approach, preview=not save_to_db)
+
+            # Paso 4: Persistir todo de una vez
+            if save_to_db:
+                try:
+                    scenarios, images = await asyncio.to_thread(
+                        self.orchestrator.save_generated_story, story, scenarios, images
+                    )
+                except Exception as e:
+                    logger.error("Error al guardar el cuento ilustrado: %s", e)
+                    return {
+                        "success": False,
+                        "error": f"Error al guardar el cuento: {str(e)}",
+                        "step": "persistence"
+                    }
+
+            logger.info("Proceso completado: %d imágenes generadas", len(images))
+
+            return self.orchestrator.build_response(story, scenarios, images, save_to_db)
+
+        except Exception as e:
+            logger.exception("Error crítico en orchestrator asíncrono: %s", e)
+            return {
+                "success": False,
+                "error": f"Error interno en la generación: {str(e)}",
+                "step": "orchestrator_error"
+            }
+
+    async def _generate_images(
+        self,
+        scenarios: List[Dict[str, Any]],
+        pedagogical_approach: str,
+        preview: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        Genera la imagen de cada escenario a la vez. Como en el flujo síncrono, un
+        escenario cuya imagen falla (o supera image_timeout) queda sin imagen.
+        """
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(
+                    self.image_generator.generate_image_async(
+                        prompt=scenario["prompt_for_image"],
+                        pedagogical_approach=pedagogical_approach,
+                        style="children_illustration",
+                        width=512,
+                        height=512,
+                        preview=preview
+                    ),
+                    self.image_timeout
+                )
+                for scenario in scenarios
+            ),
+            return_exceptions=True
+        )
+
+        images = []
+        for i, (scenario, result) in enumerate(zip(scenarios, results)):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning("Imagen %d superó %gs", i + 1, self.image_timeout)
+            elif isinstance(result, Exception):
+                logger.warning("Error al generar imagen %d: %s", i + 1, result)
+            elif not result.get("success", False):
+                logger.warning("Error al generar imagen %d: %s", i + 1, result.get('error'))
+            else:
+                images.append(
+                    self.orchestrator.to_temp_image(scenario["id"], scenario["prompt_for_image"], result["image_url"])
+                )
+        return images
+
+    @staticmethod
+    async def _with_timeout(coroutine, timeout: float, on_timeout):
+        try:
+            return await asyncio.wait_for(coroutine, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Paso cancelado tras %gs", timeout)
+            return on_timeout
@@ -1,3 +1,4 @@
+import logging
 from typing import Dict, Any, Optional
 import bcrypt
 from uuid import UUID
@@ -6,6 +7,8 @@ from domain.interfaces.services.auth_service import AuthService
 from domain.interfaces.repositories.teacher_repository import TeacherRepository
 from domain.entities.teacher import Teacher
 
+logger = logging.getLogger(__name__)
+
 class AuthenticationService:
     
     def __init__(self, auth_service: AuthService, teacher_repository: TeacherRepository):
@@ -51,7 +54,7 @@ class AuthenticationService:
                 return None
             return teacher.to_dict(exclude=["password_hash"])
         except Exception as e:
-            print(f"Error al obtener el profesor: {e}")
+            logger.error("Error al obtener el profesor: %s", e)
             return None
     
     def update_profile(self, teacher_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,12 +1,20 @@
-from typing import Dict, Any, List
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
 from uuid import UUID
 
 from domain.entities.story import Story
-from application.dtos.request_dtos import GenerateStoryRequest, GenerateImageRequest
+from domain.entities.scenario import Scenario
+from domain.entities.image import Image
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
+from utils.helpers import uuid7
+from application.dtos.request_dtos import GenerateStoryRequest
 from application.services.story_service import StoryService
 from application.services.scenario_service import ScenarioService
 from application.services.image_service import ImageService
 
+logger = logging.getLogger(__name__)
+
 class IllustrationOrchestratorService:
     """
     Servicio orquestador que coordina el flujo completo de generación de cuentos ilustrados:
@@ -21,16 +29,22 @@ class IllustrationOrchestratorService:
         self,
         story_service: StoryService,
         scenario_service: ScenarioService,
-        image_service: ImageService
+        image_service: ImageService,
+        unit_of_work: UnitOfWork
     ):
         self.story_service = story_service
         self.scenario_service = scenario_service
         self.image_service = image_service
+        self.unit_of_work = unit_of_work
 
     def create_illustrated_story(self, request: GenerateStoryRequest, save_to_db: bool = True) -> Dict[str, Any]:
         """
         Crea un cuento ilustrado completo siguiendo el flujo de tres pasos.
         
+        Primero se genera todo el contenido (cuento, escenarios e imágenes) y, solo si
+        save_to_db es True, se persiste al final en una única transacción: un solo
+        commit, y ningún cuento a medio guardar si algo falla.
+        
         Args:
             request: Datos para generar el cuento
             save_to_db: Si True, persiste en BD. Si False, solo genera contenido temporal
@@ -39,72 +53,44 @@ class IllustrationOrchestratorService:
             Dict con story, scenarios, images y metadata
         """
         try:
-            print(f"🚀 Iniciando generación de cuento ilustrado (save_to_db={save_to_db})")
+            logger.info("Iniciando generación de cuento ilustrado (save_to_db=%s)", save_to_db)
             
             # Paso 1: Generar el cuento
-            print(f"📝 Paso 1: Generando cuento...")
+            logger.debug("Paso 1: Generando cuento")
+            story_result = self._generate_story_preview(request)
             
-            if save_to_db:
-                # Flujo normal: guardar en BD
-                story_result = self.story_service.generate_story(request)
-                
-                if not story_result.get("success", False):
-                    print(f"❌ Error en generación de cuento: {story_result.get('error')}")
-                    return {
-                        "success": False,
-                        "error": story_result.get("error", "Error al generar el cuento"),
-                        "step": "story_generation"
-                    }
-                
-                story_data = story_result["story"]
-                story = Story.from_dict(story_data)
-                
-            else:
-                # Flujo preview: generar sin guardar
-                story_result = self._generate_story_preview(request)
-                
-                if not story_result.get("success", False):
-                    print(f"❌ Error en generación de cuento preview: {story_result.get('error')}")
-                    return {
-                        "success": False,
-                        "error": story_result.get("error", "Error al generar el cuento"),
-                        "step": "story_generation"
-                    }
-                
-                # Crear entidad temporal sin ID de BD
-                story = Story(
-                    title=story_result["title"],
-                    content=story_result["content"],
-                    context=request.context,
-                    category=request.category,
-                    pedagogical_approach=request.pedagogical_approach,
-                    teacher_id=UUID(request.teacher_id) if request.teacher_id else None
-                )
-                story_data = story.to_dict()
+            if not story_result.get("success", False):
+                logger.error("Error en generación de cuento: %s", story_result.get('error'))
+                return {
+                    "success": False,
+                    "error": story_result.get("error", "Error al generar el cuento"),
+                    "step": "story_generation"
+                }
             
-            print(f"✅ Cuento generado: {story.title}")
+            story = Story(
+                title=story_result["title"],
+                content=story_result["content"],
+                context=request.context,
+                category=request.category,
+                pedagogical_approach=request.pedagogical_approach,
+                teacher_id=UUID(request.teacher_id) if request.teacher_id else None
+            )
+            story_data = story.to_dict()
+            
+            logger.info("Cuento generado: %s", story.title)
             
             # Paso 2: Extraer escenarios clave del cuento
-            print(f"🎬 Paso 2: Extrayendo escenarios...")
+            logger.debug("Paso 2: Extrayendo escenarios")
             num_illustrations = request.num_illustrations or 6
             
-            if save_to_db:
-                # Flujo normal: guardar escenarios en BD
-                scenarios = self.scenario_service.extract_scenarios(
-                    story=story,
-                    num_scenarios=num_illustrations,
-                    pedagogical_approach=request.pedagogical_approach
-                )
-            else:
-                # Flujo preview: generar escenarios temporales
-                scenarios = self._extract_scenarios_preview(
-                    story=story,
-                    num_scenarios=num_illustrations,
-                    pedagogical_approach=request.pedagogical_approach
-                )
+            scenarios = self._extract_scenarios_preview(
+                story=story,
+                num_scenarios=num_illustrations,
+                pedagogical_approach=request.pedagogical_approach
+            )
             
             if not scenarios:
-                print(f"❌ No se pudieron extraer escenarios")
+                logger.warning("No se pudieron extraer escenarios")
                 return {
                     "success": False,
                     "error": "No se pudieron extraer escenarios del cuento",
@@ -112,70 +98,148 @@ class IllustrationOrchestratorService:
                     "story": story_data
                 }
             
-            print(f"✅ Se extrajeron {len(scenarios)} escenarios")
+            logger.debug("Se extrajeron %d escenarios", len(scenarios))
             
             # Paso 3: Generar imágenes para cada escenario
-            print(f"🎨 Paso 3: Generando imágenes...")
+            logger.debug("Paso 3: Generando imágenes")
             images = []
             for i, scenario in enumerate(scenarios):
-                print(f"🖼️ Generando imagen {i+1}/{len(scenarios)}")
+                logger.debug("Generando imagen %d/%d", i + 1, len(scenarios))
+                
+                # En el flujo normal la imagen va directo al almacenamiento permanente
+                image_result = self._generate_image_preview(
+                    scenario_id=scenario["id"],
+                    prompt=scenario["prompt_for_image"],
+                    pedagogical_approach=request.pedagogical_approach,
+                    preview=not save_to_db
+                )
                 
-                if save_to_db:
-                    # Flujo normal: guardar imagen en BD
-                    image_request = GenerateImageRequest(
-                        prompt=scenario["prompt_for_image"],
-                        pedagogical_approach=request.pedagogical_approach,
-                        style="children_illustration"
-                    )
-                    
-                    image_result = self.image_service.generate_image(
-                        scenario_id=scenario["id"],
-                        request=image_request
-                    )
-                    
-                    if image_result.get("success", False):
-                        images.append(image_result["image"])
-                        print(f"✅ Imagen {i+1} generada exitosamente")
-                    else:
-                        print(f"⚠️ Error al generar imagen {i+1}: {image_result.get('error')}")
+                if image_result.get("success", False):
+                    images.append(image_result["image"])
+                    logger.debug("Imagen %d generada exitosamente%s", i + 1, '' if save_to_db else ' (preview)')
                 else:
-                    # Flujo preview: generar imagen temporal
-                    image_result = self._generate_image_preview(
-                        scenario_id=scenario["id"],
-                        prompt=scenario["prompt_for_image"],
-                        pedagogical_approach=request.pedagogical_approach
-                    )
-                    
-                    if image_result.get("success", False):
-                        images.append(image_result["image"])
-                        print(f"✅ Imagen {i+1} generada exitosamente (preview)")
-                    else:
-                        print(f"⚠️ Error al generar imagen {i+1}: {image_result.get('error')}")
+                    logger.warning("Error al generar imagen %d: %s", i + 1, image_result.get('error'))
             
-            print(f"🎉 Proceso completado: {len(images)} imágenes generadas")
+            # Paso 4: Persistir todo de una vez
+            if save_to_db:
+                logger.debug("Paso 4: Guardando cuento, escenarios e imágenes")
+                try:
+                    scenarios, images = self.save_generated_story(story, scenarios, images)
+                except Exception as e:
+                    logger.error("Error al guardar el cuento ilustrado: %s", e)
+                    return {
+                        "success": False,
+                        "error": f"Error al guardar el cuento: {str(e)}",
+                        "step": "persistence"
+                    }
             
-            # Construir respuesta
-            response = {
-                "success": True,
-                "story": story_data,
-                "scenarios": scenarios,
-                "images": images,
-                "summary": f"Cuento '{story.title}' generado con {len(scenarios)} escenarios y {len(images)} imágenes",
-                "mode": "saved" if save_to_db else "preview"  # Indicar el modo usado
-            }
+            logger.info("Proceso completado: %d imágenes generadas", len(images))
             
-            return response
+            return self.build_response(story, scenarios, images, save_to_db)
             
         except Exception as e:
-            print(f"💥 Error crítico en orchestrator: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error crítico en orchestrator: %s", e)
             return {
                 "success": False,
                 "error": f"Error interno en la generación: {str(e)}",
                 "step": "orchestrator_error"
             }
     
+    def save_illustrated_story(self, story: Story, scenarios: List[Scenario], images: List[Image]) -> UUID:
+        """
+        Persiste un cuento con sus escenarios e imágenes en una única unidad de trabajo.
+        Lanza la excepción original si falla; en ese caso no queda nada guardado.
+        """
+        with self.unit_of_work.transaction():
+            story_id = self.story_service.story_repository.create(story)
+            self.scenario_service.scenario_repository.create_many(scenarios)
+            self.image_service.image_repository.create_many(images)
+        
+        return story_id
+    
+    def save_generated_story(
+        self,
+        story: Story,
+        scenarios: List[Dict[str, Any]],
+        images: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Persiste un cuento recién generado a partir de los escenarios e imágenes
+        temporales (ver to_temp_scenarios y to_temp_image), conservando sus ids.
+        Retorna los escenarios e imágenes guardados como diccionarios.
+        """
+        scenario_entities = [
+            Scenario(
+                id=UUID(scenario["id"]),
+                story_id=story.id,
+                description=scenario["description"],
+                sequence_number=scenario["sequence_number"],
+                prompt_for_image=scenario["prompt_for_image"]
+            )
+            for scenario in scenarios
+        ]
+        image_entities = [
+            Image(
+                id=UUID(image["id"]),
+                scenario_id=UUID(image["scenario_id"]),
+                prompt=image["prompt"],
+                image_url=image["image_url"]
+            )
+            for image in images
+        ]
+        
+        self.save_illustrated_story(story, scenario_entities, image_entities)
+        
+        return [scenario.to_dict() for scenario in scenario_entities], [image.to_dict() for image in image_entities]
+    
+    @staticmethod
+    def build_response(
+        story: Story,
+        scenarios: List[Dict[str, Any]],
+        images: List[Dict[str, Any]],
+        save_to_db: bool
+    ) -> Dict[str, Any]:
+        """Respuesta de una generación completa."""
+        return {
+            "success": True,
+            "story": story.to_dict(),
+            "scenarios": scenarios,
+            "images": images,
+            "summary": f"Cuento '{story.title}' generado con {len(scenarios)} escenarios y {len(images)} imágenes",
+            "mode": "saved" if save_to_db else "preview"  # Indicar el modo usado
+        }
+    
+    @staticmethod
+    def to_temp_scenarios(story: Story, scenarios_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Escenarios temporales con IDs únicos que el frontend puede usar para
+        referencias locales antes de que (y aunque no) se guarden en BD.
+        """
+        return [
+            {
+                "id": str(uuid7()),  # ID temporal para referencias
+                "story_id": str(story.id),  # Referencia al story temporal
+                "description": scenario_data["description"],
+                "sequence_number": scenario_data["sequence_number"],
+                "prompt_for_image": scenario_data["prompt_for_image"],
+                "created_at": story.created_at.isoformat() if story.created_at else None,
+                "mode": "preview"  # Marcador para identificar que es temporal
+            }
+            for scenario_data in scenarios_data
+        ]
+    
+    @staticmethod
+    def to_temp_image(scenario_id: str, prompt: str, image_url: str) -> Dict[str, Any]:
+        """Imagen temporal (aún sin guardar en BD) de un escenario."""
+        return {
+            "id": str(uuid7()),  # ID temporal
+            "scenario_id": scenario_id,
+            "prompt": prompt,
+            "image_url": image_url,
+            "created_at": datetime.now().isoformat(),
+            "mode": "preview"  # Marcador temporal
+        }
+    
     def _generate_story_preview(self, request: GenerateStoryRequest) -> Dict[str, Any]:
         """
         Genera un cuento usando el story_generator pero sin persistir en BD.
@@ -209,7 +273,6 @@ class IllustrationOrchestratorService:
         para referencias locales pero que no persisten en la base de datos.
         """
         try:
-            from uuid import uuid4
             
             # Usar directamente el extractor de escenarios
             scenarios_data = self.scenario_service.scenario_extractor.extract_scenarios(
@@ -222,62 +285,37 @@ class IllustrationOrchestratorService:
             if not scenarios_data:
                 return []
             
-            # Crear escenarios temporales con IDs únicos para referencias
-            temp_scenarios = []
-            for scenario_data in scenarios_data:
-                temp_scenario = {
-                    "id": str(uuid4()),  # ID temporal para referencias
-                    "story_id": str(story.id),  # Referencia al story temporal
-                    "description": scenario_data["description"],
-                    "sequence_number": scenario_data["sequence_number"],
-                    "prompt_for_image": scenario_data["prompt_for_image"],
-                    "created_at": story.created_at.isoformat() if story.created_at else None,
-                    "mode": "preview"  # Marcador para identificar que es temporal
-                }
-                temp_scenarios.append(temp_scenario)
-            
-            return temp_scenarios
+            return self.to_temp_scenarios(story, scenarios_data)
             
         except Exception as e:
-            print(f"Error al extraer escenarios preview: {e}")
+            logger.error("Error al extraer escenarios preview: %s", e)
             return []
     
-    def _generate_image_preview(self, scenario_id: str, prompt: str, pedagogical_approach: str) -> Dict[str, Any]:
+    def _generate_image_preview(self, scenario_id: str, prompt: str, pedagogical_approach: str, preview: bool = True) -> Dict[str, Any]:
         """
-        Genera una imagen temporal sin guardar en BD.
+        Genera una imagen sin guardar en BD.
         
         Usa el generador de imágenes existente pero retorna datos temporales
-        que el frontend puede mostrar sin persistencia.
+        que el frontend puede mostrar sin persistencia. Con preview=False el
+        archivo se guarda directamente en el almacenamiento permanente.
         """
         try:
-            from uuid import uuid4
-            from datetime import datetime
-            
             # Usar directamente el generador de imágenes
             result = self.image_service.image_generator.generate_image(
                 prompt=prompt,
                 pedagogical_approach=pedagogical_approach,
                 style="children_illustration",
                 width=512,
-                height=512
+                height=512,
+                preview=preview
             )
             
             if not result.get("success", False):
                 return result
             
-            # Crear estructura de imagen temporal
-            temp_image = {
-                "id": str(uuid4()),  # ID temporal
-                "scenario_id": scenario_id,
-                "prompt": prompt,
-                "image_url": result["image_url"],
-                "created_at": datetime.now().isoformat(),
-                "mode": "preview"  # Marcador temporal
-            }
-            
             return {
                 "success": True,
-                "image": temp_image
+                "image": self.to_temp_image(scenario_id, prompt, result["image_url"])
             }
             
         except Exception as e:
@@ -290,39 +328,24 @@ class IllustrationOrchestratorService:
     def get_illustrated_story(self, story_id: str) -> Dict[str, Any]:
         """
         Obtiene un cuento ilustrado completo por su ID.
-        Este método no cambia - solo para cuentos ya guardados en BD.
+        Solo para cuentos ya guardados en BD.
         """
         try:
-            print(f"📖 Obteniendo cuento ilustrado: {story_id}")
+            logger.debug("Obteniendo cuento ilustrado: %s", story_id)
             
-            # Obtener el cuento
-            story_data = self.story_service.get_story_by_id(story_id)
+            # Obtener el cuento con sus escenarios e imágenes en una sola consulta
+            illustrated = self.story_service.get_illustrated_story(story_id)
             
-            if not story_data:
+            if not illustrated:
                 return {
                     "success": False,
                     "error": "Cuento no encontrado"
                 }
             
-            # Obtener los escenarios asociados al cuento
-            scenarios = self.scenario_service.get_scenarios_by_story(story_id)
-            
-            # Obtener las imágenes asociadas a los escenarios
-            images = self.image_service.get_images_by_story(story_id)
+            story_data = illustrated["story"]
+            scenarios_with_images = illustrated["scenarios"]
             
-            # Asociar cada imagen con su escenario correspondiente
-            scenario_images = {}
-            for image in images:
-                scenario_images[image["scenario_id"]] = image
-            
-            # Construir los escenarios con sus imágenes
-            scenarios_with_images = []
-            for scenario in scenarios:
-                scenario_copy = scenario.copy()
-                scenario_copy["image"] = scenario_images.get(scenario["id"])
-                scenarios_with_images.append(scenario_copy)
-            
-            print(f"✅ Cuento ilustrado obtenido: {len(scenarios_with_images)} escenarios")
+            logger.debug("Cuento ilustrado obtenido: %d escenarios", len(scenarios_with_images))
             
             # Preparar y retornar la respuesta completa
             return {
@@ -333,10 +356,49 @@ class IllustrationOrchestratorService:
             }
             
         except Exception as e:
-            print(f"💥 Error al obtener cuento ilustrado: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al obtener cuento ilustrado: %s", e)
             return {
                 "success": False,
                 "error": f"Error al obtener el cuento ilustrado: {str(e)}"
-            }
\ No newline at end of file
+            }
+    
+    def get_illustrated_stories(self, story_ids: List[str], teacher_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene varios cuentos ilustrados guardados, uno por cada id pedido y en el
+        mismo orden, con un estado individual en lugar de fallar el lote completo:
+        "ok", "not_found", "invalid_id" o "forbidden" (cuento de otro profesor).
+        """
+        parsed = {}
+        for story_id in story_ids:
+            try:
+                parsed[story_id] = UUID(str(story_id))
+            except ValueError:
+                continue
+        
+        found = self.story_service.get_illustrated_stories(list(parsed.values()))
+        logger.debug("Lote de cuentos ilustrados: %d de %d encontrados", len(found), len(story_ids))
+        
+        results = []
+        for story_id in story_ids:
+            if story_id not in parsed:
+                results.append({"id": story_id, "status": "invalid_id"})
+                continue
+            
+            illustrated = found.get(str(parsed[story_id]))
+            if not illustrated:
+                results.append({"id": story_id, "status": "not_found"})
+                continue
+            
+            owner = illustrated["story"].get("teacher_id")
+            if owner and teacher_id and owner != str(teacher_id):
+                results.append({"id": story_id, "status": "forbidden"})
+                continue
+            
+            results.append({
+                "id": story_id,
+                "status": "ok",
+                "story": illustrated["story"],
+                "scenarios": illustrated["scenarios"],
+                "mode": "saved"
+            })
+        return results
@@ -1,17 +1,22 @@
+import logging
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 
 from domain.interfaces.services.image_generator import ImageGeneratorService
 from domain.interfaces.repositories.image_repository import ImageRepository
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
 from domain.entities.image import Image
 from application.dtos.request_dtos import GenerateImageRequest
 
+logger = logging.getLogger(__name__)
+
 class ImageService:
     """Servicio de aplicación para la gestión de imágenes."""
     
-    def __init__(self, image_generator: ImageGeneratorService, image_repository: ImageRepository):
+    def __init__(self, image_generator: ImageGeneratorService, image_repository: ImageRepository, unit_of_work: UnitOfWork):
         self.image_generator = image_generator
         self.image_repository = image_repository
+        self.unit_of_work = unit_of_work
     
     def generate_image(self, scenario_id: str, request: GenerateImageRequest) -> Dict[str, Any]:
         """
@@ -40,7 +45,8 @@ class ImageService:
         
         # Guardar la imagen en el repositorio
         try:
-            image_id = self.image_repository.create(image)
+            with self.unit_of_work.transaction():
+                image_id = self.image_repository.create(image)
             
             return {
                 "success": True,
@@ -52,6 +58,13 @@ class ImageService:
                 "error": f"Error al guardar la imagen: {str(e)}"
             }
     
+    def promote_preview_image(self, image_url: str) -> str:
+        """
+        Mueve una imagen generada en modo preview al almacenamiento permanente.
+        Retorna la URL definitiva que debe persistirse.
+        """
+        return self.image_generator.promote_preview(image_url)
+    
     def get_image_by_id(self, image_id: str) -> Optional[Dict[str, Any]]:
         """
         Obtiene una imagen por su ID.
@@ -64,7 +77,7 @@ class ImageService:
                 
             return image.to_dict()
         except Exception as e:
-            print(f"Error al obtener la imagen: {e}")
+            logger.error("Error al obtener la imagen: %s", e)
             return None
     
     def get_image_by_scenario_id(self, scenario_id: str) -> Optional[Dict[str, Any]]:
@@ -79,7 +92,7 @@ class ImageService:
                 
             return image.to_dict()
         except Exception as e:
-            print(f"Error al obtener imagen por scenario: {e}")
+            logger.error("Error al obtener imagen por scenario: %s", e)
             return None
     
     def get_images_by_story(self, story_id: str) -> List[Dict[str, Any]]:
@@ -90,7 +103,7 @@ class ImageService:
             images = self.image_repository.get_by_story_id(UUID(story_id))
             return [image.to_dict() for image in images]
         except Exception as e:
-            print(f"Error al obtener las imágenes del cuento: {e}")
+            logger.error("Error al obtener las imágenes del cuento: %s", e)
             return []
     
     def delete_image(self, image_id: str) -> bool:
@@ -98,7 +111,8 @@ class ImageService:
         Elimina una imagen por su ID.
         """
         try:
-            return self.image_repository.delete(UUID(image_id))
+            with self.unit_of_work.transaction():
+                return self.image_repository.delete(UUID(image_id))
         except Exception as e:
-            print(f"Error al eliminar la imagen: {e}")
+            logger.error("Error al eliminar la imagen: %s", e)
             return False
\ No newline at end of file
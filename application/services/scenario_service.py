@@ -1,17 +1,22 @@
+import logging
 from typing import Dict, Any, Optional, List
 from uuid import UUID
 
 from domain.interfaces.services.scenario_extractor import ScenarioExtractorService
 from domain.interfaces.repositories.scenario_repository import ScenarioRepository
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
 from domain.entities.scenario import Scenario
 from domain.entities.story import Story
 
+logger = logging.getLogger(__name__)
+
 class ScenarioService:
     """Servicio de aplicación para la gestión de escenarios."""
     
-    def __init__(self, scenario_extractor: ScenarioExtractorService, scenario_repository: ScenarioRepository):
+    def __init__(self, scenario_extractor: ScenarioExtractorService, scenario_repository: ScenarioRepository, unit_of_work: UnitOfWork):
         self.scenario_extractor = scenario_extractor
         self.scenario_repository = scenario_repository
+        self.unit_of_work = unit_of_work
     # tenemos la pedagogia tradicional como predefinida
     def extract_scenarios(self, story, num_scenarios: int = 6, pedagogical_approach: str = "traditional") -> List[Dict[str, Any]]:
         """
@@ -28,23 +33,25 @@ class ScenarioService:
         if not scenarios_data:
             return []
         
-        saved_scenarios = []
-        
-        # Crear y guardar cada escenario
-        for scenario_data in scenarios_data:
-            scenario = Scenario(
+        scenarios = [
+            Scenario(
                 story_id=story.id,
                 description=scenario_data["description"],
                 sequence_number=scenario_data["sequence_number"],
                 prompt_for_image=scenario_data["prompt_for_image"]
             )
-            
-            try:
-                # Guardar el escenario en el repositorio
-                scenario_id = self.scenario_repository.create(scenario)
-                saved_scenarios.append(scenario.to_dict())
-            except Exception as e:
-                print(f"Error al guardar el escenario: {e}")
+            for scenario_data in scenarios_data
+        ]
+        
+        try:
+            # Guardar todos los escenarios en una sola operación
+            with self.unit_of_work.transaction():
+                self.scenario_repository.create_many(scenarios)
+        except Exception as e:
+            logger.error("Error al guardar los escenarios: %s", e)
+            return []
+        
+        saved_scenarios = [scenario.to_dict() for scenario in scenarios]
         
         return saved_scenarios
     
@@ -56,7 +63,7 @@ class ScenarioService:
             scenarios = self.scenario_repository.get_by_story_id(UUID(story_id))
             return [scenario.to_dict() for scenario in scenarios]
         except Exception as e:
-            print(f"Error al obtener los escenarios del cuento: {e}")
+            logger.error("Error al obtener los escenarios del cuento: %s", e)
             return []
     
     def get_scenario_by_id(self, scenario_id: str) -> Optional[Dict[str, Any]]:
@@ -71,5 +78,5 @@ class ScenarioService:
                 
             return scenario.to_dict()
         except Exception as e:
-            print(f"Error al obtener el escenario: {e}")
+            logger.error("Error al obtener el escenario: %s", e)
             return None
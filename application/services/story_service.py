@@ -1,25 +1,38 @@
-from typing import Dict, Any, Optional, List
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Sequence, Callable
 from uuid import UUID
 
 from domain.interfaces.services.story_generator import StoryGeneratorService
 from domain.interfaces.repositories.story_repository import StoryRepository
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
 from domain.entities.story import Story
+from domain.value_objects.story_summary import StorySummary
 from application.dtos.request_dtos import GenerateStoryRequest
 from application.dtos.response_dtos import StoryResponse
+from utils.helpers import encode_cursor, decode_cursor, encode_score_cursor, decode_score_cursor
+
+logger = logging.getLogger(__name__)
+
+# Tamaño mínimo de palabra que indexa InnoDB FULLTEXT (innodb_ft_min_token_size)
+SEARCH_MIN_TERM_LENGTH = 3
+SEARCH_MAX_TERMS = 10
 
 class StoryService:
     """Servicio de aplicación para la gestión de cuentos."""
     
-    def __init__(self, story_generator: StoryGeneratorService, story_repository: StoryRepository):
+    def __init__(self, story_generator: StoryGeneratorService, story_repository: StoryRepository, unit_of_work: UnitOfWork):
         self.story_generator = story_generator
         self.story_repository = story_repository
+        self.unit_of_work = unit_of_work
     
     def generate_story(self, request: GenerateStoryRequest) -> Dict[str, Any]:
         """
         Genera un cuento basado en los parámetros proporcionados.
         """
         try:
-            print(f"📝 Generando cuento con enfoque: {request.pedagogical_approach}")
+            logger.debug("Generando cuento con enfoque: %s", request.pedagogical_approach)
             
             # CORRECCIÓN: Pasar todos los parámetros necesarios incluyendo pedagogical_approach
             result = self.story_generator.generate_story(
@@ -31,13 +44,13 @@ class StoryService:
             )
             
             if not result.get("success", False):
-                print(f"❌ Error en generador: {result.get('error')}")
+                logger.error("Error en generador: %s", result.get('error'))
                 return {
                     "success": False,
                     "error": result.get("error", "Error desconocido al generar el cuento")
                 }
             
-            print(f"✅ Cuento generado: {result.get('title', 'Sin título')}")
+            logger.debug("Cuento generado: %s", result.get('title', 'Sin título'))
             
             # Crear la entidad de cuento
             story = Story(
@@ -51,9 +64,10 @@ class StoryService:
             
             # Guardar el cuento en el repositorio
             try:
-                print(f"💾 Guardando cuento en base de datos...")
-                story_id = self.story_repository.create(story)
-                print(f"✅ Cuento guardado con ID: {story_id}")
+                logger.debug("Guardando cuento en base de datos")
+                with self.unit_of_work.transaction():
+                    story_id = self.story_repository.create(story)
+                logger.info("Cuento guardado con ID: %s", story_id)
                 
                 # Preparar la respuesta
                 return {
@@ -61,18 +75,14 @@ class StoryService:
                     "story": story.to_dict()
                 }
             except Exception as e:
-                print(f"❌ Error al guardar cuento: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error al guardar cuento: %s", e)
                 return {
                     "success": False,
                     "error": f"Error al guardar el cuento: {str(e)}"
                 }
                 
         except Exception as e:
-            print(f"❌ Error general en story_service: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error general en story_service: %s", e)
             return {
                 "success": False,
                 "error": f"Error interno en generación de cuento: {str(e)}"
@@ -83,67 +93,191 @@ class StoryService:
         Obtiene un cuento por su ID.
         """
         try:
-            print(f"🔍 Buscando cuento con ID: {story_id}")
+            logger.debug("Buscando cuento con ID: %s", story_id)
             story = self.story_repository.get_by_id(UUID(story_id))
             
             if not story:
-                print(f"❌ Cuento no encontrado: {story_id}")
+                logger.debug("Cuento no encontrado: %s", story_id)
                 return None
                 
-            print(f"✅ Cuento encontrado: {story.title}")
+            logger.debug("Cuento encontrado: %s", story.title)
             return story.to_dict()
         except Exception as e:
-            print(f"❌ Error al obtener el cuento: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al obtener el cuento: %s", e)
             return None
     
-    def get_recent_stories(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_illustrated_story(self, story_id: str) -> Optional[Dict[str, Any]]:
         """
-        Obtiene los cuentos más recientes.
+        Obtiene un cuento con sus escenarios e imágenes en una sola consulta.
         """
         try:
-            print(f"📚 Obteniendo {limit} cuentos recientes")
-            stories = self.story_repository.get_recent(limit)
-            result = [story.to_dict() for story in stories]
-            print(f"✅ Se encontraron {len(result)} cuentos")
-            return result
+            return self.story_repository.get_illustrated(UUID(story_id))
+        except Exception as e:
+            logger.error("Error al obtener el cuento ilustrado: %s", e)
+            return None
+    
+    def get_illustrated_stories(self, story_ids: Sequence[UUID]) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene varios cuentos ilustrados con una cantidad fija de consultas.
+        Retorna un diccionario id -> {"story", "scenarios"} con los que existen.
+        """
+        illustrated = self.story_repository.get_illustrated_many(story_ids)
+        return {item["story"]["id"]: item for item in illustrated}
+    
+    def get_recent_stories(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fields: Sequence[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Obtiene una página de resúmenes de los cuentos más recientes.
+        fields agrega campos completos del cuento (content, context, teacher_id).
+        Retorna los cuentos y el cursor de la página siguiente (None si no hay más).
+        Lanza ValueError si el cursor no es válido.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            logger.debug("Obteniendo %s cuentos recientes", limit)
+            # Se pide un elemento extra para saber si existe una página siguiente
+            stories = self.story_repository.get_summaries(limit=limit + 1, after=after, extra_fields=fields)
+            page = self._build_page(stories, limit)
+            logger.debug("Se encontraron %d cuentos", len(page['stories']))
+            return page
         except Exception as e:
-            print(f"❌ Error al obtener los cuentos recientes: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            logger.exception("Error al obtener los cuentos recientes: %s", e)
+            return {"stories": [], "next_cursor": None}
     
-    def get_stories_by_teacher(self, teacher_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_stories_by_teacher(
+        self,
+        teacher_id: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        fields: Sequence[str] = ()
+    ) -> Dict[str, Any]:
         """
-        Obtiene los cuentos creados por un profesor específico.
+        Obtiene una página de resúmenes de los cuentos de un profesor específico.
+        fields agrega campos completos del cuento (content, context, teacher_id).
+        Retorna los cuentos y el cursor de la página siguiente (None si no hay más).
+        Lanza ValueError si teacher_id o el cursor no son válidos.
         """
         try:
-            print(f"👨‍🏫 Obteniendo cuentos del profesor {teacher_id} (límite: {limit})")
-            stories = self.story_repository.get_by_teacher_id(UUID(teacher_id), limit)
-            result = [story.to_dict() for story in stories]
-            print(f"✅ Se encontraron {len(result)} cuentos del profesor")
-            return result
+            teacher_uuid = UUID(teacher_id)
+        except ValueError:
+            raise ValueError("teacher_id no es un identificador válido")
+        after = decode_cursor(cursor) if cursor else None
+        try:
+            logger.debug("Obteniendo cuentos del profesor %s (límite: %s)", teacher_id, limit)
+            stories = self.story_repository.get_summaries(
+                teacher_id=teacher_uuid, limit=limit + 1, after=after, extra_fields=fields
+            )
+            page = self._build_page(stories, limit)
+            logger.debug("Se encontraron %d cuentos del profesor", len(page['stories']))
+            return page
+        except Exception as e:
+            logger.exception("Error al obtener los cuentos del profesor: %s", e)
+            return {"stories": [], "next_cursor": None}
+    
+    def search_stories(
+        self,
+        query: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        teacher_id: Optional[str] = None,
+        category: Optional[str] = None,
+        pedagogical_approach: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Busca cuentos por texto (título, contenido, contexto y escenarios), ordenados por
+        relevancia, con filtros opcionales. Las fechas van en ISO 8601; una fecha sin hora
+        en created_to incluye todo ese día.
+        Retorna los cuentos (con "relevance") y el cursor de la página siguiente.
+        Lanza ValueError si la búsqueda, los filtros o el cursor no son válidos.
+        """
+        terms = self._search_terms(query)
+        if not terms:
+            raise ValueError(
+                f"La búsqueda debe incluir al menos una palabra de {SEARCH_MIN_TERM_LENGTH} o más caracteres"
+            )
+        try:
+            teacher_uuid = UUID(teacher_id) if teacher_id else None
+        except ValueError:
+            raise ValueError("teacher_id no es un identificador válido")
+        filters = {
+            "teacher_id": teacher_uuid,
+            "category": category,
+            "pedagogical_approach": pedagogical_approach,
+            "created_from": self._parse_date(created_from, "created_from") if created_from else None,
+            "created_to": self._parse_date(created_to, "created_to", end_of_day=True) if created_to else None
+        }
+        after = decode_score_cursor(cursor) if cursor else None
+        try:
+            logger.debug("Buscando cuentos: %s", terms)
+            stories = self.story_repository.search(terms, filters=filters, limit=limit + 1, after=after)
+            page = self._build_page(
+                stories, limit, lambda last: encode_score_cursor(last.extra["relevance"], str(last.id))
+            )
+            logger.debug("Se encontraron %d cuentos", len(page['stories']))
+            return page
         except Exception as e:
-            print(f"❌ Error al obtener los cuentos del profesor: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+            logger.exception("Error al buscar cuentos: %s", e)
+            return {"stories": [], "next_cursor": None}
+    
+    @staticmethod
+    def _search_terms(query: Optional[str]) -> List[str]:
+        """Palabras de la búsqueda sin operadores FULLTEXT, sin repetir y en minúsculas."""
+        terms = []
+        for word in re.findall(r"\w+", (query or "").lower()):
+            if len(word) >= SEARCH_MIN_TERM_LENGTH and word not in terms:
+                terms.append(word)
+        return terms[:SEARCH_MAX_TERMS]
+    
+    @staticmethod
+    def _parse_date(value: str, name: str, end_of_day: bool = False) -> datetime:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Fecha no válida en {name}: use el formato AAAA-MM-DD")
+        if end_of_day and len(value) == 10:
+            parsed += timedelta(days=1)
+        return parsed
+    
+    @staticmethod
+    def _build_page(
+        stories: List[StorySummary],
+        limit: int,
+        make_cursor: Optional[Callable[[StorySummary], str]] = None
+    ) -> Dict[str, Any]:
+        """Recorta la página y genera el cursor a partir del último cuento incluido."""
+        has_next = len(stories) > limit
+        stories = stories[:limit]
+        next_cursor = None
+        if has_next and stories:
+            last = stories[-1]
+            if make_cursor:
+                next_cursor = make_cursor(last)
+            else:
+                next_cursor = encode_cursor(last.created_at, str(last.id))
+        return {
+            "stories": [story.to_dict() for story in stories],
+            "next_cursor": next_cursor
+        }
     
     def delete_story(self, story_id: str) -> bool:
         """
         Elimina un cuento por su ID.
         """
         try:
-            print(f"🗑️ Eliminando cuento: {story_id}")
-            result = self.story_repository.delete(UUID(story_id))
+            logger.debug("Eliminando cuento: %s", story_id)
+            with self.unit_of_work.transaction():
+                result = self.story_repository.delete(UUID(story_id))
             if result:
-                print(f"✅ Cuento eliminado exitosamente")
+                logger.info("Cuento eliminado exitosamente")
             else:
-                print(f"❌ No se pudo eliminar el cuento")
+                logger.warning("No se pudo eliminar el cuento")
             return result
         except Exception as e:
-            print(f"❌ Error al eliminar el cuento: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al eliminar el cuento: %s", e)
             return False
\ No newline at end of file
@@ -1,16 +1,21 @@
+from datetime import datetime
 from typing import Dict, Any, Optional
 from uuid import UUID
 import bcrypt
 
 from domain.interfaces.repositories.teacher_repository import TeacherRepository
+from domain.interfaces.repositories.teacher_stats_repository import TeacherStatsRepository
 from domain.entities.teacher import Teacher
 from domain.exceptions.domain_exceptions import EntityNotFoundException, ValidationException
 
+MONTH_ABBREVIATIONS = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+
 class TeacherProfileService:
     """Servicio de aplicación para gestión de perfiles de profesores."""
     
-    def __init__(self, teacher_repository: TeacherRepository):
+    def __init__(self, teacher_repository: TeacherRepository, stats_repository: TeacherStatsRepository):
         self.teacher_repository = teacher_repository
+        self.stats_repository = stats_repository
     
     def get_profile(self, teacher_id: str) -> Dict[str, Any]:
         """
@@ -185,7 +190,7 @@ class TeacherProfileService:
             }
         """
         try:
-            teacher = self.teacher_repository.get_by_id(UUID(teacher_id))
+            teacher = self._find_teacher(teacher_id)
             
             if not teacher:
                 return {
@@ -193,24 +198,15 @@ class TeacherProfileService:
                     "error": "Profesor no encontrado"
                 }
             
-            # TODO: Implementar lógica real de estadísticas
-            # Por ahora retornamos datos mock
+            stats = self.stats_repository.get_activity(teacher.id)
             summary = {
-                "total_stories": 10,
-                "stories_this_month": 3,
-                "favorite_category": "Aventura",
-                "favorite_approach": "traditional",
-                "last_story_date": "2025-01-15",
-                "stories_by_month": {
-                    "2024-11": 2,
-                    "2024-12": 5,
-                    "2025-01": 3
-                },
-                "stories_by_category": {
-                    "Aventura": 4,
-                    "Ciencia": 3,
-                    "Fantasía": 3
-                }
+                "total_stories": stats.total_stories,
+                "stories_this_month": stats.stories_in_month(datetime.now()),
+                "favorite_category": stats.favorite_category,
+                "favorite_approach": stats.favorite_approach,
+                "last_story_date": stats.last_story_at.date().isoformat() if stats.last_story_at else None,
+                "stories_by_month": stats.stories_by_month,
+                "stories_by_category": stats.stories_by_category
             }
             
             return {
@@ -224,6 +220,74 @@ class TeacherProfileService:
                 "error": f"Error al obtener resumen de actividad: {str(e)}"
             }
     
+    def get_profile_stats(self, teacher_id: str, include_charts: bool = False) -> Dict[str, Any]:
+        """
+        Obtiene las estadísticas detalladas del profesor (y opcionalmente los datos para gráficos).
+        
+        Returns:
+            {
+                "success": True/False,
+                "stats": {stats_data},
+                "error": "Mensaje de error en caso de fallo"
+            }
+        """
+        try:
+            teacher = self._find_teacher(teacher_id)
+            
+            if not teacher:
+                return {
+                    "success": False,
+                    "error": "Profesor no encontrado"
+                }
+            
+            stats = self.stats_repository.get_activity(teacher.id)
+            
+            result = {
+                "stories_by_month": stats.stories_by_month,
+                "stories_by_category": stats.stories_by_category,
+                "stories_by_approach": stats.stories_by_approach,
+                "average_story_length": stats.average_story_length,
+                "most_active_day": stats.most_active_day
+            }
+            
+            if include_charts:
+                result["chart_data"] = {
+                    "monthly_activity": [
+                        # Con el año: los últimos 12 meses con actividad pueden abarcar más de un año
+                        {"month": f"{MONTH_ABBREVIATIONS[int(month[5:7]) - 1]} {month[:4]}", "stories": count}
+                        for month, count in list(stats.stories_by_month.items())[-12:]
+                    ],
+                    "category_distribution": [
+                        {
+                            "category": category,
+                            "count": count,
+                            "percentage": round(count * 100 / stats.total_stories) if stats.total_stories else 0
+                        }
+                        for category, count in sorted(
+                            stats.stories_by_category.items(), key=lambda item: -item[1]
+                        )
+                    ]
+                }
+            
+            return {
+                "success": True,
+                "stats": result
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error al obtener estadísticas: {str(e)}"
+            }
+    
+    def _find_teacher(self, teacher_id: str) -> Optional[Teacher]:
+        """Obtiene el profesor por su ID; un ID que no es un UUID válido no corresponde a ninguno."""
+        try:
+            parsed_id = UUID(str(teacher_id))
+        except ValueError:
+            return None
+        return self.teacher_repository.get_by_id(parsed_id)
+    
     def _validate_update_data(self, update_data: Dict[str, Any], teacher_id: UUID) -> list:
         """Valida los datos de actualización."""
         errors = []
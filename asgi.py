@@ -0,0 +1,212 @@
+"""
+Punto de entrada ASGI: las rutas de generación corren en el pipeline asíncrono y
+el resto de la API sigue en Flask, dentro del mismo proceso.
+
+    uvicorn asgi:create_asgi_app --factory --host 0.0.0.0 --port 5000 --workers 4
+
+POST /api/generate-illustrated-story y POST /api/preview-illustrated-story (ver
+presentation/api/async_story_routes.py) esperan a Gemini y a Stability AI sobre un
+httpx.AsyncClient compartido, sin ocupar un hilo por petición. Cualquier otra
+petición (incluido el preflight OPTIONS de CORS) pasa a la aplicación Flask a
+través de a2wsgi, que la atiende en un pool de ASGI_WSGI_THREADS hilos.
+"""
+import io
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from flask import Flask
+from werkzeug.exceptions import HTTPException, UnsupportedMediaType
+from werkzeug.http import parse_cookie
+
+from app import create_app
+from config import (
+    IMAGE_STORAGE_PATH, GENERATION_STORY_TIMEOUT_SECONDS, GENERATION_SCENARIOS_TIMEOUT_SECONDS,
+    GENERATION_IMAGE_TIMEOUT_SECONDS, ASYNC_IMAGE_CONCURRENCY, ASYNC_HTTP_MAX_CONNECTIONS, ASGI_WSGI_THREADS,
+    REQUEST_MAX_DECOMPRESSED_BYTES
+)
+from infrastructure.database.connection import begin_request_scope, end_request_scope
+from infrastructure.database.query_instrumentation import begin_query_profile, current_query_profile, end_query_profile
+from infrastructure.services.gemini_rest_client import GeminiRestClient
+from infrastructure.services.async_gemini_story_generator import AsyncGeminiStoryGenerator
+from infrastructure.services.async_gemini_scenario_extractor import AsyncGeminiScenarioExtractor
+from infrastructure.services.async_stability_ai_image_generator import AsyncStabilityAIImageGenerator
+from application.services.async_illustration_orchestrator import AsyncIllustrationOrchestratorService
+from presentation.api.async_story_routes import async_story_routes, init_routes as init_async_story_routes
+from presentation.middleware.compression import (
+    REQUEST_ENCODINGS, ResponseCompressor, create_response_compressor, decompress_stream
+)
+from presentation.middleware.query_profiler import PROFILE_HEADERS, report_query_profile
+from presentation.middleware.read_your_writes import (
+    PIN_COOKIE, PIN_HEADER, incoming_pin, outgoing_pin, pin_cookie_header
+)
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api'
+# Mismas cabeceras expuestas que CORS(app, expose_headers=...) en create_app
+EXPOSE_HEADERS = ", ".join([PIN_HEADER, *PROFILE_HEADERS]).encode("ascii")
+
+
+class GenerationASGIApp:
+    """
+    Aplicación ASGI que despacha las rutas asíncronas de generación y delega el
+    resto en Flask. Cierra el cliente HTTP compartido al apagarse (lifespan).
+    """
+
+    def __init__(
+        self,
+        flask_app: Flask,
+        http_client: httpx.AsyncClient,
+        wsgi_threads: int = 10,
+        compressor: Optional[ResponseCompressor] = None
+    ):
+        self.flask_app = flask_app
+        self.http_client = http_client
+        self.compressor = compressor
+        self.wsgi_app = WSGIMiddleware(flask_app, workers=wsgi_threads)
+        self.routes = {
+            (method, f"{API_PREFIX}{path}"): handler
+            for (method, path), handler in async_story_routes.items()
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http":
+            handler = self.routes.get((scope["method"], scope["path"]))
+            if handler:
+                await self._handle(handler, scope, receive, send)
+                return
+        await self.wsgi_app(scope, receive, send)
+
+    async def _handle(self, handler, scope, receive, send):
+        headers = dict(scope["headers"])
+        body = await self._read_body(receive)
+        encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+        if encoding not in ("", "identity"):
+            # Cuerpos comprimidos, con los mismos límites que las rutas Flask
+            try:
+                if encoding not in REQUEST_ENCODINGS:
+                    raise UnsupportedMediaType(f"Content-Encoding no soportado: {encoding}")
+                body = decompress_stream(io.BytesIO(body), encoding, REQUEST_MAX_DECOMPRESSED_BYTES)
+            except HTTPException as e:
+                await self._send_json(scope, send, {'success': False, 'error': e.description}, e.code)
+                return
+        try:
+            data = self.flask_app.json.loads(body) if body else None
+        except ValueError:
+            data = None
+
+        # Mismos ámbitos por petición que las rutas Flask (ver presentation/middleware):
+        # el plazo de lectura del primario de la sesión y el perfil de consultas
+        incoming = incoming_pin(
+            parse_cookie(headers.get(b"cookie", b"").decode("latin-1")).get(PIN_COOKIE),
+            headers.get(PIN_HEADER.lower().encode("ascii"), b"").decode("latin-1")
+        )
+        pin_token = begin_request_scope(incoming)
+        profile_token = begin_query_profile()
+        try:
+            try:
+                payload, status = await handler(data)
+            except Exception as e:
+                logger.exception("Error no manejado en ruta asíncrona: %s", e)
+                payload, status = {'success': False, 'error': 'Error interno del servidor'}, 500
+
+            extra_headers = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in report_query_profile(
+                    current_query_profile(), scope["method"], scope["path"], self.flask_app.debug
+                ).items()
+            ]
+            until = outgoing_pin(incoming)
+            if until:
+                extra_headers.append((b"set-cookie", pin_cookie_header(until).encode("latin-1")))
+                extra_headers.append((PIN_HEADER.lower().encode("ascii"), f"{until:.3f}".encode("ascii")))
+        finally:
+            end_query_profile(profile_token)
+            end_request_scope(pin_token)
+
+        await self._send_json(scope, send, payload, status, extra_headers)
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _send_json(
+        self, scope, send, payload: Dict[str, Any], status: int, extra_headers: Optional[List[Tuple[bytes, bytes]]] = None
+    ):
+        # Mismo serializador que jsonify en las rutas Flask (ver JSON_PROVIDER)
+        body = self.flask_app.json.dumps(payload).encode("utf-8")
+        headers = [
+            (b"content-type", b"application/json"),
+            # Mismo origen permitido que flask_cors en las rutas Flask
+            (b"access-control-allow-origin", b"*"),
+            (b"access-control-expose-headers", EXPOSE_HEADERS),
+        ]
+        headers.extend(extra_headers or [])
+        if self.compressor is not None:
+            # Misma negociación que las respuestas Flask (ver presentation/middleware/compression.py)
+            headers.append((b"vary", b"Accept-Encoding"))
+            accept_encoding = dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1")
+            encoding = self.compressor.choose_encoding(accept_encoding, "application/json", len(body))
+            if encoding:
+                body = self.compressor.compress(body, encoding)
+                headers.append((b"content-encoding", encoding.encode("ascii")))
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.http_client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(config: Optional[Dict[str, Any]] = None) -> GenerationASGIApp:
+    """
+    Crea la aplicación Flask (create_app) y, sobre sus mismos repositorios y
+    almacenes de imágenes, el pipeline asíncrono de generación.
+    """
+    flask_app = create_app(config)
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(GENERATION_IMAGE_TIMEOUT_SECONDS, connect=10),
+        limits=httpx.Limits(max_connections=ASYNC_HTTP_MAX_CONNECTIONS)
+    )
+    gemini_client = GeminiRestClient(flask_app.config['GEMINI_API_KEY'], http_client)
+    sync_image_generator = flask_app.image_generator
+    async_orchestrator = AsyncIllustrationOrchestratorService(
+        AsyncGeminiStoryGenerator(gemini_client),
+        AsyncGeminiScenarioExtractor(gemini_client),
+        AsyncStabilityAIImageGenerator(
+            http_client, flask_app.config['STABILITY_API_KEY'], IMAGE_STORAGE_PATH,
+            sync_image_generator.image_store, sync_image_generator.preview_store,
+            max_concurrency=ASYNC_IMAGE_CONCURRENCY
+        ),
+        flask_app.illustration_orchestrator,
+        story_timeout=GENERATION_STORY_TIMEOUT_SECONDS,
+        scenarios_timeout=GENERATION_SCENARIOS_TIMEOUT_SECONDS,
+        image_timeout=GENERATION_IMAGE_TIMEOUT_SECONDS
+    )
+    init_async_story_routes(async_orchestrator)
+    compressor = create_response_compressor() if flask_app.config['COMPRESSION_ENABLED'] else None
+    return GenerationASGIApp(flask_app, http_client, wsgi_threads=ASGI_WSGI_THREADS, compressor=compressor)
@@ -11,8 +11,51 @@ DB_CONFIG = {
     "user": os.getenv("DB_USER", "root"),
     "password": os.getenv("DB_PASSWORD", "angelo"),
     "database": os.getenv("DB_NAME", "santa_fe"),
+    # Implementación en Python puro del conector: necesaria con workers gevent,
+    # donde la extensión C bloquearía el event loop durante cada consulta
+    "use_pure": os.getenv("DB_USE_PURE", "false").lower() in ("1", "true", "yes"),
 }
 
+# Pool de conexiones: conexiones en reposo, extra permitidas en picos, espera máxima
+# para obtener una (s), antigüedad máxima antes de reciclarla (s) y tiempo de
+# inactividad a partir del cual se valida con un ping antes de reutilizarla (s)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = float(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_VALIDATION_INTERVAL = float(os.getenv("DB_POOL_VALIDATION_INTERVAL", "30"))
+
+# Réplicas de lectura ("host" o "host:puerto", separadas por comas; mismas credenciales).
+# Tras una escritura, las lecturas de esa petición y de la sesión (cookie) van al primario
+# durante DB_READ_YOUR_WRITES_SECONDS, para no leer datos que la réplica aún no recibió.
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv("DB_REPLICA_HOSTS", "").split(",") if host.strip()]
+DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+
+# Formato de los ids en MySQL: 'char36' (VARCHAR(36)) o 'binary16' (BINARY(16)).
+# Cambiar a 'binary16' solo junto con la migración opcional 0101_binary_uuid_ids.
+ID_STORAGE_FORMAT = os.getenv("ID_STORAGE_FORMAT", "char36")
+
+# Instrumentación de consultas: latencia, filas y origen de cada sentencia. Las que
+# superan DB_SLOW_QUERY_MS se registran como lentas; una misma sentencia repetida
+# DB_N_PLUS_ONE_THRESHOLD veces desde el mismo origen en una petición se marca como N+1.
+# En modo debug las respuestas incluyen X-DB-Query-Count y X-DB-Time-Ms.
+DB_QUERY_INSTRUMENTATION = os.getenv("DB_QUERY_INSTRUMENTATION", "true").lower() in ("1", "true", "yes")
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+# Máximo de ids por sentencia en las lecturas múltiples (get_many): las listas más
+# largas se dividen en varias consultas IN (...)
+DB_MULTI_GET_CHUNK_SIZE = int(os.getenv("DB_MULTI_GET_CHUNK_SIZE", "500"))
+
+# Almacenamiento de los repositorios: 'mysql', 'sqlite' (SQLITE_PATH, archivo o
+# ':memory:') o 'memory' (índices en el proceso). Los dos últimos son para pruebas
+# y benchmarks: no persisten entre procesos compartidos ni llevan image_blobs.
+REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "mysql")
+SQLITE_PATH = os.getenv("SQLITE_PATH", ":memory:")
+
+# Espera máxima (s) por el metadata lock de una tabla al aplicar migraciones
+MIGRATION_LOCK_WAIT_TIMEOUT = int(os.getenv("MIGRATION_LOCK_WAIT_TIMEOUT", "5"))
+
 # Directorio para almacenar imágenes
 IMAGE_STORAGE_PATH = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "static/images")
@@ -21,10 +64,70 @@ IMAGE_STORAGE_PATH = os.path.abspath(
 # Asegurar que el directorio exista
 os.makedirs(IMAGE_STORAGE_PATH, exist_ok=True)
 
+# Distribución de archivos en IMAGE_STORAGE_PATH: 'sharded' (subdirectorios por
+# prefijo de hash) o 'flat'. Tras cambiarla, ejecutar la migración de distribución.
+IMAGE_STORAGE_LAYOUT = os.getenv("IMAGE_STORAGE_LAYOUT", "sharded")
+IMAGE_SHARD_DEPTH = int(os.getenv("IMAGE_SHARD_DEPTH", "2"))
+IMAGE_SHARD_WIDTH = int(os.getenv("IMAGE_SHARD_WIDTH", "2"))
+
+# Cómo se envían los archivos de imagen: 'flask' (el worker envía los bytes),
+# 'x-accel' (nginx, vía X-Accel-Redirect) o 'x-sendfile' (Apache/lighttpd).
+# IMAGE_ACCEL_PREFIX es la location interna de nginx que apunta a static/.
+IMAGE_SERVING_MODE = os.getenv("IMAGE_SERVING_MODE", "flask")
+IMAGE_ACCEL_PREFIX = os.getenv("IMAGE_ACCEL_PREFIX", "/_protected")
+
+# Directorio temporal para imágenes de preview, con TTL y tamaño máximo
+PREVIEW_STORAGE_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "static/previews")
+)
+os.makedirs(PREVIEW_STORAGE_PATH, exist_ok=True)
+PREVIEW_TTL_SECONDS = int(os.getenv("PREVIEW_TTL_SECONDS", "86400"))
+PREVIEW_MAX_BYTES = int(os.getenv("PREVIEW_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Segundos que un blob sin referencias se conserva antes de poder recuperarse
+IMAGE_BLOB_GRACE_SECONDS = int(os.getenv("IMAGE_BLOB_GRACE_SECONDS", "3600"))
+
+# Recolector de archivos de imagen huérfanos (0 desactiva la ejecución programada)
+IMAGE_GC_GRACE_SECONDS = int(os.getenv("IMAGE_GC_GRACE_SECONDS", "86400"))
+IMAGE_GC_INTERVAL_SECONDS = int(os.getenv("IMAGE_GC_INTERVAL_SECONDS", "0"))
+# Programar el GC dentro de cada aplicación creada con create_app. Con varios
+# procesos (uvicorn --workers, gunicorn sin preload) cada uno tendría su propio
+# hilo: gunicorn.conf.py lo desactiva y lo ejecuta una sola vez en el maestro
+IMAGE_GC_RUN_IN_APP = os.getenv("IMAGE_GC_RUN_IN_APP", "true").lower() in ("1", "true", "yes")
+
+# Logging: nivel mínimo (DEBUG incluye los resultados completos de generación) y si,
+# además de logs/app.log, los registros JSON se escriben en stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "true").lower() in ("1", "true", "yes")
+
+# Serializador JSON de las respuestas y cuerpos de petición: 'orjson' (requiere el
+# paquete orjson; sin él se usa el estándar) o 'stdlib' (proveedor predeterminado de Flask)
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+
+# Compresión de respuestas JSON (brotli o gzip según Accept-Encoding) a partir de
+# COMPRESSION_MIN_BYTES, con su nivel (gzip 1-9, brotli 0-11). Los cuerpos de petición
+# con Content-Encoding se aceptan siempre, hasta REQUEST_MAX_DECOMPRESSED_BYTES descomprimidos
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+REQUEST_MAX_DECOMPRESSED_BYTES = int(os.getenv("REQUEST_MAX_DECOMPRESSED_BYTES", str(10 * 1024 * 1024)))
+
 # Configuración de API keys para servicios externos
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 STABILITY_API_KEY = os.getenv("STABILITY_API_KEY")
 
+# Pipeline asíncrono de generación (servidor ASGI, ver asgi.py): tiempo máximo (s) de
+# cada paso, imágenes de Stability AI en curso a la vez por proceso y conexiones
+# HTTP simultáneas del cliente compartido. ASGI_WSGI_THREADS son los hilos con que se
+# atienden las rutas Flask (todas las demás) dentro del mismo servidor
+GENERATION_STORY_TIMEOUT_SECONDS = float(os.getenv("GENERATION_STORY_TIMEOUT_SECONDS", "60"))
+GENERATION_SCENARIOS_TIMEOUT_SECONDS = float(os.getenv("GENERATION_SCENARIOS_TIMEOUT_SECONDS", "60"))
+GENERATION_IMAGE_TIMEOUT_SECONDS = float(os.getenv("GENERATION_IMAGE_TIMEOUT_SECONDS", "90"))
+ASYNC_IMAGE_CONCURRENCY = int(os.getenv("ASYNC_IMAGE_CONCURRENCY", "16"))
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "200"))
+ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", "10"))
+
 # Configuración predeterminada para generación de cuentos
 DEFAULT_NUM_ILLUSTRATIONS = 6
 DEFAULT_IMAGE_STYLE = "children_illustration"
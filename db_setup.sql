@@ -1,3 +1,5 @@
+-- Esquema base. Los cambios posteriores viven en infrastructure/database/migrations:
+--   python -m infrastructure.database.migrate up
 CREATE DATABASE IF NOT EXISTS santa_fe CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
 USE santa_fe;
 
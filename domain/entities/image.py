@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from utils.helpers import uuid7
 
 class Image:
     """Entidad que representa una imagen generada para un escenario."""
@@ -13,7 +15,7 @@ class Image:
         id: Optional[UUID] = None,
         created_at: Optional[datetime] = None
     ):
-        self.id = id or uuid4()
+        self.id = id or uuid7()
         self.scenario_id = scenario_id
         self.prompt = prompt
         self.image_url = image_url
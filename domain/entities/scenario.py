@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from utils.helpers import uuid7
 
 class Scenario:
     """Entidad que representa un escenario o momento clave en un cuento."""
@@ -14,7 +16,7 @@ class Scenario:
         id: Optional[UUID] = None,
         created_at: Optional[datetime] = None
     ):
-        self.id = id or uuid4()
+        self.id = id or uuid7()
         self.story_id = story_id
         self.description = description
         self.sequence_number = sequence_number
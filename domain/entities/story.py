@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import List, Optional
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from utils.helpers import uuid7
 
 class Story:
     """Entidad que representa un cuento completo."""
@@ -16,7 +18,7 @@ class Story:
         id: Optional[UUID] = None,
         created_at: Optional[datetime] = None
     ):
-        self.id = id or uuid4()
+        self.id = id or uuid7()
         self.title = title
         self.content = content
         self.context = context
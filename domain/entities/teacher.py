@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from uuid import UUID, uuid4
+from uuid import UUID
+
+from utils.helpers import uuid7
 
 class Teacher:
     """Entidad que representa a un profesor/usuario del sistema."""
@@ -15,7 +17,7 @@ class Teacher:
         id: Optional[UUID] = None,
         created_at: Optional[datetime] = None
     ):
-        self.id = id or uuid4()
+        self.id = id or uuid7()
         self.username = username
         self.email = email
         self.password_hash = password_hash
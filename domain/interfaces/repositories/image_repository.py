@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.image import Image
@@ -12,16 +12,37 @@ class ImageRepository(ABC):
         """Crea una nueva imagen en el repositorio."""
         pass
     
+    @abstractmethod
+    def create_many(self, images: List[Image]) -> List[UUID]:
+        """Crea varias imágenes en una sola operación."""
+        pass
+    
     @abstractmethod
     def get_by_id(self, image_id: UUID) -> Optional[Image]:
         """Obtiene una imagen por su ID."""
         pass
     
+    @abstractmethod
+    def get_many(self, image_ids: Sequence[UUID]) -> List[Image]:
+        """
+        Obtiene varias imágenes en una sola lectura, en el orden de image_ids.
+        Los ids inexistentes se omiten y los repetidos se devuelven una vez.
+        """
+        pass
+    
     @abstractmethod
     def get_by_scenario_id(self, scenario_id: UUID) -> Optional[Image]:
         """Obtiene una imagen asociada a un escenario específico."""
         pass
     
+    @abstractmethod
+    def get_by_scenario_ids(self, scenario_ids: Sequence[UUID]) -> List[Image]:
+        """
+        Obtiene las imágenes de varios escenarios en una sola lectura, en el orden
+        de scenario_ids. Los escenarios sin imagen se omiten.
+        """
+        pass
+    
     @abstractmethod
     def get_by_story_id(self, story_id: UUID) -> List[Image]:
         """Obtiene todas las imágenes asociadas a un cuento."""
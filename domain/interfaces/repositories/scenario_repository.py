@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.scenario import Scenario
@@ -12,11 +12,24 @@ class ScenarioRepository(ABC):
         """Crea un nuevo escenario en el repositorio."""
         pass
     
+    @abstractmethod
+    def create_many(self, scenarios: List[Scenario]) -> List[UUID]:
+        """Crea varias escenarios en una sola operación."""
+        pass
+    
     @abstractmethod
     def get_by_id(self, scenario_id: UUID) -> Optional[Scenario]:
         """Obtiene un escenario por su ID."""
         pass
     
+    @abstractmethod
+    def get_many(self, scenario_ids: Sequence[UUID]) -> List[Scenario]:
+        """
+        Obtiene varios escenarios en una sola lectura, en el orden de scenario_ids.
+        Los ids inexistentes se omiten y los repetidos se devuelven una vez.
+        """
+        pass
+    
     @abstractmethod
     def get_by_story_id(self, story_id: UUID) -> List[Scenario]:
         """Obtiene todos los escenarios asociados a un cuento."""
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from domain.entities.story import Story
+from domain.value_objects.story_summary import StorySummary
+
+# Campos del cuento que un listado puede pedir además del resumen
+STORY_EXTRA_FIELDS = ("content", "context", "teacher_id")
 
 class StoryRepository(ABC):
     """Interfaz para el repositorio de cuentos."""
@@ -18,13 +23,81 @@ class StoryRepository(ABC):
         pass
     
     @abstractmethod
-    def get_by_teacher_id(self, teacher_id: UUID, limit: int = 10) -> List[Story]:
-        """Obtiene los cuentos creados por un profesor específico."""
+    def get_many(self, story_ids: Sequence[UUID]) -> List[Story]:
+        """
+        Obtiene varios cuentos en una sola lectura, en el orden de story_ids.
+        Los ids inexistentes se omiten y los repetidos se devuelven una vez.
+        """
+        pass
+    
+    @abstractmethod
+    def get_illustrated(self, story_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un cuento con sus escenarios ordenados y la imagen de cada uno.
+        Retorna {"story": {...}, "scenarios": [{..., "image": {...} | None}]}.
+        """
+        pass
+    
+    @abstractmethod
+    def get_illustrated_many(self, story_ids: Sequence[UUID]) -> List[Dict[str, Any]]:
+        """
+        Obtiene varios cuentos ilustrados (misma estructura que get_illustrated) con
+        una cantidad de consultas que no depende de cuántos se pidan, en el orden de
+        story_ids. Los ids inexistentes se omiten y los repetidos se devuelven una vez.
+        """
+        pass
+    
+    @abstractmethod
+    def get_by_teacher_id(
+        self,
+        teacher_id: UUID,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Story]:
+        """
+        Obtiene los cuentos creados por un profesor específico, del más reciente al más antiguo.
+        Con after=(created_at, id) continúa a partir de esa posición.
+        """
+        pass
+    
+    @abstractmethod
+    def get_recent(self, limit: int = 10, after: Optional[Tuple[datetime, str]] = None) -> List[Story]:
+        """
+        Obtiene los cuentos más recientes.
+        Con after=(created_at, id) continúa a partir de esa posición.
+        """
+        pass
+    
+    @abstractmethod
+    def get_summaries(
+        self,
+        teacher_id: Optional[UUID] = None,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None,
+        extra_fields: Sequence[str] = ()
+    ) -> List[StorySummary]:
+        """
+        Obtiene resúmenes de cuentos (sin content ni context), del más reciente al más antiguo,
+        con la URL de portada y el número de escenarios. Filtra por profesor si se indica.
+        extra_fields agrega columnas de STORY_EXTRA_FIELDS a cada resumen.
+        """
         pass
     
     @abstractmethod
-    def get_recent(self, limit: int = 10) -> List[Story]:
-        """Obtiene los cuentos más recientes."""
+    def search(
+        self,
+        terms: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        after: Optional[Tuple[float, str]] = None
+    ) -> List[StorySummary]:
+        """
+        Busca cuentos que contengan todos los términos (título, contenido, contexto o
+        descripción de sus escenarios), de mayor a menor relevancia.
+        filters admite teacher_id, category, pedagogical_approach, created_from y created_to.
+        after es la posición (relevancia, id) del último resultado de la página anterior.
+        Cada resumen incluye extra["relevance"].
+        """
         pass
     
     @abstractmethod
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.teacher import Teacher  # Debemos crear esta entidad
@@ -17,6 +17,14 @@ class TeacherRepository(ABC):
         """Obtiene un profesor por su ID."""
         pass
     
+    @abstractmethod
+    def get_many(self, teacher_ids: Sequence[UUID]) -> List[Teacher]:
+        """
+        Obtiene varios profesores en una sola lectura, en el orden de teacher_ids.
+        Los ids inexistentes se omiten y los repetidos se devuelven una vez.
+        """
+        pass
+    
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[Teacher]:
         """Obtiene un profesor por su email."""
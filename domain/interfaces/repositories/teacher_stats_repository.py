@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import UUID
+
+from domain.value_objects.teacher_activity_stats import TeacherActivityStats
+
+class TeacherStatsRepository(ABC):
+    """
+    Interfaz para las estadísticas de actividad de los profesores.
+    Los acumulados se actualizan al crear, modificar o eliminar cuentos.
+    """
+
+    @abstractmethod
+    def get_activity(self, teacher_id: UUID) -> TeacherActivityStats:
+        """Obtiene las estadísticas acumuladas de un profesor."""
+        pass
+
+    @abstractmethod
+    def rebuild(self, teacher_id: Optional[UUID] = None) -> int:
+        """
+        Recalcula los acumulados desde la tabla de cuentos (de un profesor o de todos).
+        Retorna la cantidad de profesores procesados.
+        """
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import ContextManager
+
+class UnitOfWork(ABC):
+    """Interfaz para agrupar operaciones de varios repositorios en una sola transacción."""
+    
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """
+        Abre una transacción que abarca todos los repositorios usados dentro del bloque.
+        Confirma una sola vez al salir y revierte todo si se lanza una excepción.
+        Las transacciones anidadas se unen a la exterior.
+        """
+        pass
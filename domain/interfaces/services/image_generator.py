@@ -29,4 +29,44 @@ class ImageGeneratorService(ABC):
                 "error": "Mensaje de error en caso de fallo"
             }
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def promote_preview(self, image_url: str) -> str:
+        """
+        Convierte una imagen generada en modo preview en una imagen permanente.
+        
+        Args:
+            image_url: URL de la imagen de preview.
+            
+        Returns:
+            URL definitiva de la imagen. Por defecto la misma URL, para
+            generadores que no separan el almacenamiento de previews.
+        """
+        return image_url
+
+
+class AsyncImageGeneratorService(ABC):
+    """Interfaz asíncrona del generador de imágenes (para el servidor ASGI)."""
+    
+    @abstractmethod
+    async def generate_image_async(
+        self, 
+        prompt: str,
+        pedagogical_approach: str = "traditional",
+        style: str = "children_illustration",
+        width: int = 512,
+        height: int = 512,
+        preview: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Equivalente a ImageGeneratorService.generate_image sin bloquear el event loop.
+        Con preview=True la imagen se guarda en el almacenamiento temporal de previews.
+        
+        Returns:
+            {
+                "success": True/False,
+                "image_url": "ruta/a/la/imagen.png",
+                "error": "Mensaje de error en caso de fallo"
+            }
+        """
+        pass
@@ -31,3 +31,21 @@ class ScenarioExtractorService(ABC):
             ]
         """
         pass
+
+
+class AsyncScenarioExtractorService(ABC):
+    """Interfaz asíncrona del extractor de escenarios (para el servidor ASGI)."""
+    
+    @abstractmethod
+    async def extract_scenarios_async(
+        self, 
+        title: str, 
+        content: str, 
+        num_scenarios: int = 6,
+        pedagogical_approach: str = "traditional"
+    ) -> List[Dict[str, Any]]:
+        """
+        Equivalente a ScenarioExtractorService.extract_scenarios sin bloquear el event loop.
+        Retorna la misma lista de escenarios (vacía si no se pudieron extraer).
+        """
+        pass
@@ -28,4 +28,30 @@ class StoryGeneratorService(ABC):
                 "content": "Contenido completo del cuento..."
             }
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class AsyncStoryGeneratorService(ABC):
+    """Interfaz asíncrona del generador de cuentos (para el servidor ASGI)."""
+    
+    @abstractmethod
+    async def generate_story_async(
+        self, 
+        context: str, 
+        category: str,
+        pedagogical_approach: str = "traditional",
+        target_age: Optional[str] = None,
+        max_length: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Equivalente a StoryGeneratorService.generate_story sin bloquear el event loop.
+        
+        Returns:
+            {
+                "success": True/False,
+                "title": "Título del cuento",
+                "content": "Contenido completo del cuento...",
+                "error": "Mensaje de error en caso de fallo"
+            }
+        """
+        pass
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+@dataclass(frozen=True)
+class StorySummary:
+    """
+    Proyección ligera de un cuento para listados: no incluye los textos completos.
+    Los campos adicionales solicitados explícitamente (fields=) van en extra.
+    """
+    
+    id: UUID
+    title: str
+    category: str
+    pedagogical_approach: str
+    created_at: datetime
+    cover_image_url: Optional[str] = None
+    scenario_count: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+    
+    def to_dict(self) -> dict:
+        """Convierte la proyección a un diccionario."""
+        data = {
+            "id": str(self.id),
+            "title": self.title,
+            "category": self.category,
+            "pedagogical_approach": self.pedagogical_approach,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "cover_image_url": self.cover_image_url,
+            "scenario_count": self.scenario_count
+        }
+        data.update(self.extra)
+        return data
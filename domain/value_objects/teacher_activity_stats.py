@@ -0,0 +1,104 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Días según datetime.isoweekday() (1 = lunes)
+WEEKDAY_NAMES = {
+    1: "Lunes", 2: "Martes", 3: "Miércoles", 4: "Jueves",
+    5: "Viernes", 6: "Sábado", 7: "Domingo"
+}
+
+
+def story_stat_buckets(story: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    Grupos (dimension, bucket) a los que suma un cuento: total, mes (AAAA-MM),
+    categoría, enfoque y día de la semana (isoweekday).
+    """
+    created_at: datetime = story["created_at"]
+    return [
+        ("total", ""),
+        ("month", created_at.strftime("%Y-%m")),
+        ("category", story["category"] or ""),
+        ("approach", story["pedagogical_approach"] or ""),
+        ("weekday", str(created_at.isoweekday()))
+    ]
+
+
+def word_count(content: Optional[str]) -> int:
+    return len(content.split()) if content else 0
+
+
+@dataclass(frozen=True)
+class TeacherActivityStats:
+    """
+    Estadísticas agregadas de los cuentos de un profesor (en MySQL, leídas de la
+    tabla de acumulados). La longitud se mide en palabras.
+    """
+
+    total_stories: int = 0
+    total_words: int = 0
+    stories_by_month: Dict[str, int] = field(default_factory=dict)
+    stories_by_category: Dict[str, int] = field(default_factory=dict)
+    stories_by_approach: Dict[str, int] = field(default_factory=dict)
+    stories_by_weekday: Dict[int, int] = field(default_factory=dict)
+    last_story_at: Optional[datetime] = None
+
+    @property
+    def average_story_length(self) -> float:
+        """Promedio de palabras por cuento."""
+        if not self.total_stories:
+            return 0.0
+        return round(self.total_words / self.total_stories, 1)
+
+    @property
+    def favorite_category(self) -> Optional[str]:
+        return self._most_common(self.stories_by_category)
+
+    @property
+    def favorite_approach(self) -> Optional[str]:
+        return self._most_common(self.stories_by_approach)
+
+    @property
+    def most_active_day(self) -> Optional[str]:
+        weekday = self._most_common(self.stories_by_weekday)
+        return WEEKDAY_NAMES.get(weekday) if weekday else None
+
+    @classmethod
+    def from_stories(cls, stories: Iterable[Dict[str, Any]]) -> "TeacherActivityStats":
+        """
+        Calcula las estadísticas recorriendo los cuentos (category, pedagogical_approach,
+        content, created_at). Para repositorios sin tabla de acumulados.
+        """
+        counts: Counter = Counter()
+        total_words = 0
+        last_story_at = None
+        for story in stories:
+            for bucket in story_stat_buckets(story):
+                counts[bucket] += 1
+            total_words += word_count(story["content"])
+            if last_story_at is None or story["created_at"] > last_story_at:
+                last_story_at = story["created_at"]
+
+        def group(dimension: str) -> Dict[str, int]:
+            return {bucket: count for (name, bucket), count in counts.items() if name == dimension}
+
+        return cls(
+            total_stories=counts[("total", "")],
+            total_words=total_words,
+            stories_by_month=dict(sorted(group("month").items())),
+            stories_by_category=group("category"),
+            stories_by_approach=group("approach"),
+            stories_by_weekday={int(day): count for day, count in group("weekday").items()},
+            last_story_at=last_story_at
+        )
+
+    def stories_in_month(self, moment: datetime) -> int:
+        return self.stories_by_month.get(moment.strftime("%Y-%m"), 0)
+
+    @staticmethod
+    def _most_common(counts: Dict):
+        if not counts:
+            return None
+        # En caso de empate, el valor menor para que el resultado sea estable
+        return min(counts, key=lambda key: (-counts[key], key))
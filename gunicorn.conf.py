@@ -0,0 +1,115 @@
+"""
+Configuración de gunicorn para producción:
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+
+GUNICORN_PROFILE elige el perfil de servicio:
+
+- gthread (predeterminado): pocos procesos con varios hilos cada uno. Las rutas de
+  generación pasan casi todo el tiempo esperando a Gemini y Stability AI (E/S que
+  libera el GIL), así que un hilo bloqueado no deja al worker sin atender lecturas.
+  Los hilos por worker se limitan a las conexiones que el pool puede abrir.
+- sync: un proceso por petición en curso. Sirve para tráfico de solo lectura; una
+  generación ocupa el worker entero durante toda la llamada a las APIs externas.
+- gevent: workers con corrutinas, para muchas generaciones concurrentes. Requiere
+  gevent instalado; fuerza el conector MySQL en Python puro (DB_USE_PURE) y no
+  precarga la aplicación, porque gevent debe parchear la librería estándar antes
+  de crear locks y sockets.
+
+GUNICORN_WORKERS, GUNICORN_THREADS, GUNICORN_TIMEOUT y GUNICORN_BIND sobrescriben
+los valores del perfil. Este archivo no importa config.py: así cada worker lee la
+configuración después de que el perfil ajuste el entorno.
+"""
+import logging
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+# Conexiones que puede abrir el pool de cada worker (ver DB_POOL_SIZE y DB_POOL_MAX_OVERFLOW)
+_pool_capacity = int(os.getenv("DB_POOL_SIZE", "5")) + int(os.getenv("DB_POOL_MAX_OVERFLOW", "10"))
+
+SERVING_PROFILES = {
+    "sync": {
+        "worker_class": "sync",
+        "workers": _cpus * 2 + 1,
+        "threads": 1,
+        # En sync el timeout limita cada petición: debe cubrir una generación completa
+        "timeout": 300,
+        "preload_app": True
+    },
+    "gthread": {
+        "worker_class": "gthread",
+        "workers": _cpus + 1,
+        "threads": min(8, _pool_capacity),
+        "timeout": 120,
+        "preload_app": True
+    },
+    "gevent": {
+        "worker_class": "gevent",
+        "workers": _cpus,
+        "threads": 1,
+        "worker_connections": 200,
+        "timeout": 120,
+        "preload_app": False
+    }
+}
+
+profile_name = os.getenv("GUNICORN_PROFILE", "gthread")
+if profile_name not in SERVING_PROFILES:
+    raise ValueError(f"GUNICORN_PROFILE desconocido: {profile_name} (opciones: {', '.join(SERVING_PROFILES)})")
+_profile = SERVING_PROFILES[profile_name]
+
+if profile_name == "gevent":
+    os.environ.setdefault("DB_USE_PURE", "true")
+# El GC programado de imágenes corre una sola vez, en el maestro (ver when_ready),
+# y no en cada worker que crea la aplicación
+os.environ.setdefault("IMAGE_GC_RUN_IN_APP", "false")
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = _profile["worker_class"]
+workers = int(os.getenv("GUNICORN_WORKERS", str(_profile["workers"])))
+threads = int(os.getenv("GUNICORN_THREADS", str(_profile["threads"])))
+worker_connections = _profile.get("worker_connections", 1000)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", str(_profile["timeout"])))
+# Con preload_app la aplicación se crea una vez en el maestro y los workers la
+# heredan; los hooks post-fork (utils/post_fork.py) reinicializan en cada worker
+# los pools de conexiones, los clientes de Gemini y los locks
+preload_app = _profile["preload_app"]
+graceful_timeout = 30
+keepalive = 5
+# Reciclar workers periódicamente acota el crecimiento de memoria (jitter para no reiniciarlos a la vez)
+max_requests = 1000
+max_requests_jitter = 100
+
+
+def when_ready(server):
+    # Se ejecuta en el maestro antes de crear los workers: un solo hilo de GC por servidor
+    from config import (
+        IMAGE_BLOB_GRACE_SECONDS, IMAGE_GC_GRACE_SECONDS, IMAGE_GC_INTERVAL_SECONDS, IMAGE_SHARD_DEPTH,
+        IMAGE_SHARD_WIDTH, IMAGE_STORAGE_LAYOUT, IMAGE_STORAGE_PATH, REPOSITORY_BACKEND
+    )
+    if IMAGE_GC_INTERVAL_SECONDS > 0 and REPOSITORY_BACKEND == "mysql":
+        from infrastructure.storage.content_addressed_store import ContentAddressedImageStore
+        from infrastructure.storage.image_garbage_collector import ImageGarbageCollector
+        from infrastructure.storage.storage_layout import StorageLayout
+        blob_store = ContentAddressedImageStore(
+            IMAGE_STORAGE_PATH, grace_seconds=IMAGE_BLOB_GRACE_SECONDS,
+            layout=StorageLayout.from_config(IMAGE_STORAGE_LAYOUT, IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH)
+        )
+        collector = ImageGarbageCollector(
+            IMAGE_STORAGE_PATH, grace_seconds=IMAGE_GC_GRACE_SECONDS, blob_store=blob_store
+        )
+        collector.start_schedule(IMAGE_GC_INTERVAL_SECONDS)
+
+
+def post_worker_init(worker):
+    # gRPC (cliente de Gemini) necesita su integración con gevent antes de abrir canales
+    if worker_class == "gevent":
+        try:
+            from grpc.experimental import gevent as grpc_gevent
+            grpc_gevent.init_gevent()
+        except ImportError:
+            pass
+    logging.getLogger("gunicorn.error").info(
+        f"Worker {worker.pid} listo (perfil {profile_name}, {threads} hilos)"
+    )
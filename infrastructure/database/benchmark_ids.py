@@ -0,0 +1,114 @@
+import argparse
+import json
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from infrastructure.database.connection import DatabaseConnection
+from utils.helpers import uuid7
+
+logger = logging.getLogger(__name__)
+
+# (nombre, tipo de columna, generador de ids, conversión al valor enviado a MySQL)
+VARIANTS = [
+    ("uuid4_char36", "CHAR(36)", uuid.uuid4, str),
+    ("uuid7_char36", "CHAR(36)", uuid7, str),
+    ("uuid7_binary16", "BINARY(16)", uuid7, lambda value: value.bytes),
+]
+
+
+class IdBenchmark:
+    """
+    Compara el costo de distintos formatos de clave primaria sobre el MySQL configurado.
+
+    Para cada variante crea una tabla temporal con la forma de `images` (clave primaria,
+    una clave foránea indexada y texto), inserta filas por lotes y reporta filas por
+    segundo y el tamaño de datos e índices según information_schema. Las tablas se
+    eliminan al terminar.
+    """
+
+    def __init__(self, rows: int = 50000, batch_size: int = 1000):
+        self.rows = rows
+        self.batch_size = batch_size
+        self.db = DatabaseConnection()
+
+    def run(self) -> List[Dict[str, Any]]:
+        return [self._run_variant(*variant) for variant in VARIANTS]
+
+    def _run_variant(self, name: str, column_type: str, generate: Callable[[], uuid.UUID],
+                     to_db: Callable[[uuid.UUID], Any]) -> Dict[str, Any]:
+        table = f"benchmark_ids_{name}"
+        logger.info("Variante %s: %s filas", name, self.rows)
+        with self.db.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS {table}")
+                cursor.execute(
+                    f"""
+                    CREATE TABLE {table} (
+                        id {column_type} PRIMARY KEY,
+                        parent_id {column_type} NOT NULL,
+                        payload VARCHAR(255) NOT NULL,
+                        INDEX idx_{table}_parent (parent_id)
+                    ) ENGINE=InnoDB
+                    """
+                )
+                try:
+                    elapsed = self._insert(connection, cursor, table, generate, to_db)
+                    cursor.execute(f"ANALYZE TABLE {table}")
+                    cursor.fetchall()
+                    cursor.execute(
+                        """
+                        SELECT data_length, index_length
+                        FROM information_schema.tables
+                        WHERE table_schema = DATABASE() AND table_name = %s
+                        """,
+                        (table,)
+                    )
+                    sizes = cursor.fetchone()
+                finally:
+                    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            finally:
+                cursor.close()
+
+        return {
+            "variant": name,
+            "rows": self.rows,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows / elapsed) if elapsed else None,
+            "data_length": sizes["data_length"],
+            "index_length": sizes["index_length"]
+        }
+
+    def _insert(self, connection, cursor, table: str, generate: Callable[[], uuid.UUID],
+                to_db: Callable[[uuid.UUID], Any]) -> float:
+        """Inserta las filas por lotes (un commit por lote) y devuelve los segundos empleados."""
+        parents = [to_db(generate()) for _ in range(max(1, self.rows // 6))]
+        query = f"INSERT INTO {table} (id, parent_id, payload) VALUES (%s, %s, %s)"
+        started = time.perf_counter()
+        for offset in range(0, self.rows, self.batch_size):
+            count = min(self.batch_size, self.rows - offset)
+            cursor.executemany(query, [
+                (to_db(generate()), parents[(offset + i) % len(parents)], "x" * 64)
+                for i in range(count)
+            ])
+            connection.commit()
+        return time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m infrastructure.database.benchmark_ids"""
+    parser = argparse.ArgumentParser(description="Compara formatos de clave primaria (UUIDv4/v7, CHAR/BINARY)")
+    parser.add_argument("--rows", type=int, default=50000, help="Filas a insertar por variante")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por INSERT")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    benchmark = IdBenchmark(rows=args.rows, batch_size=args.batch_size)
+    print(json.dumps(benchmark.run(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
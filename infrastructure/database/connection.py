@@ -1,51 +1,569 @@
 import mysql.connector
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import itertools
+import logging
 import os
-from contextlib import contextmanager
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
 from mysql.connector import Error
 
+from config import (
+    DB_CONFIG, DB_POOL_SIZE, DB_POOL_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_VALIDATION_INTERVAL, DB_REPLICA_HOSTS, DB_READ_YOUR_WRITES_SECONDS
+)
+from infrastructure.database.query_instrumentation import instrument
+
+logger = logging.getLogger(__name__)
+
+# Conexión reservada por la unidad de trabajo en curso (ver DatabaseConnection.connection)
+_bound_connection: ContextVar[Optional[Any]] = ContextVar("bound_connection", default=None)
+# Estado de la transacción explícita abierta, si la hay (ver DatabaseConnection.transaction)
+_active_transaction: ContextVar[Optional[Dict[str, bool]]] = ContextVar("active_transaction", default=None)
+# Instante (epoch) hasta el que las lecturas van al primario tras una escritura (ver pin_primary)
+_primary_pinned_until: ContextVar[Optional["_PinScope"]] = ContextVar("primary_pinned_until", default=None)
+
+# Solo las lecturas sin bloqueo pueden ir a una réplica
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH|SHOW|EXPLAIN)\b", re.IGNORECASE)
+_LOCKING_READ = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b", re.IGNORECASE)
+
+
+def is_replica_safe(statement: str) -> bool:
+    """Indica si una sentencia es una lectura sin bloqueos (puede ejecutarse en una réplica)."""
+    return bool(_READ_STATEMENT.match(statement)) and not _LOCKING_READ.search(statement)
+
+
+class PoolTimeoutError(Exception):
+    """Excepción lanzada cuando no hay conexiones disponibles dentro del tiempo de espera."""
+    pass
+
+
+class _PooledConnection:
+    """
+    Conexión física junto con los tiempos que usa el pool para reciclarla y validarla.
+    broken se activa cuando una sentencia falla con un error de MySQL: la conexión se
+    descarta al devolverse en lugar de volver al pool sin validar.
+    """
+
+    __slots__ = ("raw", "created_at", "last_used", "broken")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.broken = False
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones MySQL seguro para hilos.
+
+    - pool_size: conexiones que se mantienen abiertas en reposo.
+    - max_overflow: conexiones adicionales permitidas en picos (se cierran al devolverse).
+    - timeout: segundos máximos de espera para obtener una conexión.
+    - recycle: antigüedad máxima (s) de una conexión antes de reemplazarla.
+    - validation_interval: solo se hace ping a conexiones inactivas más de este tiempo (s),
+      en lugar de hacerlo en cada uso.
+    """
+
+    def __init__(
+        self,
+        db_config: Dict[str, Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30,
+        recycle: float = 3600,
+        validation_interval: float = 30
+    ):
+        self._db_config = db_config
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.validation_interval = validation_interval
+
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._open = 0
+        self._checked_out = 0
+        self._pid = os.getpid()
+        self._counters = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "invalidated": 0,
+            "waits": 0,
+            "timeouts": 0
+        }
+
+    def acquire(self) -> _PooledConnection:
+        """Obtiene una conexión del pool, creando una nueva si hay capacidad."""
+        self._check_fork()
+        deadline = time.monotonic() + self.timeout
+        waited = False
+
+        with self._condition:
+            while True:
+                if self._idle:
+                    pooled = self._idle.pop()  # LIFO: reutiliza la conexión más caliente
+                    self._checked_out += 1
+                    break
+                if self._open < self.pool_size + self.max_overflow:
+                    self._open += 1
+                    self._checked_out += 1
+                    pooled = None
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        f"No hay conexiones disponibles tras {self.timeout}s "
+                        f"(pool_size={self.pool_size}, max_overflow={self.max_overflow})"
+                    )
+                if not waited:
+                    self._counters["waits"] += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+            self._counters["checkouts"] += 1
+
+        # La conexión (o su validación) se hace fuera del lock para no bloquear a otros hilos
+        try:
+            if pooled is None:
+                return self._connect()
+            return self._validate(pooled)
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._checked_out -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, pooled: _PooledConnection, discard: bool = False) -> None:
+        """Devuelve una conexión al pool (o la cierra si sobra o quedó inválida)."""
+        if self._pid != os.getpid():
+            return
+
+        pooled.last_used = time.monotonic()
+        with self._condition:
+            self._checked_out -= 1
+            keep = not discard and len(self._idle) < self.pool_size
+            if keep:
+                self._idle.append(pooled)
+            else:
+                self._open -= 1
+                if discard:
+                    self._counters["invalidated"] += 1
+            self._condition.notify()
+
+        if not keep:
+            self._close_quietly(pooled)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas actuales del pool."""
+        with self._condition:
+            return {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "open": self._open,
+                "idle": len(self._idle),
+                "checked_out": self._checked_out,
+                "overflow": max(0, self._open - self.pool_size),
+                **self._counters
+            }
+
+    def dispose(self) -> None:
+        """Cierra todas las conexiones en reposo."""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for pooled in idle:
+            self._close_quietly(pooled)
+
+    def reset_after_fork(self) -> None:
+        """
+        Hook post-fork: el hijo descarta sin cerrarlas las conexiones heredadas y
+        recrea el lock, que pudo copiarse tomado por otro hilo del padre.
+        """
+        self._condition = threading.Condition()
+        self._idle = deque()
+        self._open = 0
+        self._checked_out = 0
+        self._counters = dict.fromkeys(self._counters, 0)
+        self._pid = os.getpid()
+
+    def _connect(self) -> _PooledConnection:
+        try:
+            raw = mysql.connector.connect(**self._db_config)
+        except Error as e:
+            raise Exception(f"Error al conectar a MySQL: {e}")
+        with self._condition:
+            self._counters["created"] += 1
+        return _PooledConnection(raw)
+
+    def _validate(self, pooled: _PooledConnection) -> _PooledConnection:
+        """Recicla conexiones viejas y hace ping solo a las que llevan tiempo inactivas."""
+        now = time.monotonic()
+        if now - pooled.created_at > self.recycle:
+            self._close_quietly(pooled)
+            with self._condition:
+                self._counters["recycled"] += 1
+            return self._connect()
+
+        if now - pooled.last_used > self.validation_interval:
+            try:
+                pooled.raw.ping(reconnect=False)
+            except Error:
+                self._close_quietly(pooled)
+                with self._condition:
+                    self._counters["invalidated"] += 1
+                return self._connect()
+
+        return pooled
+
+    def _check_fork(self) -> None:
+        """
+        Tras un fork (p. ej. workers de gunicorn) las conexiones heredadas comparten
+        socket con el proceso padre: se descartan sin cerrarlas.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._condition:
+            if self._pid != os.getpid():
+                self._idle.clear()
+                self._open = 0
+                self._checked_out = 0
+                self._pid = os.getpid()
+
+    @staticmethod
+    def _close_quietly(pooled: _PooledConnection) -> None:
+        try:
+            pooled.raw.close()
+        except Exception:
+            pass
+
+
+def _replica_config(host: str) -> Dict[str, Any]:
+    """Configuración de conexión de una réplica: mismas credenciales, otro host[:puerto]."""
+    config = dict(DB_CONFIG)
+    if ":" in host:
+        host, port = host.rsplit(":", 1)
+        config["port"] = int(port)
+    config["host"] = host
+    return config
+
+
+class _RoutingCursor:
+    """
+    Cursor que elige la conexión al ejecutar la primera sentencia: las lecturas sin
+    bloqueo van a una réplica y el resto (o cualquier lectura con el primario fijado)
+    al primario. Si tras leer de una réplica llega una escritura, el resto del bloque
+    continúa en el primario.
+    """
+
+    def __init__(self, db: "DatabaseConnection", dictionary: bool):
+        self._db = db
+        self._dictionary = dictionary
+        self._stack: Optional[ExitStack] = None
+        self._cursor = None
+        self._on_replica = False
+
+    def execute(self, operation, params=(), *args, **kwargs):
+        self._route(operation)
+        return self._cursor.execute(operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self._route(operation)
+        return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+
+    def __getattr__(self, name):
+        if self._cursor is None:
+            raise AttributeError(f"El cursor aún no ejecutó ninguna sentencia ({name})")
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _route(self, operation: str) -> None:
+        read = is_replica_safe(operation)
+        if not read:
+            pin_primary()
+        if self._cursor is not None and (read or not self._on_replica):
+            return
+
+        if self._cursor is not None:
+            logger.warning("Escritura tras una lectura en réplica: el bloque continúa en el primario")
+            self._close()
+
+        self._stack = ExitStack()
+        if read and not primary_pinned():
+            try:
+                self._cursor = self._stack.enter_context(self._db._replica_cursor(self._dictionary))
+                self._on_replica = True
+                return
+            except Exception as e:
+                logger.warning("Réplica no disponible, se lee del primario: %s", e)
+                self._stack = ExitStack()
+        self._cursor = self._stack.enter_context(self._db._primary_cursor(self._dictionary))
+        self._on_replica = False
+
+    def _close(self, exc_info=(None, None, None)) -> None:
+        stack, self._stack, self._cursor = self._stack, None, None
+        if stack is not None:
+            stack.__exit__(*exc_info)
+
+
+class _PinScope:
+    """
+    Plazo de lectura en el primario de una petición. Es mutable para que las
+    escrituras hechas en copias del contexto (asyncio.to_thread en la ruta ASGI)
+    también fijen la petición que las lanzó.
+    """
+
+    __slots__ = ("until",)
+
+    def __init__(self, until: float = 0.0):
+        self.until = until
+
+
+def pin_primary(seconds: Optional[float] = None) -> None:
+    """
+    Fija las lecturas del contexto actual (petición o hilo) al primario durante
+    `seconds` (por defecto DB_READ_YOUR_WRITES_SECONDS), tras una escritura.
+    """
+    until = time.time() + (DB_READ_YOUR_WRITES_SECONDS if seconds is None else seconds)
+    scope = _primary_pinned_until.get()
+    if scope is None:
+        _primary_pinned_until.set(_PinScope(until))
+    elif until > scope.until:
+        scope.until = until
+
+
+def primary_pinned() -> bool:
+    return primary_pinned_until() > time.time()
+
+
+def primary_pinned_until() -> float:
+    """Instante (epoch) hasta el que el contexto actual lee del primario (0 si no aplica)."""
+    scope = _primary_pinned_until.get()
+    return scope.until if scope else 0.0
+
+
+def begin_request_scope(pinned_until: float = 0.0):
+    """
+    Inicia el estado de enrutamiento de una petición. pinned_until es el valor que la
+    sesión trajo de una petición anterior (se acota a la ventana configurada).
+    Retorna el token para end_request_scope.
+    """
+    pinned_until = min(pinned_until, time.time() + DB_READ_YOUR_WRITES_SECONDS)
+    return _primary_pinned_until.set(_PinScope(pinned_until))
+
+
+def end_request_scope(token) -> None:
+    _primary_pinned_until.reset(token)
+
+
 class DatabaseConnection:
-    """Clase para manejar la conexión a la base de datos MySQL."""
-    
+    """
+    Clase para manejar las conexiones a la base de datos MySQL.
+
+    Todas las instancias comparten un único pool de conexiones seguro para hilos;
+    cada cursor toma una conexión del pool y la devuelve al terminar.
+
+    Con réplicas configuradas (DB_REPLICA_HOSTS), get_cursor() envía las lecturas
+    sin bloqueo a una réplica (round-robin) y las escrituras al primario. Tras una
+    escritura las lecturas del mismo contexto vuelven al primario durante
+    DB_READ_YOUR_WRITES_SECONDS. connection() y transaction() usan siempre el primario.
+    """
+
     _instance = None
-    
+    _instance_lock = threading.Lock()
+
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DatabaseConnection, cls).__new__(cls)
-            cls._instance._connection = None
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(DatabaseConnection, cls).__new__(cls)
+                    pool_options = dict(
+                        pool_size=DB_POOL_SIZE,
+                        max_overflow=DB_POOL_MAX_OVERFLOW,
+                        timeout=DB_POOL_TIMEOUT,
+                        recycle=DB_POOL_RECYCLE,
+                        validation_interval=DB_POOL_VALIDATION_INTERVAL
+                    )
+                    instance._pool = ConnectionPool(DB_CONFIG, **pool_options)
+                    instance._replica_pools = [
+                        ConnectionPool(_replica_config(host), **pool_options) for host in DB_REPLICA_HOSTS
+                    ]
+                    instance._replica_cycle = itertools.cycle(instance._replica_pools)
+                    cls._instance = instance
         return cls._instance
-    
-    def __init__(self):
-        self._db_config = {
-            "host": os.getenv("DB_HOST", "localhost"),
-            "user": os.getenv("DB_USER", "root"),
-            "password": os.getenv("DB_PASSWORD", "angelo"), # esta contraseña es temporal y local
-            "database": os.getenv("DB_NAME", "santa_fe"),
-        }
-    
+
+    @contextmanager
+    def connection(self):
+        """
+        Reserva una conexión del pool para una unidad de trabajo.
+        Los cursores abiertos dentro del bloque (en el mismo hilo o contexto) la reutilizan.
+        """
+        bound = _bound_connection.get()
+        if bound is not None:
+            yield bound.raw
+            return
+
+        pooled = self._pool.acquire()
+        token = _bound_connection.set(pooled)
+        try:
+            yield pooled.raw
+        except Error:
+            pooled.broken = True
+            raise
+        finally:
+            _bound_connection.reset(token)
+            self._pool.release(pooled, discard=pooled.broken)
+
+    @staticmethod
+    def _mark_broken() -> None:
+        """
+        Marca para descarte la conexión reservada en curso. Se llama antes de
+        envolver un Error de MySQL en una Exception genérica, que connection() ya
+        no puede distinguir.
+        """
+        bound = _bound_connection.get()
+        if bound is not None:
+            bound.broken = True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa todas las operaciones del bloque en una única transacción.
+        Los cursores abiertos dentro no confirman por separado: se hace un solo
+        commit al salir, o rollback completo si se lanza una excepción.
+        Las transacciones anidadas se unen a la exterior.
+
+        Si una operación falla dentro del bloque la transacción queda marcada para
+        rollback, aunque quien la llamó haya capturado la excepción.
+        """
+        if _active_transaction.get() is not None:
+            yield
+            return
+
+        with self.connection() as connection:
+            state = {"rollback_only": False}
+            token = _active_transaction.set(state)
+            try:
+                yield
+                if state["rollback_only"]:
+                    raise Exception("La transacción se revirtió por un error en una de sus operaciones")
+                connection.commit()
+            except Error as e:
+                self._mark_broken()
+                connection.rollback()
+                raise Exception(f"Error en la operación de base de datos: {e}")
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                _active_transaction.reset(token)
+                if self._replica_pools:
+                    pin_primary()
+
     @contextmanager
     def get_cursor(self, dictionary=True):
         """
         Proporciona un cursor para ejecutar consultas SQL.
-        Gestiona la conexión y el cierre automáticamente.
+        Toma una conexión del pool y la devuelve automáticamente al terminar.
+        Dentro de transaction() el commit se delega a la transacción.
+        Con réplicas configuradas, la conexión se elige según la primera sentencia.
         """
-        if self._connection is None or not self._connection.is_connected():
+        if not self._replica_pools or _bound_connection.get() is not None:
+            with self._primary_cursor(dictionary) as cursor:
+                yield cursor
+            return
+
+        cursor = _RoutingCursor(self, dictionary)
+        try:
+            yield cursor
+        except BaseException as e:
+            cursor._close((type(e), e, e.__traceback__))
+            raise
+        cursor._close()
+
+    @contextmanager
+    def _primary_cursor(self, dictionary=True):
+        with self.connection() as connection:
+            cursor = instrument(connection.cursor(dictionary=dictionary), "primary")
+            transaction_state = _active_transaction.get()
+            if transaction_state is not None:
+                try:
+                    yield cursor
+                except Error as e:
+                    self._mark_broken()
+                    transaction_state["rollback_only"] = True
+                    raise Exception(f"Error en la operación de base de datos: {e}")
+                except Exception:
+                    transaction_state["rollback_only"] = True
+                    raise
+                finally:
+                    cursor.close()
+                return
+
             try:
-                self._connection = mysql.connector.connect(**self._db_config)
+                yield cursor
+                connection.commit()
             except Error as e:
-                raise Exception(f"Error al conectar a MySQL: {e}")
-                
-        cursor = self._connection.cursor(dictionary=dictionary)
+                self._mark_broken()
+                connection.rollback()
+                raise Exception(f"Error en la operación de base de datos: {e}")
+            except Exception:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def _replica_cursor(self, dictionary=True):
+        """
+        Cursor de solo lectura en una réplica. Al terminar se hace rollback para cerrar
+        la vista de lectura de la transacción implícita: así la siguiente consulta con
+        esa conexión ve los datos replicados más recientes.
+        """
+        pool = next(self._replica_cycle)
+        pooled = pool.acquire()
+        discard = False
         try:
-            yield cursor
-            self._connection.commit()
-        except Error as e:
-            self._connection.rollback()
-            raise Exception(f"Error en la operación de base de datos: {e}")
+            cursor = instrument(pooled.raw.cursor(dictionary=dictionary), "replica")
+            try:
+                yield cursor
+            except Error as e:
+                discard = True
+                raise Exception(f"Error en la operación de base de datos: {e}")
+            finally:
+                cursor.close()
+                if not discard:
+                    pooled.raw.rollback()
         finally:
-            cursor.close()
-    
+            pool.release(pooled, discard=discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas del pool de conexiones (y de los pools de réplicas)."""
+        stats = self._pool.stats()
+        stats["replicas"] = [pool.stats() for pool in self._replica_pools]
+        return stats
+
+    def reset_after_fork(self) -> None:
+        """Hook post-fork: cada proceso usa sus propias conexiones (primario y réplicas)."""
+        DatabaseConnection._instance_lock = threading.Lock()
+        self._pool.reset_after_fork()
+        for pool in self._replica_pools:
+            pool.reset_after_fork()
+
     def close(self):
-        """Cierra la conexión a la base de datos."""
-        if self._connection and self._connection.is_connected():
-            self._connection.close()
+        """Cierra las conexiones en reposo del pool."""
+        self._pool.dispose()
+        for pool in self._replica_pools:
+            pool.dispose()
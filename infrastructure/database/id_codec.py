@@ -0,0 +1,49 @@
+from typing import Optional, Union
+from uuid import UUID
+
+from config import ID_STORAGE_FORMAT
+
+IdValue = Union[UUID, str, bytes, None]
+
+
+class IdCodec:
+    """
+    Conversión de identificadores en el límite de los repositorios.
+
+    - "char36": los ids se guardan como VARCHAR(36) ('xxxxxxxx-xxxx-...').
+    - "binary16": los ids se guardan como BINARY(16) (bytes del UUID en orden
+      big-endian, así que los UUIDv7 quedan ordenados por tiempo en el índice).
+
+    El resto de la aplicación trabaja siempre con uuid.UUID.
+    """
+
+    FORMATS = ("char36", "binary16")
+
+    def __init__(self, storage_format: str = "char36"):
+        if storage_format not in self.FORMATS:
+            raise ValueError(f"Formato de almacenamiento de ids no válido: {storage_format}")
+        self.storage_format = storage_format
+        self.binary = storage_format == "binary16"
+
+    def to_db(self, value: IdValue) -> Union[str, bytes, None]:
+        """Convierte un UUID (o su texto) al valor que se envía a MySQL."""
+        if value is None:
+            return None
+        if not isinstance(value, UUID):
+            value = self.from_db(value)
+        return value.bytes if self.binary else str(value)
+
+    def from_db(self, value: IdValue) -> Optional[UUID]:
+        """Convierte un valor leído de MySQL (texto o bytes) a UUID."""
+        if value is None:
+            return None
+        if isinstance(value, UUID):
+            return value
+        if isinstance(value, (bytes, bytearray)):
+            if len(value) == 16:
+                return UUID(bytes=bytes(value))
+            value = value.decode("ascii")
+        return UUID(value)
+
+
+id_codec = IdCodec(ID_STORAGE_FORMAT)
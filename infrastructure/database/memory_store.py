@@ -0,0 +1,352 @@
+import copy
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from domain.entities.image import Image
+from domain.entities.scenario import Scenario
+from domain.entities.story import Story
+from domain.entities.teacher import Teacher
+from domain.exceptions.domain_exceptions import RepositoryException
+
+# Clave de orden de los listados: (created_at, id) como en idx_stories_summary
+StoryKey = Tuple[datetime, str]
+
+_MISSING = object()
+
+
+def as_id(value) -> Optional[UUID]:
+    """
+    Clave de un id recibido como UUID o como texto (los repositorios MySQL y
+    SQLite aceptan ambos). Un texto que no es un UUID no coincide con nada.
+    """
+    if value is None or isinstance(value, UUID):
+        return value
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def story_key(story: Story) -> StoryKey:
+    return (story.created_at, str(story.id))
+
+
+class SortedKeys:
+    """Lista ordenada de claves (equivalente en memoria a un índice B-tree)."""
+
+    def __init__(self):
+        self.keys: List[StoryKey] = []
+
+    def add(self, key: StoryKey) -> None:
+        insort(self.keys, key)
+
+    def remove(self, key: StoryKey) -> None:
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            del self.keys[position]
+
+    def page_before(self, limit: int, after: Optional[StoryKey] = None) -> List[StoryKey]:
+        """Hasta limit claves anteriores a after (o las últimas), de mayor a menor."""
+        end = bisect_left(self.keys, after) if after else len(self.keys)
+        return self.keys[max(end - limit, 0):end][::-1]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class InMemoryStore:
+    """
+    Almacén en memoria con la misma semántica que el esquema relacional: claves
+    únicas, claves foráneas (RepositoryException si se violan) y borrados en cascada
+    (cuento -> escenarios -> imagen; profesor -> cuentos sin profesor).
+
+    Guarda copias de las entidades y nunca modifica una entidad almacenada: cada
+    cambio reemplaza la copia, así que modificar un objeto devuelto no altera el
+    almacén. Las operaciones se serializan con un lock reentrante; dentro de
+    transaction() cada cambio anota su inverso para poder revertirlo.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.teachers: Dict[UUID, Teacher] = {}
+        self.stories: Dict[UUID, Story] = {}
+        self.scenarios: Dict[UUID, Scenario] = {}
+        self.images: Dict[UUID, Image] = {}
+        # Índices secundarios
+        self.teacher_by_email: Dict[str, UUID] = {}
+        self.teacher_by_username: Dict[str, UUID] = {}
+        self.story_order = SortedKeys()
+        self.stories_by_teacher: Dict[UUID, SortedKeys] = defaultdict(SortedKeys)
+        self.scenarios_by_story: Dict[UUID, Set[UUID]] = defaultdict(set)
+        self.image_by_scenario: Dict[UUID, UUID] = {}
+        self._active_transaction: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+            f"memory_transaction_{id(self)}", default=None
+        )
+
+    def reset_after_fork(self) -> None:
+        """Hook post-fork: recrea el lock. Cada proceso se queda con su propia copia de los datos."""
+        self.lock = threading.RLock()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa las operaciones del bloque: si el bloque lanza una excepción, o falló
+        alguna operación dentro de él, se deshacen sus cambios. Las transacciones
+        anidadas se unen a la exterior.
+        """
+        if self._active_transaction.get() is not None:
+            yield
+            return
+
+        with self.lock:
+            state = {"rollback_only": False, "undo": []}
+            token = self._active_transaction.set(state)
+            try:
+                yield
+                if state["rollback_only"]:
+                    raise Exception("La transacción se revirtió por un error en una de sus operaciones")
+            except Exception:
+                for undo in reversed(state["undo"]):
+                    undo()
+                raise
+            finally:
+                self._active_transaction.reset(token)
+
+    @contextmanager
+    def operation(self):
+        """
+        Equivalente a get_cursor(): serializa la operación, deshace sus cambios
+        parciales si falla y, dentro de una transacción, la marca para revertirse.
+        """
+        with self.lock:
+            transaction_state = self._active_transaction.get()
+            if transaction_state is not None:
+                try:
+                    yield self
+                except Exception:
+                    transaction_state["rollback_only"] = True
+                    raise
+                return
+
+            state = {"rollback_only": False, "undo": []}
+            token = self._active_transaction.set(state)
+            try:
+                yield self
+            except Exception:
+                for undo in reversed(state["undo"]):
+                    undo()
+                raise
+            finally:
+                self._active_transaction.reset(token)
+
+    # Profesores
+
+    def insert_teacher(self, teacher: Teacher) -> None:
+        if teacher.id in self.teachers:
+            raise RepositoryException(f"Ya existe un profesor con ID: {teacher.id}")
+        self._check_unique_teacher(teacher)
+        self._put(self.teachers, teacher.id, copy.copy(teacher))
+        self._put(self.teacher_by_email, teacher.email, teacher.id)
+        self._put(self.teacher_by_username, teacher.username, teacher.id)
+
+    def update_teacher(self, teacher: Teacher) -> bool:
+        current = self.teachers.get(teacher.id)
+        if not current:
+            return False
+        self._check_unique_teacher(teacher)
+        self._pop(self.teacher_by_email, current.email)
+        self._pop(self.teacher_by_username, current.username)
+        self._put(self.teachers, teacher.id, self._replace(teacher, created_at=current.created_at))
+        self._put(self.teacher_by_email, teacher.email, teacher.id)
+        self._put(self.teacher_by_username, teacher.username, teacher.id)
+        return True
+
+    def delete_teacher(self, teacher_id: UUID) -> bool:
+        teacher = self._pop(self.teachers, teacher_id)
+        if not teacher:
+            return False
+        self._pop(self.teacher_by_email, teacher.email)
+        self._pop(self.teacher_by_username, teacher.username)
+        # ON DELETE SET NULL
+        teacher_stories = self._pop(self.stories_by_teacher, teacher_id)
+        for _, story_id in (teacher_stories.keys if teacher_stories else ()):
+            story_uuid = UUID(story_id)
+            self._put(self.stories, story_uuid, self._replace(self.stories[story_uuid], teacher_id=None))
+        return True
+
+    def _check_unique_teacher(self, teacher: Teacher) -> None:
+        owner = self.teacher_by_email.get(teacher.email)
+        if owner and owner != teacher.id:
+            raise RepositoryException(f"Ya existe un profesor con el email {teacher.email}")
+        owner = self.teacher_by_username.get(teacher.username)
+        if owner and owner != teacher.id:
+            raise RepositoryException(f"Ya existe un profesor con el usuario {teacher.username}")
+
+    # Cuentos
+
+    def insert_story(self, story: Story) -> None:
+        if story.id in self.stories:
+            raise RepositoryException(f"Ya existe un cuento con ID: {story.id}")
+        self._check_teacher_reference(story.teacher_id)
+        stored = copy.copy(story)
+        self._put(self.stories, story.id, stored)
+        self._index_story(stored)
+
+    def update_story(self, story: Story) -> bool:
+        current = self.stories.get(story.id)
+        if not current:
+            return False
+        self._check_teacher_reference(story.teacher_id)
+        self._unindex_story(current)
+        updated = self._replace(story, created_at=current.created_at)
+        self._put(self.stories, story.id, updated)
+        self._index_story(updated)
+        return True
+
+    def delete_story(self, story_id: UUID) -> bool:
+        story = self._pop(self.stories, story_id)
+        if not story:
+            return False
+        self._unindex_story(story)
+        # ON DELETE CASCADE
+        for scenario_id in list(self.scenarios_by_story.get(story_id, ())):
+            self.delete_scenario(scenario_id)
+        return True
+
+    def _check_teacher_reference(self, teacher_id: Optional[UUID]) -> None:
+        if teacher_id and teacher_id not in self.teachers:
+            raise RepositoryException(f"No existe el profesor con ID: {teacher_id}")
+
+    def _index_story(self, story: Story) -> None:
+        self._add_key(self.story_order, story_key(story))
+        if story.teacher_id:
+            self._add_key(self.stories_by_teacher[story.teacher_id], story_key(story))
+
+    def _unindex_story(self, story: Story) -> None:
+        self._remove_key(self.story_order, story_key(story))
+        if story.teacher_id and story.teacher_id in self.stories_by_teacher:
+            self._remove_key(self.stories_by_teacher[story.teacher_id], story_key(story))
+
+    # Escenarios
+
+    def insert_scenario(self, scenario: Scenario) -> None:
+        if scenario.id in self.scenarios:
+            raise RepositoryException(f"Ya existe un escenario con ID: {scenario.id}")
+        if scenario.story_id not in self.stories:
+            raise RepositoryException(f"No existe el cuento con ID: {scenario.story_id}")
+        self._put(self.scenarios, scenario.id, copy.copy(scenario))
+        self._add_member(self.scenarios_by_story[scenario.story_id], scenario.id)
+
+    def update_scenario(self, scenario: Scenario) -> bool:
+        current = self.scenarios.get(scenario.id)
+        if not current:
+            return False
+        self._put(self.scenarios, scenario.id, self._replace(
+            current,
+            description=scenario.description,
+            sequence_number=scenario.sequence_number,
+            prompt_for_image=scenario.prompt_for_image
+        ))
+        return True
+
+    def delete_scenario(self, scenario_id: UUID) -> bool:
+        scenario = self._pop(self.scenarios, scenario_id)
+        if not scenario:
+            return False
+        if scenario.story_id in self.scenarios_by_story:
+            self._discard_member(self.scenarios_by_story[scenario.story_id], scenario_id)
+        # ON DELETE CASCADE
+        image_id = self._pop(self.image_by_scenario, scenario_id)
+        if image_id:
+            self._pop(self.images, image_id)
+        return True
+
+    def story_scenarios(self, story_id: UUID) -> List[Scenario]:
+        """Escenarios de un cuento ordenados por sequence_number."""
+        scenarios = [self.scenarios[scenario_id] for scenario_id in self.scenarios_by_story.get(story_id, ())]
+        return sorted(scenarios, key=lambda scenario: scenario.sequence_number)
+
+    # Imágenes
+
+    def upsert_image(self, image: Image) -> None:
+        """Inserta la imagen de un escenario o reemplaza la existente (scenario_id es único)."""
+        if image.scenario_id not in self.scenarios:
+            raise RepositoryException(f"No existe el escenario con ID: {image.scenario_id}")
+        replaced_id = self.image_by_scenario.get(image.scenario_id)
+        if image.id in self.images and image.id != replaced_id:
+            raise RepositoryException(f"Ya existe una imagen con ID: {image.id}")
+        if replaced_id:
+            self._pop(self.images, replaced_id)
+        self._put(self.images, image.id, copy.copy(image))
+        self._put(self.image_by_scenario, image.scenario_id, image.id)
+
+    def update_image(self, image: Image) -> bool:
+        current = self.images.get(image.id)
+        if not current:
+            return False
+        self._put(self.images, image.id, self._replace(current, prompt=image.prompt, image_url=image.image_url))
+        return True
+
+    def delete_image(self, image_id: UUID) -> bool:
+        image = self._pop(self.images, image_id)
+        if not image:
+            return False
+        self._pop(self.image_by_scenario, image.scenario_id)
+        return True
+
+    def scenario_image(self, scenario_id: UUID) -> Optional[Image]:
+        image_id = self.image_by_scenario.get(scenario_id)
+        return self.images[image_id] if image_id else None
+
+    # Cambios primitivos: cada uno anota su inverso en la transacción activa
+
+    def _record(self, undo: Callable[[], None]) -> None:
+        state = self._active_transaction.get()
+        if state is not None:
+            state["undo"].append(undo)
+
+    def _put(self, mapping: dict, key, value) -> None:
+        previous = mapping.get(key, _MISSING)
+        mapping[key] = value
+        if previous is _MISSING:
+            self._record(lambda: mapping.pop(key, None))
+        else:
+            self._record(lambda: mapping.__setitem__(key, previous))
+
+    def _pop(self, mapping: dict, key):
+        previous = mapping.pop(key, _MISSING)
+        if previous is _MISSING:
+            return None
+        self._record(lambda: mapping.__setitem__(key, previous))
+        return previous
+
+    def _add_key(self, index: SortedKeys, key: StoryKey) -> None:
+        index.add(key)
+        self._record(lambda: index.remove(key))
+
+    def _remove_key(self, index: SortedKeys, key: StoryKey) -> None:
+        index.remove(key)
+        self._record(lambda: index.add(key))
+
+    def _add_member(self, members: set, value) -> None:
+        if value not in members:
+            members.add(value)
+            self._record(lambda: members.discard(value))
+
+    def _discard_member(self, members: set, value) -> None:
+        if value in members:
+            members.discard(value)
+            self._record(lambda: members.add(value))
+
+    @staticmethod
+    def _replace(entity, **changes):
+        updated = copy.copy(entity)
+        for name, value in changes.items():
+            setattr(updated, name, value)
+        return updated
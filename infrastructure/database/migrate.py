@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import logging
+import os
+import re
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from mysql.connector import Error, errorcode
+
+from infrastructure.database.connection import DatabaseConnection
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+_MIGRATION_FILE = re.compile(r'^(\d{4})_([a-z0-9_]+)\.(up|down)\.sql$')
+
+# Errores que indican que el cambio ya estaba aplicado (p. ej. bases creadas con una
+# versión anterior de db_setup.sql): se registran como advertencia y se continúa.
+_ALREADY_APPLIED_ERRORS = {
+    errorcode.ER_DUP_KEYNAME,
+    errorcode.ER_TABLE_EXISTS_ERROR,
+    errorcode.ER_CANT_DROP_FIELD_OR_KEY,
+    errorcode.ER_BAD_TABLE_ERROR,
+}
+
+_LOCK_NAME = "tiyc_schema_migrations"
+
+
+class Migration:
+    """Una migración versionada: par de scripts NNNN_nombre.up.sql / .down.sql."""
+
+    def __init__(self, version: str, name: str, up_path: str, down_path: Optional[str]):
+        self.version = version
+        self.name = name
+        self.up_path = up_path
+        self.down_path = down_path
+
+    @property
+    def checksum(self) -> str:
+        with open(self.up_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def statements(self, direction: str) -> List[str]:
+        path = self.up_path if direction == "up" else self.down_path
+        if not path:
+            raise Exception(f"La migración {self.version}_{self.name} no tiene script down")
+        with open(path, encoding="utf-8") as f:
+            return split_statements(f.read())
+
+
+def split_statements(sql: str) -> List[str]:
+    """Separa un script en sentencias (terminadas en ';' al final de línea), sin comentarios."""
+    statements = []
+    current = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current).rstrip().rstrip(";"))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def load_migrations(path: str = MIGRATIONS_PATH) -> List[Migration]:
+    """Carga las migraciones del directorio ordenadas por versión."""
+    found: Dict[str, Dict[str, str]] = {}
+    for filename in sorted(os.listdir(path)):
+        match = _MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, direction = match.groups()
+        entry = found.setdefault(version, {"name": name})
+        if entry["name"] != name:
+            raise Exception(f"Versión de migración duplicada: {version}")
+        entry[direction] = os.path.join(path, filename)
+
+    migrations = []
+    for version in sorted(found):
+        entry = found[version]
+        if "up" not in entry:
+            raise Exception(f"La migración {version}_{entry['name']} no tiene script up")
+        migrations.append(Migration(version, entry["name"], entry["up"], entry.get("down")))
+    return migrations
+
+
+class MigrationRunner:
+    """
+    Aplica y revierte migraciones de esquema registrándolas en schema_migrations.
+
+    - Un bloqueo con nombre (GET_LOCK) evita que dos procesos migren a la vez.
+    - lock_wait_timeout acota la espera por el metadata lock: si una consulta larga
+      lo retiene, la migración falla rápido en lugar de bloquear todo el tráfico
+      que se encola detrás del ALTER.
+    - Los scripts usan ALGORITHM=INPLACE, LOCK=NONE para que MySQL rechace un
+      cambio que requiera bloquear la tabla en vez de aplicarlo en silencio.
+    """
+
+    def __init__(self, migrations_path: str = MIGRATIONS_PATH, lock_wait_timeout: int = 5):
+        self.migrations_path = migrations_path
+        self.lock_wait_timeout = lock_wait_timeout
+        self.db = DatabaseConnection()
+
+    def status(self) -> List[Dict[str, str]]:
+        """Estado de cada migración: applied, pending o modified (script editado tras aplicarse)."""
+        with self.db.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                self._ensure_table(cursor)
+                applied = self._applied(cursor)
+            finally:
+                cursor.close()
+
+        result = []
+        for migration in load_migrations(self.migrations_path):
+            record = applied.get(migration.version)
+            if not record:
+                state = "pending"
+            elif record["checksum"] != migration.checksum:
+                state = "modified"
+            else:
+                state = "applied"
+            result.append({
+                "version": migration.version,
+                "name": migration.name,
+                "state": state,
+                "applied_at": record["applied_at"].isoformat() if record else None
+            })
+        return result
+
+    def up(self, target: Optional[str] = None) -> List[str]:
+        """Aplica las migraciones pendientes hasta target (incluida), o todas."""
+        with self._locked() as (connection, cursor):
+            applied = self._applied(cursor)
+            done = []
+            for migration in load_migrations(self.migrations_path):
+                if target and migration.version > target:
+                    break
+                if migration.version in applied:
+                    continue
+                self._run(connection, cursor, migration, "up")
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum)
+                )
+                connection.commit()
+                done.append(f"{migration.version}_{migration.name}")
+            return done
+
+    def down(self, steps: int = 1) -> List[str]:
+        """Revierte las últimas `steps` migraciones aplicadas."""
+        with self._locked() as (connection, cursor):
+            applied = self._applied(cursor)
+            migrations = {m.version: m for m in load_migrations(self.migrations_path)}
+            # Solo las migraciones de este directorio (las opcionales viven aparte)
+            versions = [version for version in applied if version in migrations]
+            done = []
+            for version in sorted(versions, reverse=True)[:steps]:
+                migration = migrations[version]
+                self._run(connection, cursor, migration, "down")
+                cursor.execute("DELETE FROM schema_migrations WHERE version = %s", (version,))
+                connection.commit()
+                done.append(f"{migration.version}_{migration.name}")
+            return done
+
+    def _run(self, connection, cursor, migration: Migration, direction: str) -> None:
+        """
+        Ejecuta las sentencias de un script. Las sentencias DML de un mismo script
+        se confirman juntas (los DDL de MySQL confirman implícitamente).
+        """
+        logger.info("Migración %s_%s (%s)", migration.version, migration.name, direction)
+        for statement in migration.statements(direction):
+            try:
+                cursor.execute(statement)
+                if cursor.with_rows:
+                    cursor.fetchall()
+            except Error as e:
+                if e.errno in _ALREADY_APPLIED_ERRORS:
+                    logger.warning("Sentencia omitida, el cambio ya existe: %s", e.msg)
+                    continue
+                connection.rollback()
+                raise Exception(f"Error en la migración {migration.version}_{migration.name}: {e}")
+
+    @contextmanager
+    def _locked(self):
+        """Reserva una conexión, toma el bloqueo de migraciones y prepara schema_migrations."""
+        with self.db.connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SET SESSION lock_wait_timeout = %s", (self.lock_wait_timeout,))
+                cursor.execute("SELECT GET_LOCK(%s, 10) AS acquired", (_LOCK_NAME,))
+                if not cursor.fetchone()["acquired"]:
+                    raise Exception("Otra ejecución de migraciones está en curso")
+                try:
+                    self._ensure_table(cursor)
+                    yield connection, cursor
+                finally:
+                    cursor.execute("SELECT RELEASE_LOCK(%s)", (_LOCK_NAME,))
+                    cursor.fetchall()
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _ensure_table(cursor) -> None:
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version VARCHAR(4) PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                checksum CHAR(64) NOT NULL,
+                applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+    @staticmethod
+    def _applied(cursor) -> Dict[str, Dict]:
+        cursor.execute("SELECT version, name, checksum, applied_at FROM schema_migrations")
+        return {row["version"]: row for row in cursor.fetchall()}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m infrastructure.database.migrate {up,down,status}"""
+    from config import MIGRATION_LOCK_WAIT_TIMEOUT
+
+    parser = argparse.ArgumentParser(description="Migraciones de esquema de la base de datos")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    up_parser = subparsers.add_parser("up", help="Aplica las migraciones pendientes")
+    up_parser.add_argument("--target", help="Versión máxima a aplicar (p. ej. 0002)")
+    down_parser = subparsers.add_parser("down", help="Revierte las últimas migraciones")
+    down_parser.add_argument("--steps", type=int, default=1, help="Cantidad de migraciones a revertir")
+    subparsers.add_parser("status", help="Muestra el estado de cada migración")
+    parser.add_argument("--path", default=MIGRATIONS_PATH,
+                        help="Directorio de migraciones (p. ej. migrations/optional)")
+    parser.add_argument("--lock-wait-timeout", type=int, default=MIGRATION_LOCK_WAIT_TIMEOUT,
+                        help="Segundos máximos de espera por el metadata lock de cada tabla")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    runner = MigrationRunner(args.path, lock_wait_timeout=args.lock_wait_timeout)
+
+    if args.command == "status":
+        for row in runner.status():
+            print(f"{row['version']}  {row['state']:<9} {row['name']}  {row['applied_at'] or ''}")
+    elif args.command == "up":
+        applied = runner.up(args.target)
+        print("\n".join(applied) if applied else "No hay migraciones pendientes")
+    else:
+        reverted = runner.down(args.steps)
+        print("\n".join(reverted) if reverted else "No hay migraciones aplicadas")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
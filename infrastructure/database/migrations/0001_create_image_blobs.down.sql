@@ -0,0 +1,3 @@
+ALTER TABLE images DROP INDEX idx_images_image_url, ALGORITHM=INPLACE, LOCK=NONE;
+
+DROP TABLE IF EXISTS image_blobs;
@@ -0,0 +1,13 @@
+-- Blobs de imágenes direccionados por contenido (sha256) con conteo de referencias
+CREATE TABLE IF NOT EXISTS image_blobs (
+    hash CHAR(64) PRIMARY KEY,
+    extension VARCHAR(8) NOT NULL DEFAULT 'png',
+    size_bytes BIGINT NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    last_seen_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_image_blobs_reclaim (ref_count, last_seen_at)
+);
+
+-- Búsqueda de referencias por URL (recolector de basura y reclaim de blobs)
+ALTER TABLE images ADD INDEX idx_images_image_url (image_url), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,6 @@
+ALTER TABLE scenarios DROP INDEX idx_scenarios_story_sequence, ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE stories
+    DROP INDEX idx_stories_teacher_summary,
+    DROP INDEX idx_stories_summary,
+    ALGORITHM=INPLACE, LOCK=NONE;
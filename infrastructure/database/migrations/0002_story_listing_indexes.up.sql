@@ -0,0 +1,12 @@
+-- Índices compuestos para los listados paginados por (created_at, id), sin filesort.
+-- Incluyen las columnas del resumen para que la lectura de stories se resuelva
+-- solo con el índice, sin acceder a las filas con content/context.
+ALTER TABLE stories
+    ADD INDEX idx_stories_teacher_summary (teacher_id, created_at, id, title, category, pedagogical_approach),
+    ADD INDEX idx_stories_summary (created_at, id, title, category, pedagogical_approach),
+    ALGORITHM=INPLACE, LOCK=NONE;
+
+-- Escenarios de un cuento en orden: portada, conteo e hidratación del cuento ilustrado
+ALTER TABLE scenarios
+    ADD INDEX idx_scenarios_story_sequence (story_id, sequence_number),
+    ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,2 @@
+-- Las imágenes eliminadas como duplicadas no se restauran
+ALTER TABLE images DROP INDEX uq_images_scenario_id, ALGORITHM=INPLACE, LOCK=NONE;
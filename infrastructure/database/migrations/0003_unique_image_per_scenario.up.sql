@@ -0,0 +1,22 @@
+-- Cada escenario tiene una sola imagen: las regeneraciones reemplazan la fila existente.
+-- Antes de crear el índice único se eliminan los duplicados, conservando la imagen
+-- más reciente de cada escenario, y se liberan sus referencias a blobs.
+UPDATE image_blobs b
+JOIN (
+    SELECT SUBSTRING_INDEX(SUBSTRING_INDEX(i.image_url, '/', -1), '.', 1) AS hash, COUNT(*) AS refs
+    FROM images i
+    WHERE EXISTS (
+        SELECT 1 FROM images newer
+        WHERE newer.scenario_id = i.scenario_id
+          AND (newer.created_at > i.created_at OR (newer.created_at = i.created_at AND newer.id > i.id))
+    )
+    GROUP BY hash
+) stale ON stale.hash = b.hash
+SET b.ref_count = GREATEST(b.ref_count - stale.refs, 0);
+
+DELETE i FROM images i
+JOIN images newer
+  ON newer.scenario_id = i.scenario_id
+ AND (newer.created_at > i.created_at OR (newer.created_at = i.created_at AND newer.id > i.id));
+
+ALTER TABLE images ADD UNIQUE INDEX uq_images_scenario_id (scenario_id), ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1 @@
+DROP TABLE IF EXISTS teacher_activity_stats;
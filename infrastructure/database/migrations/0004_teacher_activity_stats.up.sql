@@ -0,0 +1,14 @@
+-- Acumulados de actividad por profesor, mantenidos de forma incremental por los
+-- repositorios al crear, modificar o eliminar cuentos (misma transacción).
+-- dimension: total | month (YYYY-MM) | category | approach | weekday (1 = lunes).
+-- teacher_id es VARBINARY para admitir ids en texto o en BINARY(16) (ID_STORAGE_FORMAT).
+-- Para llenar la tabla con los cuentos existentes:
+--   python -m infrastructure.database.rebuild_activity_stats
+CREATE TABLE IF NOT EXISTS teacher_activity_stats (
+    teacher_id VARBINARY(36) NOT NULL,
+    dimension VARCHAR(16) NOT NULL,
+    bucket VARCHAR(100) NOT NULL,
+    story_count INT NOT NULL DEFAULT 0,
+    word_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (teacher_id, dimension, bucket)
+);
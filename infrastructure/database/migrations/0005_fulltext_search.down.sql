@@ -0,0 +1,2 @@
+ALTER TABLE scenarios DROP INDEX ft_scenarios_description, ALGORITHM=INPLACE, LOCK=NONE;
+ALTER TABLE stories DROP INDEX ft_stories_text, ALGORITHM=INPLACE, LOCK=NONE;
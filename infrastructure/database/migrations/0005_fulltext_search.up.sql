@@ -0,0 +1,12 @@
+-- Índices FULLTEXT para la búsqueda de cuentos (/api/stories/search).
+-- InnoDB no admite escrituras concurrentes mientras construye un índice FULLTEXT:
+-- LOCK=SHARED permite lecturas pero bloquea las escrituras de cada tabla durante
+-- la construcción. El primer índice FULLTEXT de una tabla además la reconstruye
+-- (columna oculta FTS_DOC_ID), así que conviene aplicarla en horario de baja actividad.
+ALTER TABLE stories
+    ADD FULLTEXT INDEX ft_stories_text (title, content, context),
+    ALGORITHM=INPLACE, LOCK=SHARED;
+
+ALTER TABLE scenarios
+    ADD FULLTEXT INDEX ft_scenarios_description (description),
+    ALGORITHM=INPLACE, LOCK=SHARED;
@@ -0,0 +1,30 @@
+-- Vuelve a VARCHAR(36). Desplegar con ID_STORAGE_FORMAT=char36 al mismo tiempo.
+ALTER TABLE images DROP FOREIGN KEY images_ibfk_1;
+ALTER TABLE scenarios DROP FOREIGN KEY scenarios_ibfk_1;
+ALTER TABLE stories DROP FOREIGN KEY stories_ibfk_1;
+
+ALTER TABLE teachers MODIFY id VARBINARY(36) NOT NULL;
+ALTER TABLE stories MODIFY id VARBINARY(36) NOT NULL, MODIFY teacher_id VARBINARY(36) NULL;
+ALTER TABLE scenarios MODIFY id VARBINARY(36) NOT NULL, MODIFY story_id VARBINARY(36) NOT NULL;
+ALTER TABLE images MODIFY id VARBINARY(36) NOT NULL, MODIFY scenario_id VARBINARY(36) NOT NULL;
+
+UPDATE teachers SET id = BIN_TO_UUID(id);
+UPDATE stories SET id = BIN_TO_UUID(id), teacher_id = BIN_TO_UUID(teacher_id);
+UPDATE scenarios SET id = BIN_TO_UUID(id), story_id = BIN_TO_UUID(story_id);
+UPDATE images SET id = BIN_TO_UUID(id), scenario_id = BIN_TO_UUID(scenario_id);
+UPDATE teacher_activity_stats SET teacher_id = BIN_TO_UUID(teacher_id) WHERE LENGTH(teacher_id) = 16;
+
+ALTER TABLE teachers MODIFY id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL;
+ALTER TABLE stories
+    MODIFY id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+    MODIFY teacher_id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NULL;
+ALTER TABLE scenarios
+    MODIFY id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+    MODIFY story_id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL;
+ALTER TABLE images
+    MODIFY id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL,
+    MODIFY scenario_id VARCHAR(36) CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci NOT NULL;
+
+ALTER TABLE stories ADD CONSTRAINT stories_ibfk_1 FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE SET NULL;
+ALTER TABLE scenarios ADD CONSTRAINT scenarios_ibfk_1 FOREIGN KEY (story_id) REFERENCES stories(id) ON DELETE CASCADE;
+ALTER TABLE images ADD CONSTRAINT images_ibfk_1 FOREIGN KEY (scenario_id) REFERENCES scenarios(id) ON DELETE CASCADE;
@@ -0,0 +1,32 @@
+-- Convierte los ids VARCHAR(36) a BINARY(16) (UUID_TO_BIN, sin reordenar bytes).
+-- Opcional: aplicar con --path infrastructure/database/migrations/optional y
+-- desplegar con ID_STORAGE_FORMAT=binary16 al mismo tiempo. Requiere las migraciones
+-- regulares ya aplicadas (incluida 0004_teacher_activity_stats).
+-- Reconstruye las tablas (no es un cambio online): requiere ventana de mantenimiento
+-- y un respaldo previo, ya que una interrupción a mitad deja la conversión incompleta.
+-- Las claves foráneas usan los nombres que MySQL asignó al crear db_setup.sql.
+ALTER TABLE images DROP FOREIGN KEY images_ibfk_1;
+ALTER TABLE scenarios DROP FOREIGN KEY scenarios_ibfk_1;
+ALTER TABLE stories DROP FOREIGN KEY stories_ibfk_1;
+
+-- Paso intermedio a VARBINARY para poder reescribir el contenido sin perder los índices
+ALTER TABLE teachers MODIFY id VARBINARY(36) NOT NULL;
+ALTER TABLE stories MODIFY id VARBINARY(36) NOT NULL, MODIFY teacher_id VARBINARY(36) NULL;
+ALTER TABLE scenarios MODIFY id VARBINARY(36) NOT NULL, MODIFY story_id VARBINARY(36) NOT NULL;
+ALTER TABLE images MODIFY id VARBINARY(36) NOT NULL, MODIFY scenario_id VARBINARY(36) NOT NULL;
+
+UPDATE teachers SET id = UUID_TO_BIN(id);
+UPDATE stories SET id = UUID_TO_BIN(id), teacher_id = UUID_TO_BIN(teacher_id);
+UPDATE scenarios SET id = UUID_TO_BIN(id), story_id = UUID_TO_BIN(story_id);
+UPDATE images SET id = UUID_TO_BIN(id), scenario_id = UUID_TO_BIN(scenario_id);
+-- Acumulados de actividad (0004): teacher_id ya es VARBINARY, solo cambia el contenido
+UPDATE teacher_activity_stats SET teacher_id = UUID_TO_BIN(teacher_id) WHERE LENGTH(teacher_id) = 36;
+
+ALTER TABLE teachers MODIFY id BINARY(16) NOT NULL;
+ALTER TABLE stories MODIFY id BINARY(16) NOT NULL, MODIFY teacher_id BINARY(16) NULL;
+ALTER TABLE scenarios MODIFY id BINARY(16) NOT NULL, MODIFY story_id BINARY(16) NOT NULL;
+ALTER TABLE images MODIFY id BINARY(16) NOT NULL, MODIFY scenario_id BINARY(16) NOT NULL;
+
+ALTER TABLE stories ADD CONSTRAINT stories_ibfk_1 FOREIGN KEY (teacher_id) REFERENCES teachers(id) ON DELETE SET NULL;
+ALTER TABLE scenarios ADD CONSTRAINT scenarios_ibfk_1 FOREIGN KEY (story_id) REFERENCES stories(id) ON DELETE CASCADE;
+ALTER TABLE images ADD CONSTRAINT images_ibfk_1 FOREIGN KEY (scenario_id) REFERENCES scenarios(id) ON DELETE CASCADE;
@@ -0,0 +1,225 @@
+import contextlib
+import logging
+import os
+import re
+import sys
+import time
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import DB_QUERY_INSTRUMENTATION, DB_SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+_DB_LAYER_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(_DB_LAYER_DIR))
+# Marcos que no cuentan como origen de una consulta: el propio cursor y los context managers
+_SKIPPED_FILES = {
+    contextlib.__file__,
+    os.path.abspath(__file__),
+    os.path.join(_DB_LAYER_DIR, "connection.py"),
+    os.path.join(_DB_LAYER_DIR, "sqlite_connection.py")
+}
+
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH|SHOW|EXPLAIN|PRAGMA)\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(%s|\?)(\s*,\s*(%s|\?))+\s*\)")
+_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\b\d+(\.\d+)?\b")
+
+# Perfil de consultas de la petición en curso (ver begin_query_profile)
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Forma normalizada de una sentencia: sin espacios repetidos, sin literales y con
+    las listas IN (%s, %s, ...) colapsadas, para agrupar ejecuciones equivalentes.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    return _LITERAL.sub("?", normalized)
+
+
+@lru_cache(maxsize=512)
+def _relative_path(filename: str) -> str:
+    try:
+        return os.path.relpath(filename, _PROJECT_ROOT)
+    except ValueError:
+        return filename
+
+
+def call_site() -> str:
+    """
+    Origen de una consulta: el primer marco fuera de la conexión y del cursor
+    (normalmente, el método del repositorio) y quien lo llamó desde otro archivo,
+    que es donde suele estar el bucle de un N+1.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in _SKIPPED_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return "desconocido"
+
+    site = _describe(frame)
+    caller = frame.f_back
+    while caller is not None and caller.f_code.co_filename in (frame.f_code.co_filename, *_SKIPPED_FILES):
+        caller = caller.f_back
+    return f"{site} <- {_describe(caller)}" if caller is not None else site
+
+
+def _describe(frame) -> str:
+    return f"{_relative_path(frame.f_code.co_filename)}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+class QueryRecord:
+    """Una sentencia ejecutada: latencia (incluye la lectura de resultados), filas y origen."""
+
+    __slots__ = ("statement", "target", "call_site", "duration_ms", "rows", "read")
+
+    def __init__(self, statement: str, target: str, site: str):
+        self.statement = statement
+        self.target = target
+        self.call_site = site
+        self.duration_ms = 0.0
+        self.rows = 0
+        self.read = bool(_READ_STATEMENT.match(statement))
+
+
+class QueryProfile:
+    """
+    Consultas de una petición, agregadas por (sentencia normalizada, origen) para
+    que la memoria no crezca con la cantidad de ejecuciones.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.rows = 0
+        self.patterns: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def add(self, record: QueryRecord) -> None:
+        self.count += 1
+        self.total_ms += record.duration_ms
+        self.rows += record.rows
+        key = (fingerprint(record.statement), record.call_site)
+        pattern = self.patterns.get(key)
+        if pattern is None:
+            pattern = self.patterns[key] = {"count": 0, "total_ms": 0.0}
+        pattern["count"] += 1
+        pattern["total_ms"] += record.duration_ms
+
+    def n_plus_one(self, threshold: int) -> List[Dict[str, Any]]:
+        """
+        Sentencias equivalentes ejecutadas `threshold` veces o más desde el mismo
+        origen: el patrón típico de una consulta por elemento de un listado.
+        """
+        suspects = [
+            {"statement": statement, "call_site": site, **pattern}
+            for (statement, site), pattern in self.patterns.items()
+            if pattern["count"] >= threshold
+        ]
+        return sorted(suspects, key=lambda suspect: suspect["count"], reverse=True)
+
+
+def begin_query_profile():
+    """Empieza a perfilar las consultas del contexto actual. Retorna el token para end_query_profile."""
+    return _current_profile.set(QueryProfile())
+
+
+def end_query_profile(token) -> None:
+    _current_profile.reset(token)
+
+
+def current_query_profile() -> Optional[QueryProfile]:
+    return _current_profile.get()
+
+
+class InstrumentedCursor:
+    """
+    Envuelve un cursor DB-API para medir cada sentencia: latencia, filas devueltas
+    (o afectadas) y origen. Una sentencia se da por terminada al ejecutar la
+    siguiente o al cerrar el cursor; entonces se suma al perfil de la petición y,
+    si superó DB_SLOW_QUERY_MS, se registra en el log de consultas lentas.
+    """
+
+    def __init__(self, cursor, target: str):
+        self._cursor = cursor
+        self._target = target
+        self._record: Optional[QueryRecord] = None
+
+    def execute(self, operation, params=(), *args, **kwargs):
+        return self._run(operation, self._cursor.execute, operation, params, *args, **kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._run(operation, self._cursor.executemany, operation, seq_params, *args, **kwargs)
+
+    def fetchone(self):
+        row = self._timed(self._cursor.fetchone)
+        if row is not None and self._record is not None:
+            self._record.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        return self._counted(self._timed(self._cursor.fetchmany, *args, **kwargs))
+
+    def fetchall(self):
+        return self._counted(self._timed(self._cursor.fetchall))
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def _run(self, operation, method, *args, **kwargs):
+        self._finish()
+        record = self._record = QueryRecord(operation, self._target, call_site())
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record.duration_ms += (time.perf_counter() - started) * 1000
+            if not record.read:
+                record.rows = max(self._cursor.rowcount or 0, 0)
+
+    def _timed(self, method, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if self._record is not None:
+                self._record.duration_ms += (time.perf_counter() - started) * 1000
+
+    def _counted(self, rows):
+        if self._record is not None:
+            self._record.rows += len(rows)
+        return rows
+
+    def _finish(self) -> None:
+        record, self._record = self._record, None
+        if record is None:
+            return
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add(record)
+        # La sentencia solo se normaliza si el aviso se va a registrar
+        if record.duration_ms >= DB_SLOW_QUERY_MS and logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "Consulta lenta (%.1f ms, %s filas, %s) en %s: %s",
+                record.duration_ms, record.rows, record.target, record.call_site,
+                _WHITESPACE.sub(' ', record.statement).strip()[:500]
+            )
+
+
+def instrument(cursor, target: str):
+    """Envuelve el cursor si la instrumentación está activa (DB_QUERY_INSTRUMENTATION)."""
+    return InstrumentedCursor(cursor, target) if DB_QUERY_INSTRUMENTATION else cursor
@@ -0,0 +1,26 @@
+import argparse
+import logging
+from typing import List, Optional
+from uuid import UUID
+
+from infrastructure.repositories.mysql_teacher_stats_repository import MySQLTeacherStatsRepository
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m infrastructure.database.rebuild_activity_stats"""
+    parser = argparse.ArgumentParser(
+        description="Recalcula los acumulados de teacher_activity_stats desde la tabla stories"
+    )
+    parser.add_argument("--teacher-id", type=UUID, help="Recalcular solo este profesor")
+    parser.add_argument("--batch-size", type=int, default=500, help="Cuentos leídos por lote")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    repository = MySQLTeacherStatsRepository(batch_size=args.batch_size)
+    processed = repository.rebuild(args.teacher_id)
+    print(f"Profesores procesados: {processed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Optional
+
+from infrastructure.database.query_instrumentation import instrument
+
+# Esquema equivalente a db_setup.sql más las migraciones que afectan a los repositorios
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teachers (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    school TEXT,
+    grade TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stories (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    context TEXT NOT NULL,
+    category TEXT NOT NULL,
+    pedagogical_approach TEXT NOT NULL DEFAULT 'traditional',
+    teacher_id TEXT REFERENCES teachers(id) ON DELETE SET NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS scenarios (
+    id TEXT PRIMARY KEY,
+    story_id TEXT NOT NULL REFERENCES stories(id) ON DELETE CASCADE,
+    description TEXT NOT NULL,
+    sequence_number INTEGER NOT NULL,
+    prompt_for_image TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS images (
+    id TEXT PRIMARY KEY,
+    scenario_id TEXT NOT NULL UNIQUE REFERENCES scenarios(id) ON DELETE CASCADE,
+    prompt TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_stories_teacher_summary ON stories(teacher_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_stories_summary ON stories(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_scenarios_story_sequence ON scenarios(story_id, sequence_number);
+"""
+
+
+def to_db_datetime(value: Optional[datetime]) -> Optional[str]:
+    """Las fechas se guardan como texto ISO 8601 (se ordena igual que la fecha)."""
+    return value.isoformat(sep=" ") if value else None
+
+
+def from_db_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class SQLiteDatabase:
+    """
+    Base de datos SQLite (archivo o ":memory:") con la misma interfaz que
+    DatabaseConnection: get_cursor() y transaction().
+
+    Usa una única conexión compartida protegida por un lock reentrante: las
+    operaciones de distintos hilos se serializan y una transacción retiene el
+    lock hasta terminar. Pensada para pruebas y benchmarks, no para producción.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = self._connect()
+        self._inherited_connection = None
+        self._active_transaction: ContextVar[Optional[Dict[str, bool]]] = ContextVar(
+            f"sqlite_transaction_{id(self)}", default=None
+        )
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa las operaciones del bloque en una única transacción (un solo COMMIT).
+        Las transacciones anidadas se unen a la exterior; si una operación falla
+        dentro del bloque la transacción queda marcada para rollback.
+        """
+        if self._active_transaction.get() is not None:
+            yield
+            return
+
+        with self._lock:
+            state = {"rollback_only": False}
+            token = self._active_transaction.set(state)
+            self._connection.execute("BEGIN")
+            try:
+                yield
+                if state["rollback_only"]:
+                    raise Exception("La transacción se revirtió por un error en una de sus operaciones")
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            finally:
+                self._active_transaction.reset(token)
+
+    @contextmanager
+    def get_cursor(self):
+        """
+        Proporciona un cursor (filas accesibles por nombre de columna). Fuera de una
+        transacción, cada bloque se confirma por separado.
+        """
+        transaction_state = self._active_transaction.get()
+        with self._lock:
+            cursor = instrument(self._connection.cursor(), "sqlite")
+            if transaction_state is not None:
+                try:
+                    yield cursor
+                except sqlite3.Error as e:
+                    transaction_state["rollback_only"] = True
+                    raise Exception(f"Error en la operación de base de datos: {e}")
+                except Exception:
+                    transaction_state["rollback_only"] = True
+                    raise
+                finally:
+                    cursor.close()
+                return
+
+            self._connection.execute("BEGIN")
+            try:
+                yield cursor
+                self._connection.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._connection.execute("ROLLBACK")
+                raise Exception(f"Error en la operación de base de datos: {e}")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+
+    def reset_after_fork(self) -> None:
+        """
+        Hook post-fork: recrea el lock y, con un archivo, abre una conexión propia
+        (SQLite no admite seguir usando una conexión heredada). La heredada se
+        conserva sin cerrar para no tocar el estado del archivo que usa el padre.
+        Con ":memory:" cada proceso se queda con su propia copia de la base.
+        """
+        self._lock = threading.RLock()
+        if self.path != ":memory:":
+            self._inherited_connection = self._connection
+            self._connection = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: las transacciones se abren explícitamente con BEGIN
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,75 @@
+import copy
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.image import Image
+from domain.interfaces.repositories.image_repository import ImageRepository
+from infrastructure.database.memory_store import InMemoryStore, as_id
+from infrastructure.repositories.multi_get import in_input_order, unique
+
+class InMemoryImageRepository(ImageRepository):
+    """
+    Implementación en memoria del repositorio de imágenes (pruebas y benchmarks).
+    No lleva el conteo de referencias de image_blobs.
+    """
+    
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+    
+    def create(self, image: Image) -> UUID:
+        """Crea la imagen de un escenario, o reemplaza la existente."""
+        with self.store.operation() as store:
+            store.upsert_image(image)
+        return image.id
+    
+    def create_many(self, images: List[Image]) -> List[UUID]:
+        """Crea varias imágenes en una sola operación (todas o ninguna)."""
+        with self.store.operation() as store:
+            for image in images:
+                store.upsert_image(image)
+        return [image.id for image in images]
+    
+    def get_by_id(self, image_id: UUID) -> Optional[Image]:
+        """Obtiene una imagen por su ID."""
+        with self.store.operation() as store:
+            image = store.images.get(as_id(image_id))
+            return copy.copy(image) if image else None
+    
+    def get_many(self, image_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene varias imágenes, en el orden pedido."""
+        with self.store.operation() as store:
+            return [copy.copy(image) for image in in_input_order(map(as_id, image_ids), store.images)]
+    
+    def get_by_scenario_id(self, scenario_id: UUID) -> Optional[Image]:
+        """Obtiene una imagen asociada a un escenario específico."""
+        with self.store.operation() as store:
+            image = store.scenario_image(as_id(scenario_id))
+            return copy.copy(image) if image else None
+    
+    def get_by_scenario_ids(self, scenario_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene las imágenes de varios escenarios, en el orden pedido."""
+        with self.store.operation() as store:
+            images = (store.scenario_image(scenario_id) for scenario_id in unique(map(as_id, scenario_ids)))
+            return [copy.copy(image) for image in images if image]
+    
+    def get_by_story_id(self, story_id: UUID) -> List[Image]:
+        """Obtiene todas las imágenes asociadas a un cuento."""
+        with self.store.operation() as store:
+            images = (store.scenario_image(scenario.id) for scenario in store.story_scenarios(as_id(story_id)))
+            return [copy.copy(image) for image in images if image]
+    
+    def update(self, image: Image) -> bool:
+        """Actualiza una imagen existente."""
+        with self.store.operation() as store:
+            return store.update_image(image)
+    
+    def delete(self, image_id: UUID) -> bool:
+        """Elimina una imagen por su ID."""
+        with self.store.operation() as store:
+            return store.delete_image(as_id(image_id))
+    
+    def delete_by_scenario_id(self, scenario_id: UUID) -> bool:
+        """Elimina todas las imágenes asociadas a un escenario."""
+        with self.store.operation() as store:
+            image_id = store.image_by_scenario.get(as_id(scenario_id))
+            return store.delete_image(image_id) if image_id else False
@@ -0,0 +1,61 @@
+import copy
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.scenario import Scenario
+from domain.interfaces.repositories.scenario_repository import ScenarioRepository
+from infrastructure.database.memory_store import InMemoryStore, as_id
+from infrastructure.repositories.multi_get import in_input_order
+
+class InMemoryScenarioRepository(ScenarioRepository):
+    """Implementación en memoria del repositorio de escenarios (pruebas y benchmarks)."""
+    
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+    
+    def create(self, scenario: Scenario) -> UUID:
+        """Crea un nuevo escenario."""
+        with self.store.operation() as store:
+            store.insert_scenario(scenario)
+        return scenario.id
+    
+    def create_many(self, scenarios: List[Scenario]) -> List[UUID]:
+        """Crea varios escenarios en una sola operación (todos o ninguno)."""
+        with self.store.operation() as store:
+            for scenario in scenarios:
+                store.insert_scenario(scenario)
+        return [scenario.id for scenario in scenarios]
+    
+    def get_by_id(self, scenario_id: UUID) -> Optional[Scenario]:
+        """Obtiene un escenario por su ID."""
+        with self.store.operation() as store:
+            scenario = store.scenarios.get(as_id(scenario_id))
+            return copy.copy(scenario) if scenario else None
+    
+    def get_many(self, scenario_ids: Sequence[UUID]) -> List[Scenario]:
+        """Obtiene varios escenarios, en el orden pedido."""
+        with self.store.operation() as store:
+            return [copy.copy(scenario) for scenario in in_input_order(map(as_id, scenario_ids), store.scenarios)]
+    
+    def get_by_story_id(self, story_id: UUID) -> List[Scenario]:
+        """Obtiene todos los escenarios asociados a un cuento."""
+        with self.store.operation() as store:
+            return [copy.copy(scenario) for scenario in store.story_scenarios(as_id(story_id))]
+    
+    def update(self, scenario: Scenario) -> bool:
+        """Actualiza un escenario existente."""
+        with self.store.operation() as store:
+            return store.update_scenario(scenario)
+    
+    def delete(self, scenario_id: UUID) -> bool:
+        """Elimina un escenario por su ID (su imagen en cascada)."""
+        with self.store.operation() as store:
+            return store.delete_scenario(as_id(scenario_id))
+    
+    def delete_by_story_id(self, story_id: UUID) -> bool:
+        """Elimina todos los escenarios asociados a un cuento."""
+        with self.store.operation() as store:
+            scenario_ids = list(store.scenarios_by_story.get(as_id(story_id), ()))
+            for scenario_id in scenario_ids:
+                store.delete_scenario(as_id(scenario_id))
+            return bool(scenario_ids)
@@ -0,0 +1,175 @@
+import copy
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from domain.entities.story import Story
+from domain.interfaces.repositories.story_repository import StoryRepository, STORY_EXTRA_FIELDS
+from domain.value_objects.story_summary import StorySummary
+from infrastructure.database.memory_store import InMemoryStore, SortedKeys, as_id
+from infrastructure.repositories.multi_get import in_input_order
+from infrastructure.repositories.text_search import SCENARIO_MATCH_WEIGHT, match_score
+
+class InMemoryStoryRepository(StoryRepository):
+    """Implementación en memoria del repositorio de cuentos (pruebas y benchmarks)."""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def create(self, story: Story) -> UUID:
+        """Crea un nuevo cuento."""
+        with self.store.operation() as store:
+            store.insert_story(story)
+        return story.id
+
+    def get_by_id(self, story_id: UUID) -> Optional[Story]:
+        """Obtiene un cuento por su ID."""
+        with self.store.operation() as store:
+            story = store.stories.get(as_id(story_id))
+            return copy.copy(story) if story else None
+
+    def get_many(self, story_ids: Sequence[UUID]) -> List[Story]:
+        """Obtiene varios cuentos, en el orden pedido."""
+        with self.store.operation() as store:
+            return [copy.copy(story) for story in in_input_order(map(as_id, story_ids), store.stories)]
+
+    def get_illustrated(self, story_id: UUID) -> Optional[Dict[str, Any]]:
+        """Obtiene un cuento con sus escenarios e imágenes."""
+        with self.store.operation() as store:
+            story = store.stories.get(as_id(story_id))
+            return self._assemble_illustrated(store, story) if story else None
+
+    def get_illustrated_many(self, story_ids: Sequence[UUID]) -> List[Dict[str, Any]]:
+        """Obtiene varios cuentos ilustrados, en el orden pedido."""
+        with self.store.operation() as store:
+            return [self._assemble_illustrated(store, story) for story in in_input_order(map(as_id, story_ids), store.stories)]
+
+    def get_by_teacher_id(
+        self,
+        teacher_id: UUID,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Story]:
+        """Obtiene los cuentos de un profesor, del más reciente al más antiguo."""
+        with self.store.operation() as store:
+            index = store.stories_by_teacher.get(as_id(teacher_id)) or SortedKeys()
+            return [copy.copy(store.stories[UUID(key[1])]) for key in self._page(index, limit, after)]
+
+    def get_recent(self, limit: int = 10, after: Optional[Tuple[datetime, str]] = None) -> List[Story]:
+        """Obtiene los cuentos más recientes."""
+        with self.store.operation() as store:
+            return [copy.copy(store.stories[UUID(key[1])]) for key in self._page(store.story_order, limit, after)]
+
+    def get_summaries(
+        self,
+        teacher_id: Optional[UUID] = None,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None,
+        extra_fields: Sequence[str] = ()
+    ) -> List[StorySummary]:
+        """Obtiene resúmenes de cuentos para listados."""
+        extras = [name for name in STORY_EXTRA_FIELDS if name in extra_fields]
+        with self.store.operation() as store:
+            index = (store.stories_by_teacher.get(as_id(teacher_id)) or SortedKeys()) if teacher_id else store.story_order
+            return [
+                self._to_summary(store, store.stories[UUID(key[1])], extras)
+                for key in self._page(index, limit, after)
+            ]
+
+    def search(
+        self,
+        terms: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        after: Optional[Tuple[float, str]] = None
+    ) -> List[StorySummary]:
+        """
+        Busca cuentos por texto recorriendo el almacén; la relevancia se calcula
+        con match_score (misma semántica que el modo BOOLEAN de MySQL).
+        """
+        filters = filters or {}
+        if not terms:
+            return []
+
+        with self.store.operation() as store:
+            scored = []
+            for story in store.stories.values():
+                if not self._matches_filters(story, filters):
+                    continue
+                relevance = match_score(f"{story.title} {story.content} {story.context}", terms) + sum(
+                    match_score(scenario.description, terms) * SCENARIO_MATCH_WEIGHT
+                    for scenario in store.story_scenarios(story.id)
+                )
+                if relevance > 0 and (not after or (relevance, str(story.id)) < (after[0], str(after[1]))):
+                    scored.append((relevance, str(story.id), story))
+
+            scored.sort(key=lambda item: item[:2], reverse=True)
+            return [
+                self._to_summary(store, story, (), {"relevance": relevance})
+                for relevance, _, story in scored[:limit]
+            ]
+
+    def update(self, story: Story) -> bool:
+        """Actualiza un cuento existente."""
+        with self.store.operation() as store:
+            return store.update_story(story)
+
+    def delete(self, story_id: UUID) -> bool:
+        """Elimina un cuento (escenarios e imágenes en cascada)."""
+        with self.store.operation() as store:
+            return store.delete_story(as_id(story_id))
+
+    @staticmethod
+    def _assemble_illustrated(store: InMemoryStore, story: Story) -> Dict[str, Any]:
+        scenarios = []
+        for scenario in store.story_scenarios(story.id):
+            scenario_data = scenario.to_dict()
+            image = store.scenario_image(scenario.id)
+            scenario_data["image"] = image.to_dict() if image else None
+            scenarios.append(scenario_data)
+        return {"story": story.to_dict(), "scenarios": scenarios}
+
+    @staticmethod
+    def _page(index: SortedKeys, limit: int, after: Optional[Tuple[datetime, str]]):
+        return index.page_before(limit, (after[0], str(after[1])) if after else None)
+
+    @staticmethod
+    def _matches_filters(story: Story, filters: Dict[str, Any]) -> bool:
+        if filters.get("teacher_id") and story.teacher_id != as_id(filters["teacher_id"]):
+            return False
+        if filters.get("category") and story.category != filters["category"]:
+            return False
+        if filters.get("pedagogical_approach") and story.pedagogical_approach != filters["pedagogical_approach"]:
+            return False
+        if filters.get("created_from") and story.created_at < filters["created_from"]:
+            return False
+        if filters.get("created_to") and story.created_at >= filters["created_to"]:
+            return False
+        return True
+
+    @staticmethod
+    def _to_summary(
+        store: InMemoryStore,
+        story: Story,
+        extras: Sequence[str],
+        additional: Optional[Dict[str, Any]] = None
+    ) -> StorySummary:
+        scenarios = store.story_scenarios(story.id)
+        cover_image_url = next(
+            (image.image_url for image in map(store.scenario_image, (s.id for s in scenarios)) if image),
+            None
+        )
+        extra = {name: getattr(story, name) for name in extras}
+        if "teacher_id" in extra:
+            extra["teacher_id"] = str(story.teacher_id) if story.teacher_id else None
+        extra.update(additional or {})
+        return StorySummary(
+            id=story.id,
+            title=story.title,
+            category=story.category,
+            pedagogical_approach=story.pedagogical_approach,
+            created_at=story.created_at,
+            cover_image_url=cover_image_url,
+            scenario_count=len(scenarios),
+            extra=extra
+        )
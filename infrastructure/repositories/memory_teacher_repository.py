@@ -0,0 +1,47 @@
+import copy
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.teacher import Teacher
+from domain.interfaces.repositories.teacher_repository import TeacherRepository
+from infrastructure.database.memory_store import InMemoryStore, as_id
+from infrastructure.repositories.multi_get import in_input_order
+
+class InMemoryTeacherRepository(TeacherRepository):
+    """Implementación en memoria del repositorio de profesores (pruebas y benchmarks)."""
+    
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+    
+    def create(self, teacher: Teacher) -> UUID:
+        """Crea un nuevo profesor."""
+        with self.store.operation() as store:
+            store.insert_teacher(teacher)
+        return teacher.id
+    
+    def get_by_id(self, teacher_id: UUID) -> Optional[Teacher]:
+        """Obtiene un profesor por su ID."""
+        with self.store.operation() as store:
+            teacher = store.teachers.get(as_id(teacher_id))
+            return copy.copy(teacher) if teacher else None
+    
+    def get_many(self, teacher_ids: Sequence[UUID]) -> List[Teacher]:
+        """Obtiene varios profesores, en el orden pedido."""
+        with self.store.operation() as store:
+            return [copy.copy(teacher) for teacher in in_input_order(map(as_id, teacher_ids), store.teachers)]
+    
+    def get_by_email(self, email: str) -> Optional[Teacher]:
+        """Obtiene un profesor por su email."""
+        with self.store.operation() as store:
+            teacher_id = store.teacher_by_email.get(email)
+            return copy.copy(store.teachers[teacher_id]) if teacher_id else None
+    
+    def update(self, teacher: Teacher) -> bool:
+        """Actualiza un profesor existente."""
+        with self.store.operation() as store:
+            return store.update_teacher(teacher)
+    
+    def delete(self, teacher_id: UUID) -> bool:
+        """Elimina un profesor por su ID (sus cuentos quedan sin profesor)."""
+        with self.store.operation() as store:
+            return store.delete_teacher(as_id(teacher_id))
@@ -0,0 +1,29 @@
+from typing import Optional
+from uuid import UUID
+
+from domain.interfaces.repositories.teacher_stats_repository import TeacherStatsRepository
+from domain.value_objects.teacher_activity_stats import TeacherActivityStats
+from infrastructure.database.memory_store import InMemoryStore, as_id
+
+class InMemoryTeacherStatsRepository(TeacherStatsRepository):
+    """
+    Implementación en memoria de las estadísticas de actividad. Sin acumulados:
+    se calculan al leer recorriendo el índice de cuentos del profesor.
+    """
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    def get_activity(self, teacher_id: UUID) -> TeacherActivityStats:
+        """Calcula las estadísticas de un profesor a partir de sus cuentos."""
+        with self.store.operation() as store:
+            index = store.stories_by_teacher.get(as_id(teacher_id))
+            stories = (store.stories[UUID(story_id)] for _, story_id in (index.keys if index else ()))
+            return TeacherActivityStats.from_stories(vars(story) for story in stories)
+
+    def rebuild(self, teacher_id: Optional[UUID] = None) -> int:
+        """No hay acumulados que recalcular; retorna la cantidad de profesores."""
+        if teacher_id:
+            return 1
+        with self.store.operation() as store:
+            return len(store.teachers)
@@ -0,0 +1,14 @@
+from typing import ContextManager
+
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
+from infrastructure.database.memory_store import InMemoryStore
+
+class InMemoryUnitOfWork(UnitOfWork):
+    """Implementación en memoria de la unidad de trabajo (los cambios se deshacen si el bloque falla)."""
+    
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+    
+    def transaction(self) -> ContextManager[None]:
+        """Abre una transacción sobre el almacén compartido por los repositorios."""
+        return self.store.transaction()
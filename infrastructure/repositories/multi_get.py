@@ -0,0 +1,44 @@
+from typing import Any, Dict, Hashable, Iterable, List, Sequence
+from uuid import UUID
+
+from config import DB_MULTI_GET_CHUNK_SIZE
+from infrastructure.database.id_codec import IdValue, id_codec
+
+
+def unique(keys: Iterable[Hashable]) -> List[Hashable]:
+    """Claves sin repetir, en el orden de su primera aparición."""
+    return list(dict.fromkeys(keys))
+
+
+def unique_ids(ids: Iterable[IdValue]) -> List[UUID]:
+    """
+    Ids sin repetir convertidos a UUID, en el orden de su primera aparición. Los
+    resultados se indexan por el UUID leído de la base de datos, así que los ids
+    recibidos como texto deben normalizarse antes de buscarlos.
+    """
+    return unique(id_codec.from_db(value) for value in ids)
+
+
+def fetch_in_chunks(
+    cursor,
+    query: str,
+    values: Sequence[Any],
+    placeholder: str = "%s",
+    chunk_size: int = DB_MULTI_GET_CHUNK_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Ejecuta una consulta con una lista IN por cada bloque de chunk_size valores y
+    junta las filas. query debe contener {placeholders} dentro de IN (...); los
+    bloques acotan el tamaño de cada sentencia y de su plan de ejecución.
+    """
+    rows: List[Dict[str, Any]] = []
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        cursor.execute(query.format(placeholders=", ".join([placeholder] * len(chunk))), tuple(chunk))
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def in_input_order(keys: Iterable[Hashable], items_by_key: Dict[Hashable, Any]) -> List[Any]:
+    """Elementos encontrados en el orden de las claves pedidas (las ausentes se omiten)."""
+    return [items_by_key[key] for key in unique(keys) if key in items_by_key]
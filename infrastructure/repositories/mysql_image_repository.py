@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.image import Image
 from domain.interfaces.repositories.image_repository import ImageRepository
 from infrastructure.database.connection import DatabaseConnection
+from infrastructure.database.id_codec import id_codec
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+from infrastructure.storage.content_addressed_store import add_references
 
 class MySQLImageRepository(ImageRepository):
     """Implementación MySQL del repositorio de imágenes."""
@@ -12,62 +15,146 @@ class MySQLImageRepository(ImageRepository):
         self.db = DatabaseConnection()
     
     def create(self, image: Image) -> UUID:
-        """Crea una nueva imagen en la base de datos."""
+        """
+        Crea la imagen de un escenario, o reemplaza la existente
+        (images.scenario_id es único: ver migración 0003).
+        """
         query = """
         INSERT INTO images (id, scenario_id, prompt, image_url, created_at)
         VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            id = VALUES(id), prompt = VALUES(prompt),
+            image_url = VALUES(image_url), created_at = VALUES(created_at)
         """
         values = (
-            str(image.id),
-            str(image.scenario_id),
+            id_codec.to_db(image.id),
+            id_codec.to_db(image.scenario_id),
             image.prompt,
             image.image_url,
             image.created_at
         )
         
         with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT image_url FROM images WHERE scenario_id = %s FOR UPDATE", (id_codec.to_db(image.scenario_id),))
+            replaced = [row["image_url"] for row in cursor.fetchall()]
             cursor.execute(query, values)
+            add_references(cursor, [image.image_url], 1)
+            add_references(cursor, replaced, -1)
         
         return image.id
     
+    def create_many(self, images: List[Image]) -> List[UUID]:
+        """
+        Crea varias imágenes con un único INSERT de múltiples filas,
+        reemplazando la imagen existente de cada escenario si la hay.
+        """
+        if not images:
+            return []
+        
+        query = """
+        INSERT INTO images (id, scenario_id, prompt, image_url, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            id = VALUES(id), prompt = VALUES(prompt),
+            image_url = VALUES(image_url), created_at = VALUES(created_at)
+        """
+        values = [
+            (
+                id_codec.to_db(image.id),
+                id_codec.to_db(image.scenario_id),
+                image.prompt,
+                image.image_url,
+                image.created_at
+            )
+            for image in images
+        ]
+        
+        # mysql-connector reescribe executemany de un INSERT como un solo INSERT multi-fila
+        scenario_ids = [id_codec.to_db(image.scenario_id) for image in images]
+        placeholders = ", ".join(["%s"] * len(scenario_ids))
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                f"SELECT image_url FROM images WHERE scenario_id IN ({placeholders}) FOR UPDATE",
+                scenario_ids
+            )
+            replaced = [row["image_url"] for row in cursor.fetchall()]
+            cursor.executemany(query, values)
+            add_references(cursor, [image.image_url for image in images], 1)
+            add_references(cursor, replaced, -1)
+        
+        return [image.id for image in images]
+    
     def get_by_id(self, image_id: UUID) -> Optional[Image]:
         """Obtiene una imagen por su ID."""
         query = "SELECT * FROM images WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(image_id),))
+            cursor.execute(query, (id_codec.to_db(image_id),))
             result = cursor.fetchone()
             
         if not result:
             return None
             
         return Image(
-            id=UUID(result["id"]),
-            scenario_id=UUID(result["scenario_id"]),
+            id=id_codec.from_db(result["id"]),
+            scenario_id=id_codec.from_db(result["scenario_id"]),
             prompt=result["prompt"],
             image_url=result["image_url"],
             created_at=result["created_at"]
         )
     
+    def get_many(self, image_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene varias imágenes con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(image_ids)
+        if not ids:
+            return []
+        
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor,
+                "SELECT * FROM images WHERE id IN ({placeholders})",
+                [id_codec.to_db(image_id) for image_id in ids]
+            )
+        
+        images = {image.id: image for image in map(self._to_image, results)}
+        return in_input_order(ids, images)
+    
     def get_by_scenario_id(self, scenario_id: UUID) -> Optional[Image]:
         """Obtiene una imagen asociada a un escenario específico."""
         query = "SELECT * FROM images WHERE scenario_id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(scenario_id),))
+            cursor.execute(query, (id_codec.to_db(scenario_id),))
             result = cursor.fetchone()
             
         if not result:
             return None
             
         return Image(
-            id=UUID(result["id"]),
-            scenario_id=UUID(result["scenario_id"]),
+            id=id_codec.from_db(result["id"]),
+            scenario_id=id_codec.from_db(result["scenario_id"]),
             prompt=result["prompt"],
             image_url=result["image_url"],
             created_at=result["created_at"]
         )
     
+    def get_by_scenario_ids(self, scenario_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene las imágenes de varios escenarios (índice único scenario_id), en el orden pedido."""
+        ids = unique_ids(scenario_ids)
+        if not ids:
+            return []
+        
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor,
+                "SELECT * FROM images WHERE scenario_id IN ({placeholders})",
+                [id_codec.to_db(scenario_id) for scenario_id in ids]
+            )
+        
+        images: Dict[UUID, Image] = {image.scenario_id: image for image in map(self._to_image, results)}
+        return in_input_order(ids, images)
+    
     def get_by_story_id(self, story_id: UUID) -> List[Image]:
         """Obtiene todas las imágenes asociadas a un cuento."""
         query = """
@@ -79,14 +166,14 @@ class MySQLImageRepository(ImageRepository):
         """
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(story_id),))
+            cursor.execute(query, (id_codec.to_db(story_id),))
             results = cursor.fetchall()
             
         images = []
         for result in results:
             images.append(Image(
-                id=UUID(result["id"]),
-                scenario_id=UUID(result["scenario_id"]),
+                id=id_codec.from_db(result["id"]),
+                scenario_id=id_codec.from_db(result["scenario_id"]),
                 prompt=result["prompt"],
                 image_url=result["image_url"],
                 created_at=result["created_at"]
@@ -104,25 +191,50 @@ class MySQLImageRepository(ImageRepository):
         values = (
             image.prompt,
             image.image_url,
-            str(image.id)
+            id_codec.to_db(image.id)
         )
         
         with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT image_url FROM images WHERE id = %s FOR UPDATE", (id_codec.to_db(image.id),))
+            previous = cursor.fetchone()
             cursor.execute(query, values)
-            return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            
+            if updated and previous and previous["image_url"] != image.image_url:
+                add_references(cursor, [previous["image_url"]], -1)
+                add_references(cursor, [image.image_url], 1)
+            return updated
     
     def delete(self, image_id: UUID) -> bool:
         """Elimina una imagen por su ID."""
         query = "DELETE FROM images WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(image_id),))
-            return cursor.rowcount > 0
+            cursor.execute("SELECT image_url FROM images WHERE id = %s FOR UPDATE", (id_codec.to_db(image_id),))
+            urls = [row["image_url"] for row in cursor.fetchall()]
+            cursor.execute(query, (id_codec.to_db(image_id),))
+            deleted = cursor.rowcount > 0
+            add_references(cursor, urls, -1)
+            return deleted
     
     def delete_by_scenario_id(self, scenario_id: UUID) -> bool:
         """Elimina todas las imágenes asociadas a un escenario."""
         query = "DELETE FROM images WHERE scenario_id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(scenario_id),))
-            return cursor.rowcount > 0
\ No newline at end of file
+            cursor.execute("SELECT image_url FROM images WHERE scenario_id = %s FOR UPDATE", (id_codec.to_db(scenario_id),))
+            urls = [row["image_url"] for row in cursor.fetchall()]
+            cursor.execute(query, (id_codec.to_db(scenario_id),))
+            deleted = cursor.rowcount > 0
+            add_references(cursor, urls, -1)
+            return deleted
+    
+    @staticmethod
+    def _to_image(result) -> Image:
+        return Image(
+            id=id_codec.from_db(result["id"]),
+            scenario_id=id_codec.from_db(result["scenario_id"]),
+            prompt=result["prompt"],
+            image_url=result["image_url"],
+            created_at=result["created_at"]
+        )
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 
 from domain.entities.scenario import Scenario
 from domain.interfaces.repositories.scenario_repository import ScenarioRepository
 from infrastructure.database.connection import DatabaseConnection
+from infrastructure.database.id_codec import id_codec
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+from infrastructure.storage.content_addressed_store import add_references
 
 class MySQLScenarioRepository(ScenarioRepository):
     """Implementación MySQL del repositorio de escenarios."""
@@ -18,8 +21,8 @@ class MySQLScenarioRepository(ScenarioRepository):
         VALUES (%s, %s, %s, %s, %s, %s)
         """
         values = (
-            str(scenario.id),
-            str(scenario.story_id),
+            id_codec.to_db(scenario.id),
+            id_codec.to_db(scenario.story_id),
             scenario.description,
             scenario.sequence_number,
             scenario.prompt_for_image,
@@ -31,39 +34,93 @@ class MySQLScenarioRepository(ScenarioRepository):
         
         return scenario.id
     
+    def create_many(self, scenarios: List[Scenario]) -> List[UUID]:
+        """Crea varios escenarios con un único INSERT de múltiples filas."""
+        if not scenarios:
+            return []
+        
+        query = """
+        INSERT INTO scenarios (id, story_id, description, sequence_number, prompt_for_image, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """
+        values = [
+            (
+                id_codec.to_db(scenario.id),
+                id_codec.to_db(scenario.story_id),
+                scenario.description,
+                scenario.sequence_number,
+                scenario.prompt_for_image,
+                scenario.created_at
+            )
+            for scenario in scenarios
+        ]
+        
+        # mysql-connector reescribe executemany de un INSERT como un solo INSERT multi-fila
+        with self.db.get_cursor() as cursor:
+            cursor.executemany(query, values)
+        
+        return [scenario.id for scenario in scenarios]
+    
     def get_by_id(self, scenario_id: UUID) -> Optional[Scenario]:
         """Obtiene un escenario por su ID."""
         query = "SELECT * FROM scenarios WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(scenario_id),))
+            cursor.execute(query, (id_codec.to_db(scenario_id),))
             result = cursor.fetchone()
             
         if not result:
             return None
             
         return Scenario(
-            id=UUID(result["id"]),
-            story_id=UUID(result["story_id"]),
+            id=id_codec.from_db(result["id"]),
+            story_id=id_codec.from_db(result["story_id"]),
             description=result["description"],
             sequence_number=result["sequence_number"],
             prompt_for_image=result["prompt_for_image"],
             created_at=result["created_at"]
         )
     
+    def get_many(self, scenario_ids: Sequence[UUID]) -> List[Scenario]:
+        """Obtiene varios escenarios con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(scenario_ids)
+        if not ids:
+            return []
+        
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor,
+                "SELECT * FROM scenarios WHERE id IN ({placeholders})",
+                [id_codec.to_db(scenario_id) for scenario_id in ids]
+            )
+        
+        scenarios = {}
+        for result in results:
+            scenario = Scenario(
+                id=id_codec.from_db(result["id"]),
+                story_id=id_codec.from_db(result["story_id"]),
+                description=result["description"],
+                sequence_number=result["sequence_number"],
+                prompt_for_image=result["prompt_for_image"],
+                created_at=result["created_at"]
+            )
+            scenarios[scenario.id] = scenario
+        
+        return in_input_order(ids, scenarios)
+    
     def get_by_story_id(self, story_id: UUID) -> List[Scenario]:
         """Obtiene todos los escenarios asociados a un cuento."""
         query = "SELECT * FROM scenarios WHERE story_id = %s ORDER BY sequence_number"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(story_id),))
+            cursor.execute(query, (id_codec.to_db(story_id),))
             results = cursor.fetchall()
             
         scenarios = []
         for result in results:
             scenarios.append(Scenario(
-                id=UUID(result["id"]),
-                story_id=UUID(result["story_id"]),
+                id=id_codec.from_db(result["id"]),
+                story_id=id_codec.from_db(result["story_id"]),
                 description=result["description"],
                 sequence_number=result["sequence_number"],
                 prompt_for_image=result["prompt_for_image"],
@@ -83,7 +140,7 @@ class MySQLScenarioRepository(ScenarioRepository):
             scenario.description,
             scenario.sequence_number,
             scenario.prompt_for_image,
-            str(scenario.id)
+            id_codec.to_db(scenario.id)
         )
         
         with self.db.get_cursor() as cursor:
@@ -95,13 +152,31 @@ class MySQLScenarioRepository(ScenarioRepository):
         query = "DELETE FROM scenarios WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(scenario_id),))
-            return cursor.rowcount > 0
+            # Las imágenes se eliminan en cascada: liberar sus referencias a blobs
+            cursor.execute("SELECT image_url FROM images WHERE scenario_id = %s FOR UPDATE", (id_codec.to_db(scenario_id),))
+            urls = [row["image_url"] for row in cursor.fetchall()]
+            cursor.execute(query, (id_codec.to_db(scenario_id),))
+            deleted = cursor.rowcount > 0
+            add_references(cursor, urls, -1)
+            return deleted
     
     def delete_by_story_id(self, story_id: UUID) -> bool:
         """Elimina todos los escenarios asociados a un cuento."""
         query = "DELETE FROM scenarios WHERE story_id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(story_id),))
-            return cursor.rowcount > 0
\ No newline at end of file
+            # Las imágenes se eliminan en cascada: liberar sus referencias a blobs
+            cursor.execute(
+                """
+                SELECT i.image_url FROM images i
+                JOIN scenarios s ON i.scenario_id = s.id
+                WHERE s.story_id = %s
+                FOR UPDATE
+                """,
+                (id_codec.to_db(story_id),)
+            )
+            urls = [row["image_url"] for row in cursor.fetchall()]
+            cursor.execute(query, (id_codec.to_db(story_id),))
+            deleted = cursor.rowcount > 0
+            add_references(cursor, urls, -1)
+            return deleted
\ No newline at end of file
@@ -1,10 +1,51 @@
-from typing import List, Optional
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 import datetime
 
 from domain.entities.story import Story
-from domain.interfaces.repositories.story_repository import StoryRepository
+from domain.value_objects.story_summary import StorySummary
+from domain.entities.scenario import Scenario
+from domain.entities.image import Image
+from domain.interfaces.repositories.story_repository import StoryRepository, STORY_EXTRA_FIELDS
 from infrastructure.database.connection import DatabaseConnection
+from infrastructure.database.id_codec import id_codec
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+from infrastructure.repositories.mysql_teacher_stats_repository import STATS_COLUMNS, apply_story_stats
+from infrastructure.repositories.text_search import SCENARIO_MATCH_WEIGHT
+from infrastructure.storage.content_addressed_store import add_references
+
+logger = logging.getLogger(__name__)
+
+# Portada y cantidad de escenarios de cada resumen (subconsultas por índice, una fila por cuento)
+_SUMMARY_SUBQUERIES = """
+            (
+                SELECT i.image_url
+                FROM scenarios sc
+                JOIN images i ON i.scenario_id = sc.id
+                WHERE sc.story_id = st.id
+                ORDER BY sc.sequence_number, i.created_at DESC
+                LIMIT 1
+            ) AS cover_image_url,
+            (SELECT COUNT(*) FROM scenarios sc WHERE sc.story_id = st.id) AS scenario_count"""
+
+# Cuento con sus escenarios e imágenes (una fila por escenario/imagen); condition filtra st.id
+_ILLUSTRATED_QUERY = """
+        SELECT
+            st.id, st.title, st.content, st.context, st.category,
+            st.pedagogical_approach, st.teacher_id, st.created_at,
+            sc.id AS scenario_id, sc.description AS scenario_description,
+            sc.sequence_number AS scenario_sequence_number,
+            sc.prompt_for_image AS scenario_prompt_for_image,
+            sc.created_at AS scenario_created_at,
+            i.id AS image_id, i.prompt AS image_prompt,
+            i.image_url AS image_url, i.created_at AS image_created_at
+        FROM stories st
+        LEFT JOIN scenarios sc ON sc.story_id = st.id
+        LEFT JOIN images i ON i.scenario_id = sc.id
+        WHERE {condition}
+        ORDER BY st.id, sc.sequence_number, i.created_at
+        """
 
 class MySQLStoryRepository(StoryRepository):
     """Implementación MySQL del repositorio de cuentos."""
@@ -19,23 +60,24 @@ class MySQLStoryRepository(StoryRepository):
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
         """
         values = (
-            str(story.id), 
+            id_codec.to_db(story.id), 
             story.title, 
             story.content, 
             story.context, 
             story.category,
             story.pedagogical_approach,  # ✅ Agregado el campo faltante
-            str(story.teacher_id) if story.teacher_id else None,
+            id_codec.to_db(story.teacher_id),
             story.created_at
         )
         
         try:
             with self.db.get_cursor() as cursor:
                 cursor.execute(query, values)
-            print(f"✅ Cuento creado en BD con ID: {story.id}")
+                apply_story_stats(cursor, [self._stats_row(story)], 1)
+            logger.debug("Cuento creado en BD con ID: %s", story.id)
             return story.id
         except Exception as e:
-            print(f"❌ Error al crear cuento en BD: {str(e)}")
+            logger.error("Error al crear cuento en BD: %s", e)
             raise e
     
     def get_by_id(self, story_id: UUID) -> Optional[Story]:
@@ -44,20 +86,20 @@ class MySQLStoryRepository(StoryRepository):
         
         try:
             with self.db.get_cursor() as cursor:
-                cursor.execute(query, (str(story_id),))
+                cursor.execute(query, (id_codec.to_db(story_id),))
                 result = cursor.fetchone()
                 
             if not result:
-                print(f"❌ Cuento no encontrado en BD: {story_id}")
+                logger.debug("Cuento no encontrado en BD: %s", story_id)
                 return None
                 
             # Convertir teacher_id a UUID si no es None
             teacher_id = None
             if result["teacher_id"]:
-                teacher_id = UUID(result["teacher_id"])
+                teacher_id = id_codec.from_db(result["teacher_id"])
                 
             story = Story(
-                id=UUID(result["id"]),
+                id=id_codec.from_db(result["id"]),
                 title=result["title"],
                 content=result["content"],
                 context=result["context"],
@@ -67,32 +109,110 @@ class MySQLStoryRepository(StoryRepository):
                 created_at=result["created_at"]
             )
             
-            print(f"✅ Cuento encontrado en BD: {story.title}")
+            logger.debug("Cuento encontrado en BD: %s", story.title)
             return story
             
         except Exception as e:
-            print(f"❌ Error al obtener cuento por ID: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al obtener cuento por ID: %s", e)
             return None
     
-    def get_by_teacher_id(self, teacher_id: UUID, limit: int = 10) -> List[Story]:
-        """Obtiene los cuentos creados por un profesor específico."""
-        query = "SELECT * FROM stories WHERE teacher_id = %s ORDER BY created_at DESC LIMIT %s"
+    def get_many(self, story_ids: Sequence[UUID]) -> List[Story]:
+        """Obtiene varios cuentos con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(story_ids)
+        if not ids:
+            return []
         
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor,
+                "SELECT * FROM stories WHERE id IN ({placeholders})",
+                [id_codec.to_db(story_id) for story_id in ids]
+            )
+        
+        stories = {story.id: story for story in map(self._to_story, results)}
+        logger.debug("Se encontraron %d de %d cuentos en BD", len(stories), len(ids))
+        return in_input_order(ids, stories)
+    
+    def get_illustrated(self, story_id: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene un cuento con sus escenarios e imágenes en una sola consulta (un JOIN),
+        construyendo directamente la estructura de respuesta.
+        """
         try:
             with self.db.get_cursor() as cursor:
-                cursor.execute(query, (str(teacher_id), limit))
+                cursor.execute(_ILLUSTRATED_QUERY.format(condition="st.id = %s"), (id_codec.to_db(story_id),))
+                rows = cursor.fetchall()
+                
+            if not rows:
+                logger.debug("Cuento no encontrado en BD: %s", story_id)
+                return None
+            
+            illustrated = self._assemble_illustrated(rows)
+            logger.debug("Cuento ilustrado encontrado en BD: %s", illustrated['story']['title'])
+            return illustrated
+            
+        except Exception as e:
+            logger.exception("Error al obtener cuento ilustrado: %s", e)
+            return None
+    
+    def get_illustrated_many(self, story_ids: Sequence[UUID]) -> List[Dict[str, Any]]:
+        """
+        Obtiene varios cuentos ilustrados con el mismo JOIN que get_illustrated,
+        una consulta por bloque de DB_MULTI_GET_CHUNK_SIZE ids, en el orden pedido.
+        """
+        ids = unique_ids(story_ids)
+        if not ids:
+            return []
+        
+        with self.db.get_cursor() as cursor:
+            rows = fetch_in_chunks(
+                cursor,
+                _ILLUSTRATED_QUERY.format(condition="st.id IN ({placeholders})"),
+                [id_codec.to_db(story_id) for story_id in ids]
+            )
+        
+        rows_by_story: Dict[UUID, List[Dict[str, Any]]] = {}
+        for row in rows:
+            rows_by_story.setdefault(id_codec.from_db(row["id"]), []).append(row)
+        
+        illustrated = {
+            story_id: self._assemble_illustrated(story_rows)
+            for story_id, story_rows in rows_by_story.items()
+        }
+        logger.debug("Se encontraron %d de %d cuentos ilustrados en BD", len(illustrated), len(ids))
+        return in_input_order(ids, illustrated)
+    
+    def get_by_teacher_id(
+        self,
+        teacher_id: UUID,
+        limit: int = 10,
+        after: Optional[Tuple[datetime.datetime, str]] = None
+    ) -> List[Story]:
+        """
+        Obtiene los cuentos creados por un profesor específico.
+        Con after=(created_at, id) retorna los cuentos posteriores a esa posición (keyset).
+        """
+        keyset, params = self._keyset_condition(after)
+        query = f"""
+        SELECT * FROM stories
+        WHERE teacher_id = %s {keyset}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+        """
+        
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(query, (id_codec.to_db(teacher_id), *params, limit))
                 results = cursor.fetchall()
                 
             stories = []
             for result in results:
                 teacher_id_obj = None
                 if result["teacher_id"]:
-                    teacher_id_obj = UUID(result["teacher_id"])
+                    teacher_id_obj = id_codec.from_db(result["teacher_id"])
                     
                 stories.append(Story(
-                    id=UUID(result["id"]),
+                    id=id_codec.from_db(result["id"]),
                     title=result["title"],
                     content=result["content"],
                     context=result["context"],
@@ -102,32 +222,39 @@ class MySQLStoryRepository(StoryRepository):
                     created_at=result["created_at"]
                 ))
                 
-            print(f"✅ Se encontraron {len(stories)} cuentos del profesor en BD")
+            logger.debug("Se encontraron %d cuentos del profesor en BD", len(stories))
             return stories
             
         except Exception as e:
-            print(f"❌ Error al obtener cuentos por profesor: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al obtener cuentos por profesor: %s", e)
             return []
     
-    def get_recent(self, limit: int = 10) -> List[Story]:
-        """Obtiene los cuentos más recientes."""
-        query = "SELECT * FROM stories ORDER BY created_at DESC LIMIT %s"
+    def get_recent(self, limit: int = 10, after: Optional[Tuple[datetime.datetime, str]] = None) -> List[Story]:
+        """
+        Obtiene los cuentos más recientes.
+        Con after=(created_at, id) retorna los cuentos posteriores a esa posición (keyset).
+        """
+        keyset, params = self._keyset_condition(after)
+        query = f"""
+        SELECT * FROM stories
+        WHERE 1 = 1 {keyset}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+        """
         
         try:
             with self.db.get_cursor() as cursor:
-                cursor.execute(query, (limit,))
+                cursor.execute(query, (*params, limit))
                 results = cursor.fetchall()
                 
             stories = []
             for result in results:
                 teacher_id_obj = None
                 if result["teacher_id"]:
-                    teacher_id_obj = UUID(result["teacher_id"])
+                    teacher_id_obj = id_codec.from_db(result["teacher_id"])
                     
                 stories.append(Story(
-                    id=UUID(result["id"]),
+                    id=id_codec.from_db(result["id"]),
                     title=result["title"],
                     content=result["content"],
                     context=result["context"],
@@ -137,15 +264,237 @@ class MySQLStoryRepository(StoryRepository):
                     created_at=result["created_at"]
                 ))
                 
-            print(f"✅ Se encontraron {len(stories)} cuentos recientes en BD")
+            logger.debug("Se encontraron %d cuentos recientes en BD", len(stories))
             return stories
             
         except Exception as e:
-            print(f"❌ Error al obtener cuentos recientes: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al obtener cuentos recientes: %s", e)
+            return []
+    
+    def get_summaries(
+        self,
+        teacher_id: Optional[UUID] = None,
+        limit: int = 10,
+        after: Optional[Tuple[datetime.datetime, str]] = None,
+        extra_fields: Sequence[str] = ()
+    ) -> List[StorySummary]:
+        """
+        Obtiene resúmenes de cuentos para listados.
+        Sin extra_fields la lectura de stories se resuelve solo con el índice
+        (idx_stories_summary / idx_stories_teacher_summary), sin tocar los TEXT.
+        """
+        extras = [name for name in STORY_EXTRA_FIELDS if name in extra_fields]
+        extra_columns = "".join(f", st.{name}" for name in extras)
+        keyset, params = self._keyset_condition(after, alias="st")
+        teacher_filter = ""
+        if teacher_id:
+            teacher_filter = "AND st.teacher_id = %s"
+            params = (id_codec.to_db(teacher_id), *params)
+        
+        query = f"""
+        SELECT
+            st.id, st.title, st.category, st.pedagogical_approach, st.created_at{extra_columns},{_SUMMARY_SUBQUERIES}
+        FROM stories st
+        WHERE 1 = 1 {teacher_filter} {keyset}
+        ORDER BY st.created_at DESC, st.id DESC
+        LIMIT %s
+        """
+        
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(query, (*params, limit))
+                results = cursor.fetchall()
+            
+            summaries = [self._to_summary(result, extras) for result in results]
+            
+            logger.debug("Se encontraron %d resúmenes de cuentos en BD", len(summaries))
+            return summaries
+            
+        except Exception as e:
+            logger.exception("Error al obtener resúmenes de cuentos: %s", e)
             return []
     
+    def search(
+        self,
+        terms: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        after: Optional[Tuple[float, str]] = None
+    ) -> List[StorySummary]:
+        """
+        Busca cuentos por texto con los índices FULLTEXT de stories (título, contenido,
+        contexto) y scenarios (descripción), ordenados por relevancia.
+        
+        Cada término es obligatorio y admite prefijos (modo BOOLEAN: +término*). La
+        relevancia de un cuento es la de su texto más la de sus escenarios ponderada
+        por SCENARIO_MATCH_WEIGHT, y se devuelve en extra["relevance"].
+        """
+        filters = filters or {}
+        against = " ".join(f"+{term}*" for term in terms)
+        
+        # Los filtros de stories se aplican dentro de cada rama, antes de agrupar: así
+        # solo se agregan las coincidencias que pueden aparecer en la página
+        conditions = []
+        params: list = []
+        if filters.get("teacher_id"):
+            conditions.append("s.teacher_id = %s")
+            params.append(id_codec.to_db(filters["teacher_id"]))
+        if filters.get("category"):
+            conditions.append("s.category = %s")
+            params.append(filters["category"])
+        if filters.get("pedagogical_approach"):
+            conditions.append("s.pedagogical_approach = %s")
+            params.append(filters["pedagogical_approach"])
+        if filters.get("created_from"):
+            conditions.append("s.created_at >= %s")
+            params.append(filters["created_from"])
+        if filters.get("created_to"):
+            conditions.append("s.created_at < %s")
+            params.append(filters["created_to"])
+        story_filters = "".join(f" AND {condition}" for condition in conditions)
+        
+        having = ""
+        having_params: list = []
+        if after:
+            score, last_id = after
+            having = "HAVING relevance < %s OR (relevance = %s AND story_id < %s)"
+            having_params.extend((score, score, id_codec.to_db(last_id)))
+        
+        # Cada rama usa su índice FULLTEXT; la de escenarios une con stories para filtrar
+        query = f"""
+        SELECT
+            st.id, st.title, st.category, st.pedagogical_approach, st.created_at,
+            hits.relevance,{_SUMMARY_SUBQUERIES}
+        FROM (
+            SELECT story_id, SUM(score) AS relevance
+            FROM (
+                SELECT s.id AS story_id,
+                       MATCH(s.title, s.content, s.context) AGAINST(%s IN BOOLEAN MODE) AS score
+                FROM stories s
+                WHERE MATCH(s.title, s.content, s.context) AGAINST(%s IN BOOLEAN MODE){story_filters}
+                UNION ALL
+                SELECT sc.story_id,
+                       MATCH(sc.description) AGAINST(%s IN BOOLEAN MODE) * {SCENARIO_MATCH_WEIGHT} AS score
+                FROM scenarios sc
+                JOIN stories s ON s.id = sc.story_id
+                WHERE MATCH(sc.description) AGAINST(%s IN BOOLEAN MODE){story_filters}
+            ) matches
+            GROUP BY story_id
+            {having}
+        ) hits
+        JOIN stories st ON st.id = hits.story_id
+        ORDER BY hits.relevance DESC, st.id DESC
+        LIMIT %s
+        """
+        query_params = (against, against, *params, against, against, *params, *having_params, limit)
+        
+        try:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(query, query_params)
+                results = cursor.fetchall()
+            
+            summaries = [
+                self._to_summary(result, (), {"relevance": float(result["relevance"])})
+                for result in results
+            ]
+            logger.debug("Búsqueda '%s': %d cuentos", against, len(summaries))
+            return summaries
+            
+        except Exception as e:
+            logger.exception("Error al buscar cuentos: %s", e)
+            return []
+    
+    @classmethod
+    def _assemble_illustrated(cls, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Construye {"story", "scenarios"} a partir de las filas de _ILLUSTRATED_QUERY de un cuento."""
+        story = cls._to_story(rows[0])
+        
+        # Las filas llegan ordenadas: si un escenario tiene varias imágenes
+        # (regeneraciones), prevalece la más reciente.
+        scenarios = {}
+        for row in rows:
+            if not row["scenario_id"]:
+                continue
+            
+            scenario_data = scenarios.get(row["scenario_id"])
+            if scenario_data is None:
+                scenario_data = Scenario(
+                    id=id_codec.from_db(row["scenario_id"]),
+                    story_id=story.id,
+                    description=row["scenario_description"],
+                    sequence_number=row["scenario_sequence_number"],
+                    prompt_for_image=row["scenario_prompt_for_image"],
+                    created_at=row["scenario_created_at"]
+                ).to_dict()
+                scenario_data["image"] = None
+                scenarios[row["scenario_id"]] = scenario_data
+            
+            if row["image_id"]:
+                scenario_data["image"] = Image(
+                    id=id_codec.from_db(row["image_id"]),
+                    scenario_id=id_codec.from_db(row["scenario_id"]),
+                    prompt=row["image_prompt"],
+                    image_url=row["image_url"],
+                    created_at=row["image_created_at"]
+                ).to_dict()
+        
+        return {
+            "story": story.to_dict(),
+            "scenarios": list(scenarios.values())
+        }
+    
+    @staticmethod
+    def _to_story(result: Dict[str, Any]) -> Story:
+        return Story(
+            id=id_codec.from_db(result["id"]),
+            title=result["title"],
+            content=result["content"],
+            context=result["context"],
+            category=result["category"],
+            pedagogical_approach=result.get("pedagogical_approach", "traditional"),
+            teacher_id=id_codec.from_db(result["teacher_id"]) if result["teacher_id"] else None,
+            created_at=result["created_at"]
+        )
+    
+    @staticmethod
+    def _to_summary(
+        result: Dict[str, Any],
+        extras: Sequence[str],
+        additional: Optional[Dict[str, Any]] = None
+    ) -> StorySummary:
+        """Construye un StorySummary a partir de una fila de listado o de búsqueda."""
+        extra = {name: result[name] for name in extras}
+        if "teacher_id" in extra:
+            teacher_id_value = id_codec.from_db(extra["teacher_id"])
+            extra["teacher_id"] = str(teacher_id_value) if teacher_id_value else None
+        extra.update(additional or {})
+        return StorySummary(
+            id=id_codec.from_db(result["id"]),
+            title=result["title"],
+            category=result["category"],
+            pedagogical_approach=result["pedagogical_approach"],
+            created_at=result["created_at"],
+            cover_image_url=result["cover_image_url"],
+            scenario_count=result["scenario_count"],
+            extra=extra
+        )
+    
+    @staticmethod
+    def _keyset_condition(after: Optional[Tuple[datetime.datetime, str]], alias: str = "") -> Tuple[str, tuple]:
+        """
+        Condición de paginación por keyset sobre (created_at, id) en orden descendente.
+        Se expande en lugar de usar (created_at, id) < (%s, %s) para que MySQL
+        aproveche el índice como rango.
+        """
+        if not after:
+            return "", ()
+        created_at, last_id = after
+        column = f"{alias}." if alias else ""
+        return (
+            f"AND ({column}created_at < %s OR ({column}created_at = %s AND {column}id < %s))",
+            (created_at, created_at, id_codec.to_db(last_id))
+        )
+    
     def update(self, story: Story) -> bool:
         """Actualiza un cuento existente."""
         query = """
@@ -159,25 +508,27 @@ class MySQLStoryRepository(StoryRepository):
             story.context,
             story.category,
             story.pedagogical_approach,  # ✅ Incluido en UPDATE
-            str(story.teacher_id) if story.teacher_id else None,
-            str(story.id)
+            id_codec.to_db(story.teacher_id),
+            id_codec.to_db(story.id)
         )
         
         try:
             with self.db.get_cursor() as cursor:
+                previous = self._lock_stats_row(cursor, story.id)
                 cursor.execute(query, values)
                 success = cursor.rowcount > 0
+                if previous:
+                    apply_story_stats(cursor, [previous], -1)
+                    apply_story_stats(cursor, [self._stats_row(story, created_at=previous["created_at"])], 1)
                 
             if success:
-                print(f"✅ Cuento actualizado en BD: {story.id}")
+                logger.debug("Cuento actualizado en BD: %s", story.id)
             else:
-                print(f"❌ No se actualizó ningún cuento: {story.id}")
+                logger.warning("No se actualizó ningún cuento: %s", story.id)
             return success
             
         except Exception as e:
-            print(f"❌ Error al actualizar cuento: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al actualizar cuento: %s", e)
             return False
     
     def delete(self, story_id: UUID) -> bool:
@@ -186,17 +537,53 @@ class MySQLStoryRepository(StoryRepository):
         
         try:
             with self.db.get_cursor() as cursor:
-                cursor.execute(query, (str(story_id),))
+                # Escenarios e imágenes se eliminan en cascada: liberar sus referencias a blobs
+                cursor.execute(
+                    """
+                    SELECT i.image_url FROM images i
+                    JOIN scenarios s ON i.scenario_id = s.id
+                    WHERE s.story_id = %s
+                    FOR UPDATE
+                    """,
+                    (id_codec.to_db(story_id),)
+                )
+                urls = [row["image_url"] for row in cursor.fetchall()]
+                previous = self._lock_stats_row(cursor, story_id)
+                cursor.execute(query, (id_codec.to_db(story_id),))
                 success = cursor.rowcount > 0
+                add_references(cursor, urls, -1)
+                if previous:
+                    apply_story_stats(cursor, [previous], -1)
                 
             if success:
-                print(f"✅ Cuento eliminado de BD: {story_id}")
+                logger.debug("Cuento eliminado de BD: %s", story_id)
             else:
-                print(f"❌ No se eliminó ningún cuento: {story_id}")
+                logger.warning("No se eliminó ningún cuento: %s", story_id)
             return success
             
         except Exception as e:
-            print(f"❌ Error al eliminar cuento: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return False
\ No newline at end of file
+            logger.exception("Error al eliminar cuento: %s", e)
+            return False
+    
+    @staticmethod
+    def _stats_row(story: Story, created_at: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+        """Valores de un cuento que usan los acumulados de actividad."""
+        return {
+            "teacher_id": story.teacher_id,
+            "category": story.category,
+            "pedagogical_approach": story.pedagogical_approach,
+            "content": story.content,
+            "created_at": created_at or story.created_at
+        }
+    
+    @staticmethod
+    def _lock_stats_row(cursor, story_id: UUID) -> Optional[Dict[str, Any]]:
+        """Lee y bloquea los valores actuales del cuento antes de modificarlo o eliminarlo."""
+        cursor.execute(
+            f"SELECT {STATS_COLUMNS} FROM stories WHERE id = %s FOR UPDATE",
+            (id_codec.to_db(story_id),)
+        )
+        row = cursor.fetchone()
+        if not row:
+            return None
+        return {**row, "teacher_id": id_codec.from_db(row["teacher_id"])}
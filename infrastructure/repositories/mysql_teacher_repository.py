@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
 import bcrypt
 
 from domain.entities.teacher import Teacher
 from domain.interfaces.repositories.teacher_repository import TeacherRepository
 from infrastructure.database.connection import DatabaseConnection
+from infrastructure.database.id_codec import id_codec
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
 
 class MySQLTeacherRepository(TeacherRepository):
     """Implementación MySQL del repositorio de profesores."""
@@ -19,7 +21,7 @@ class MySQLTeacherRepository(TeacherRepository):
         VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         values = (
-            str(teacher.id),
+            id_codec.to_db(teacher.id),
             teacher.username,
             teacher.email,
             teacher.password_hash,
@@ -38,14 +40,14 @@ class MySQLTeacherRepository(TeacherRepository):
         query = "SELECT * FROM teachers WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(teacher_id),))
+            cursor.execute(query, (id_codec.to_db(teacher_id),))
             result = cursor.fetchone()
             
         if not result:
             return None
             
         return Teacher(
-            id=UUID(result["id"]),
+            id=id_codec.from_db(result["id"]),
             username=result["username"],
             email=result["email"],
             password_hash=result["password_hash"],
@@ -54,6 +56,34 @@ class MySQLTeacherRepository(TeacherRepository):
             created_at=result["created_at"]
         )
     
+    def get_many(self, teacher_ids: Sequence[UUID]) -> List[Teacher]:
+        """Obtiene varios profesores con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(teacher_ids)
+        if not ids:
+            return []
+        
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor,
+                "SELECT * FROM teachers WHERE id IN ({placeholders})",
+                [id_codec.to_db(teacher_id) for teacher_id in ids]
+            )
+        
+        teachers = {}
+        for result in results:
+            teacher = Teacher(
+                id=id_codec.from_db(result["id"]),
+                username=result["username"],
+                email=result["email"],
+                password_hash=result["password_hash"],
+                school=result["school"],
+                grade=result["grade"],
+                created_at=result["created_at"]
+            )
+            teachers[teacher.id] = teacher
+        
+        return in_input_order(ids, teachers)
+    
     def get_by_email(self, email: str) -> Optional[Teacher]:
         """Obtiene un profesor por su email."""
         query = "SELECT * FROM teachers WHERE email = %s"
@@ -66,7 +96,7 @@ class MySQLTeacherRepository(TeacherRepository):
             return None
             
         return Teacher(
-            id=UUID(result["id"]),
+            id=id_codec.from_db(result["id"]),
             username=result["username"],
             email=result["email"],
             password_hash=result["password_hash"],
@@ -88,7 +118,7 @@ class MySQLTeacherRepository(TeacherRepository):
             teacher.password_hash,
             teacher.school,
             teacher.grade,
-            str(teacher.id)
+            id_codec.to_db(teacher.id)
         )
         
         with self.db.get_cursor() as cursor:
@@ -100,5 +130,11 @@ class MySQLTeacherRepository(TeacherRepository):
         query = "DELETE FROM teachers WHERE id = %s"
         
         with self.db.get_cursor() as cursor:
-            cursor.execute(query, (str(teacher_id),))
-            return cursor.rowcount > 0
\ No newline at end of file
+            cursor.execute(query, (id_codec.to_db(teacher_id),))
+            deleted = cursor.rowcount > 0
+            # Sus cuentos quedan sin profesor (ON DELETE SET NULL): descartar sus acumulados
+            cursor.execute(
+                "DELETE FROM teacher_activity_stats WHERE teacher_id = %s",
+                (id_codec.to_db(teacher_id),)
+            )
+            return deleted
\ No newline at end of file
@@ -0,0 +1,162 @@
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from domain.interfaces.repositories.teacher_stats_repository import TeacherStatsRepository
+from domain.value_objects.teacher_activity_stats import TeacherActivityStats, story_stat_buckets, word_count
+from infrastructure.database.connection import DatabaseConnection
+from infrastructure.database.id_codec import id_codec
+
+logger = logging.getLogger(__name__)
+
+# Columnas de stories que necesitan los acumulados
+STATS_COLUMNS = "teacher_id, category, pedagogical_approach, content, created_at"
+
+
+def apply_story_stats(cursor, stories: Iterable[Dict[str, Any]], delta: int) -> None:
+    """
+    Suma (delta=1) o resta (delta=-1) cuentos de los acumulados de su profesor.
+    Se ejecuta con el cursor del repositorio de cuentos para quedar en la misma
+    transacción que el INSERT/UPDATE/DELETE de la tabla stories.
+
+    Cada cuento recibe los valores de STATS_COLUMNS; teacher_id ya convertido a UUID.
+    """
+    _write_stats(cursor, *_aggregate_stats(stories, delta), delta)
+
+
+def _aggregate_stats(stories: Iterable[Dict[str, Any]], delta: int) -> Tuple[Counter, Counter]:
+    counts: Counter = Counter()
+    words: Counter = Counter()
+    for story in stories:
+        if not story.get("teacher_id"):
+            continue
+        teacher_key = id_codec.to_db(story["teacher_id"])
+        story_words = word_count(story["content"])
+        for dimension, bucket in story_stat_buckets(story):
+            key = (teacher_key, dimension, bucket)
+            counts[key] += delta
+            words[key] += delta * story_words
+    return counts, words
+
+
+def _write_stats(cursor, counts: Counter, words: Counter, delta: int) -> None:
+    if not counts:
+        return
+    cursor.executemany(
+        """
+        INSERT INTO teacher_activity_stats (teacher_id, dimension, bucket, story_count, word_count)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            story_count = GREATEST(story_count + VALUES(story_count), 0),
+            word_count = GREATEST(word_count + VALUES(word_count), 0)
+        """,
+        [(*key, count, words[key]) for key, count in counts.items()]
+    )
+    if delta < 0:
+        teachers = {key[0] for key in counts}
+        cursor.executemany(
+            "DELETE FROM teacher_activity_stats WHERE teacher_id = %s AND story_count = 0",
+            [(teacher_key,) for teacher_key in teachers]
+        )
+
+
+class MySQLTeacherStatsRepository(TeacherStatsRepository):
+    """
+    Implementación MySQL de las estadísticas de actividad.
+
+    La lectura solo toca las filas de teacher_activity_stats del profesor (una por
+    mes, categoría, enfoque y día de la semana con actividad) y una búsqueda en el
+    índice idx_stories_teacher_summary para la fecha del último cuento, de modo
+    que su costo no depende del tamaño de la biblioteca.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.db = DatabaseConnection()
+        self.batch_size = batch_size
+
+    def get_activity(self, teacher_id: UUID) -> TeacherActivityStats:
+        """Obtiene las estadísticas acumuladas de un profesor."""
+        teacher_key = id_codec.to_db(teacher_id)
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT dimension, bucket, story_count, word_count
+                FROM teacher_activity_stats
+                WHERE teacher_id = %s AND story_count > 0
+                """,
+                (teacher_key,)
+            )
+            rows = cursor.fetchall()
+            cursor.execute(
+                "SELECT MAX(created_at) AS last_story_at FROM stories WHERE teacher_id = %s",
+                (teacher_key,)
+            )
+            last_story_at = cursor.fetchone()["last_story_at"]
+
+        groups: Dict[str, Dict[Any, int]] = {
+            "month": {}, "category": {}, "approach": {}, "weekday": {}
+        }
+        total_stories = 0
+        total_words = 0
+        for row in rows:
+            if row["dimension"] == "total":
+                total_stories = row["story_count"]
+                total_words = row["word_count"]
+            elif row["dimension"] == "weekday":
+                groups["weekday"][int(row["bucket"])] = row["story_count"]
+            elif row["dimension"] in groups:
+                groups[row["dimension"]][row["bucket"]] = row["story_count"]
+
+        return TeacherActivityStats(
+            total_stories=total_stories,
+            total_words=total_words,
+            stories_by_month=dict(sorted(groups["month"].items())),
+            stories_by_category=groups["category"],
+            stories_by_approach=groups["approach"],
+            stories_by_weekday=groups["weekday"],
+            last_story_at=last_story_at
+        )
+
+    def rebuild(self, teacher_id: Optional[UUID] = None) -> int:
+        """
+        Recalcula los acumulados desde la tabla de cuentos (de un profesor o de todos).
+
+        Cada profesor se recalcula en su propia transacción: los cuentos se leen con
+        FOR SHARE, así que las escrituras concurrentes de ese profesor esperan a que
+        termine y luego se suman sobre los acumulados ya reconstruidos.
+        """
+        if teacher_id:
+            teacher_ids = [teacher_id]
+        else:
+            with self.db.get_cursor() as cursor:
+                cursor.execute("SELECT id FROM teachers")
+                teacher_ids = [id_codec.from_db(row["id"]) for row in cursor.fetchall()]
+
+        for current_id in teacher_ids:
+            self._rebuild_teacher(current_id)
+            logger.info("Estadísticas recalculadas para el profesor %s", current_id)
+        return len(teacher_ids)
+
+    def _rebuild_teacher(self, teacher_id: UUID) -> None:
+        teacher_key = id_codec.to_db(teacher_id)
+        with self.db.transaction():
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {STATS_COLUMNS} FROM stories WHERE teacher_id = %s FOR SHARE",
+                    (teacher_key,)
+                )
+                # Se agrega por lotes sin retener el contenido de los cuentos
+                counts, words = _aggregate_stats(
+                    ({**row, "teacher_id": teacher_id} for row in self._fetch_batches(cursor)), 1
+                )
+
+                cursor.execute("DELETE FROM teacher_activity_stats WHERE teacher_id = %s", (teacher_key,))
+                _write_stats(cursor, counts, words, 1)
+
+    def _fetch_batches(self, cursor):
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            yield from rows
@@ -0,0 +1,18 @@
+from typing import ContextManager
+
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
+from infrastructure.database.connection import DatabaseConnection
+
+class MySQLUnitOfWork(UnitOfWork):
+    """
+    Implementación MySQL de la unidad de trabajo.
+    Reserva una conexión del pool durante el bloque; los repositorios MySQL
+    la reutilizan y se hace un único commit al final.
+    """
+    
+    def __init__(self):
+        self.db = DatabaseConnection()
+    
+    def transaction(self) -> ContextManager[None]:
+        """Abre una transacción sobre la conexión compartida por los repositorios."""
+        return self.db.transaction()
@@ -0,0 +1,87 @@
+from typing import Any, NamedTuple
+
+from config import REPOSITORY_BACKEND, SQLITE_PATH
+from domain.interfaces.repositories.image_repository import ImageRepository
+from domain.interfaces.repositories.scenario_repository import ScenarioRepository
+from domain.interfaces.repositories.story_repository import StoryRepository
+from domain.interfaces.repositories.teacher_repository import TeacherRepository
+from domain.interfaces.repositories.teacher_stats_repository import TeacherStatsRepository
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
+
+REPOSITORY_BACKENDS = ("mysql", "sqlite", "memory")
+
+
+class Repositories(NamedTuple):
+    story: StoryRepository
+    scenario: ScenarioRepository
+    image: ImageRepository
+    teacher: TeacherRepository
+    teacher_stats: TeacherStatsRepository
+    unit_of_work: UnitOfWork
+    # Conexión o almacén compartido por los repositorios (expone reset_after_fork)
+    database: Any
+
+
+def create_repositories(backend: str = REPOSITORY_BACKEND, sqlite_path: str = SQLITE_PATH) -> Repositories:
+    """
+    Crea el conjunto de repositorios de un backend ('mysql', 'sqlite' o 'memory').
+    Todos los repositorios del conjunto comparten la misma conexión o almacén, así
+    que la unidad de trabajo abarca a todos. Cada backend se importa solo si se usa.
+    """
+    if backend == "mysql":
+        from infrastructure.database.connection import DatabaseConnection
+        from infrastructure.repositories.mysql_image_repository import MySQLImageRepository
+        from infrastructure.repositories.mysql_scenario_repository import MySQLScenarioRepository
+        from infrastructure.repositories.mysql_story_repository import MySQLStoryRepository
+        from infrastructure.repositories.mysql_teacher_repository import MySQLTeacherRepository
+        from infrastructure.repositories.mysql_teacher_stats_repository import MySQLTeacherStatsRepository
+        from infrastructure.repositories.mysql_unit_of_work import MySQLUnitOfWork
+        return Repositories(
+            story=MySQLStoryRepository(),
+            scenario=MySQLScenarioRepository(),
+            image=MySQLImageRepository(),
+            teacher=MySQLTeacherRepository(),
+            teacher_stats=MySQLTeacherStatsRepository(),
+            unit_of_work=MySQLUnitOfWork(),
+            database=DatabaseConnection()
+        )
+
+    if backend == "sqlite":
+        from infrastructure.database.sqlite_connection import SQLiteDatabase
+        from infrastructure.repositories.sqlite_image_repository import SQLiteImageRepository
+        from infrastructure.repositories.sqlite_scenario_repository import SQLiteScenarioRepository
+        from infrastructure.repositories.sqlite_story_repository import SQLiteStoryRepository
+        from infrastructure.repositories.sqlite_teacher_repository import SQLiteTeacherRepository
+        from infrastructure.repositories.sqlite_teacher_stats_repository import SQLiteTeacherStatsRepository
+        from infrastructure.repositories.sqlite_unit_of_work import SQLiteUnitOfWork
+        db = SQLiteDatabase(sqlite_path)
+        return Repositories(
+            story=SQLiteStoryRepository(db),
+            scenario=SQLiteScenarioRepository(db),
+            image=SQLiteImageRepository(db),
+            teacher=SQLiteTeacherRepository(db),
+            teacher_stats=SQLiteTeacherStatsRepository(db),
+            unit_of_work=SQLiteUnitOfWork(db),
+            database=db
+        )
+
+    if backend == "memory":
+        from infrastructure.database.memory_store import InMemoryStore
+        from infrastructure.repositories.memory_image_repository import InMemoryImageRepository
+        from infrastructure.repositories.memory_scenario_repository import InMemoryScenarioRepository
+        from infrastructure.repositories.memory_story_repository import InMemoryStoryRepository
+        from infrastructure.repositories.memory_teacher_repository import InMemoryTeacherRepository
+        from infrastructure.repositories.memory_teacher_stats_repository import InMemoryTeacherStatsRepository
+        from infrastructure.repositories.memory_unit_of_work import InMemoryUnitOfWork
+        store = InMemoryStore()
+        return Repositories(
+            story=InMemoryStoryRepository(store),
+            scenario=InMemoryScenarioRepository(store),
+            image=InMemoryImageRepository(store),
+            teacher=InMemoryTeacherRepository(store),
+            teacher_stats=InMemoryTeacherStatsRepository(store),
+            unit_of_work=InMemoryUnitOfWork(store),
+            database=store
+        )
+
+    raise ValueError(f"REPOSITORY_BACKEND desconocido: {backend} (opciones: {', '.join(REPOSITORY_BACKENDS)})")
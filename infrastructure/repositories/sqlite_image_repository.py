@@ -0,0 +1,132 @@
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.image import Image
+from domain.interfaces.repositories.image_repository import ImageRepository
+from infrastructure.database.sqlite_connection import SQLiteDatabase, from_db_datetime, to_db_datetime
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+
+class SQLiteImageRepository(ImageRepository):
+    """
+    Implementación SQLite del repositorio de imágenes (pruebas y benchmarks).
+    No lleva el conteo de referencias de image_blobs: los archivos en disco
+    solo los administra el backend MySQL.
+    """
+    
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+    
+    def create(self, image: Image) -> UUID:
+        """Crea la imagen de un escenario, o reemplaza la existente."""
+        self.create_many([image])
+        return image.id
+    
+    def create_many(self, images: List[Image]) -> List[UUID]:
+        """
+        Crea varias imágenes en una sola operación, reemplazando la imagen
+        existente de cada escenario si la hay.
+        """
+        if not images:
+            return []
+        
+        query = """
+        INSERT INTO images (id, scenario_id, prompt, image_url, created_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(scenario_id) DO UPDATE SET
+            id = excluded.id, prompt = excluded.prompt,
+            image_url = excluded.image_url, created_at = excluded.created_at
+        """
+        values = [
+            (
+                str(image.id),
+                str(image.scenario_id),
+                image.prompt,
+                image.image_url,
+                to_db_datetime(image.created_at)
+            )
+            for image in images
+        ]
+        
+        with self.db.get_cursor() as cursor:
+            cursor.executemany(query, values)
+        
+        return [image.id for image in images]
+    
+    def get_by_id(self, image_id: UUID) -> Optional[Image]:
+        """Obtiene una imagen por su ID."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM images WHERE id = ?", (str(image_id),))
+            result = cursor.fetchone()
+        
+        return self._to_image(result) if result else None
+    
+    def get_many(self, image_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene varias imágenes con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(image_ids)
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor, "SELECT * FROM images WHERE id IN ({placeholders})", [str(i) for i in ids], "?"
+            )
+        return in_input_order(ids, {image.id: image for image in map(self._to_image, results)})
+    
+    def get_by_scenario_id(self, scenario_id: UUID) -> Optional[Image]:
+        """Obtiene una imagen asociada a un escenario específico."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM images WHERE scenario_id = ?", (str(scenario_id),))
+            result = cursor.fetchone()
+        
+        return self._to_image(result) if result else None
+    
+    def get_by_scenario_ids(self, scenario_ids: Sequence[UUID]) -> List[Image]:
+        """Obtiene las imágenes de varios escenarios, en el orden pedido."""
+        ids = unique_ids(scenario_ids)
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor, "SELECT * FROM images WHERE scenario_id IN ({placeholders})", [str(i) for i in ids], "?"
+            )
+        return in_input_order(ids, {image.scenario_id: image for image in map(self._to_image, results)})
+    
+    def get_by_story_id(self, story_id: UUID) -> List[Image]:
+        """Obtiene todas las imágenes asociadas a un cuento."""
+        query = """
+        SELECT i.*
+        FROM images i
+        JOIN scenarios s ON i.scenario_id = s.id
+        WHERE s.story_id = ?
+        ORDER BY s.sequence_number
+        """
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute(query, (str(story_id),))
+            return [self._to_image(result) for result in cursor.fetchall()]
+    
+    def update(self, image: Image) -> bool:
+        """Actualiza una imagen existente."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                "UPDATE images SET prompt = ?, image_url = ? WHERE id = ?",
+                (image.prompt, image.image_url, str(image.id))
+            )
+            return cursor.rowcount > 0
+    
+    def delete(self, image_id: UUID) -> bool:
+        """Elimina una imagen por su ID."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM images WHERE id = ?", (str(image_id),))
+            return cursor.rowcount > 0
+    
+    def delete_by_scenario_id(self, scenario_id: UUID) -> bool:
+        """Elimina todas las imágenes asociadas a un escenario."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM images WHERE scenario_id = ?", (str(scenario_id),))
+            return cursor.rowcount > 0
+    
+    @staticmethod
+    def _to_image(result) -> Image:
+        return Image(
+            id=UUID(result["id"]),
+            scenario_id=UUID(result["scenario_id"]),
+            prompt=result["prompt"],
+            image_url=result["image_url"],
+            created_at=from_db_datetime(result["created_at"])
+        )
@@ -0,0 +1,111 @@
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.scenario import Scenario
+from domain.interfaces.repositories.scenario_repository import ScenarioRepository
+from infrastructure.database.sqlite_connection import SQLiteDatabase, from_db_datetime, to_db_datetime
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+
+class SQLiteScenarioRepository(ScenarioRepository):
+    """Implementación SQLite del repositorio de escenarios (pruebas y benchmarks)."""
+    
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+    
+    def create(self, scenario: Scenario) -> UUID:
+        """Crea un nuevo escenario en la base de datos."""
+        self.create_many([scenario])
+        return scenario.id
+    
+    def create_many(self, scenarios: List[Scenario]) -> List[UUID]:
+        """Crea varios escenarios en una sola operación."""
+        if not scenarios:
+            return []
+        
+        query = """
+        INSERT INTO scenarios (id, story_id, description, sequence_number, prompt_for_image, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """
+        values = [
+            (
+                str(scenario.id),
+                str(scenario.story_id),
+                scenario.description,
+                scenario.sequence_number,
+                scenario.prompt_for_image,
+                to_db_datetime(scenario.created_at)
+            )
+            for scenario in scenarios
+        ]
+        
+        with self.db.get_cursor() as cursor:
+            cursor.executemany(query, values)
+        
+        return [scenario.id for scenario in scenarios]
+    
+    def get_by_id(self, scenario_id: UUID) -> Optional[Scenario]:
+        """Obtiene un escenario por su ID."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM scenarios WHERE id = ?", (str(scenario_id),))
+            result = cursor.fetchone()
+        
+        return self._to_scenario(result) if result else None
+    
+    def get_many(self, scenario_ids: Sequence[UUID]) -> List[Scenario]:
+        """Obtiene varios escenarios con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(scenario_ids)
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor, "SELECT * FROM scenarios WHERE id IN ({placeholders})", [str(i) for i in ids], "?"
+            )
+        return in_input_order(ids, {scenario.id: scenario for scenario in map(self._to_scenario, results)})
+    
+    def get_by_story_id(self, story_id: UUID) -> List[Scenario]:
+        """Obtiene todos los escenarios asociados a un cuento."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                "SELECT * FROM scenarios WHERE story_id = ? ORDER BY sequence_number",
+                (str(story_id),)
+            )
+            return [self._to_scenario(result) for result in cursor.fetchall()]
+    
+    def update(self, scenario: Scenario) -> bool:
+        """Actualiza un escenario existente."""
+        query = """
+        UPDATE scenarios
+        SET description = ?, sequence_number = ?, prompt_for_image = ?
+        WHERE id = ?
+        """
+        values = (
+            scenario.description,
+            scenario.sequence_number,
+            scenario.prompt_for_image,
+            str(scenario.id)
+        )
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute(query, values)
+            return cursor.rowcount > 0
+    
+    def delete(self, scenario_id: UUID) -> bool:
+        """Elimina un escenario por su ID (sus imágenes en cascada)."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM scenarios WHERE id = ?", (str(scenario_id),))
+            return cursor.rowcount > 0
+    
+    def delete_by_story_id(self, story_id: UUID) -> bool:
+        """Elimina todos los escenarios asociados a un cuento."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM scenarios WHERE story_id = ?", (str(story_id),))
+            return cursor.rowcount > 0
+    
+    @staticmethod
+    def _to_scenario(result) -> Scenario:
+        return Scenario(
+            id=UUID(result["id"]),
+            story_id=UUID(result["story_id"]),
+            description=result["description"],
+            sequence_number=result["sequence_number"],
+            prompt_for_image=result["prompt_for_image"],
+            created_at=from_db_datetime(result["created_at"])
+        )
@@ -0,0 +1,320 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from domain.entities.image import Image
+from domain.entities.scenario import Scenario
+from domain.entities.story import Story
+from domain.interfaces.repositories.story_repository import StoryRepository, STORY_EXTRA_FIELDS
+from domain.value_objects.story_summary import StorySummary
+from infrastructure.database.sqlite_connection import SQLiteDatabase, from_db_datetime, to_db_datetime
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+from infrastructure.repositories.text_search import SCENARIO_MATCH_WEIGHT, match_score
+
+_SUMMARY_SUBQUERIES = """
+            (
+                SELECT i.image_url
+                FROM scenarios sc
+                JOIN images i ON i.scenario_id = sc.id
+                WHERE sc.story_id = st.id
+                ORDER BY sc.sequence_number, i.created_at DESC
+                LIMIT 1
+            ) AS cover_image_url,
+            (SELECT COUNT(*) FROM scenarios sc WHERE sc.story_id = st.id) AS scenario_count"""
+
+_ILLUSTRATED_QUERY = """
+                SELECT
+                    st.*,
+                    sc.id AS scenario_id, sc.description AS scenario_description,
+                    sc.sequence_number AS scenario_sequence_number,
+                    sc.prompt_for_image AS scenario_prompt_for_image,
+                    sc.created_at AS scenario_created_at,
+                    i.id AS image_id, i.prompt AS image_prompt,
+                    i.image_url AS image_url, i.created_at AS image_created_at
+                FROM stories st
+                LEFT JOIN scenarios sc ON sc.story_id = st.id
+                LEFT JOIN images i ON i.scenario_id = sc.id
+                WHERE {condition}
+                ORDER BY st.id, sc.sequence_number, i.created_at
+                """
+
+class SQLiteStoryRepository(StoryRepository):
+    """Implementación SQLite del repositorio de cuentos (pruebas y benchmarks)."""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def create(self, story: Story) -> UUID:
+        """Crea un nuevo cuento."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO stories (id, title, content, context, category, pedagogical_approach, teacher_id, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    str(story.id), story.title, story.content, story.context, story.category,
+                    story.pedagogical_approach, str(story.teacher_id) if story.teacher_id else None,
+                    to_db_datetime(story.created_at)
+                )
+            )
+        return story.id
+
+    def get_by_id(self, story_id: UUID) -> Optional[Story]:
+        """Obtiene un cuento por su ID."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM stories WHERE id = ?", (str(story_id),))
+            row = cursor.fetchone()
+        return self._to_story(row) if row else None
+
+    def get_many(self, story_ids: Sequence[UUID]) -> List[Story]:
+        """Obtiene varios cuentos con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(story_ids)
+        with self.db.get_cursor() as cursor:
+            rows = fetch_in_chunks(
+                cursor, "SELECT * FROM stories WHERE id IN ({placeholders})", [str(i) for i in ids], "?"
+            )
+        return in_input_order(ids, {story.id: story for story in map(self._to_story, rows)})
+
+    def get_illustrated(self, story_id: UUID) -> Optional[Dict[str, Any]]:
+        """Obtiene un cuento con sus escenarios e imágenes en una sola consulta."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(_ILLUSTRATED_QUERY.format(condition="st.id = ?"), (str(story_id),))
+            rows = cursor.fetchall()
+        return self._assemble_illustrated(rows) if rows else None
+
+    def get_illustrated_many(self, story_ids: Sequence[UUID]) -> List[Dict[str, Any]]:
+        """Obtiene varios cuentos ilustrados, una consulta por bloque de ids, en el orden pedido."""
+        ids = unique_ids(story_ids)
+        with self.db.get_cursor() as cursor:
+            rows = fetch_in_chunks(
+                cursor, _ILLUSTRATED_QUERY.format(condition="st.id IN ({placeholders})"), [str(i) for i in ids], "?"
+            )
+        rows_by_story: Dict[UUID, list] = {}
+        for row in rows:
+            rows_by_story.setdefault(UUID(row["id"]), []).append(row)
+        return in_input_order(
+            ids, {story_id: self._assemble_illustrated(story_rows) for story_id, story_rows in rows_by_story.items()}
+        )
+
+    def get_by_teacher_id(
+        self,
+        teacher_id: UUID,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None
+    ) -> List[Story]:
+        """Obtiene los cuentos de un profesor, del más reciente al más antiguo."""
+        keyset, params = self._keyset_condition(after)
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT * FROM stories WHERE teacher_id = ? {keyset}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+                """,
+                (str(teacher_id), *params, limit)
+            )
+            return [self._to_story(row) for row in cursor.fetchall()]
+
+    def get_recent(self, limit: int = 10, after: Optional[Tuple[datetime, str]] = None) -> List[Story]:
+        """Obtiene los cuentos más recientes."""
+        keyset, params = self._keyset_condition(after)
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                f"SELECT * FROM stories WHERE 1 = 1 {keyset} ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*params, limit)
+            )
+            return [self._to_story(row) for row in cursor.fetchall()]
+
+    def get_summaries(
+        self,
+        teacher_id: Optional[UUID] = None,
+        limit: int = 10,
+        after: Optional[Tuple[datetime, str]] = None,
+        extra_fields: Sequence[str] = ()
+    ) -> List[StorySummary]:
+        """Obtiene resúmenes de cuentos para listados."""
+        extras = [name for name in STORY_EXTRA_FIELDS if name in extra_fields]
+        extra_columns = "".join(f", st.{name}" for name in extras)
+        keyset, params = self._keyset_condition(after, alias="st")
+        teacher_filter = ""
+        if teacher_id:
+            teacher_filter = "AND st.teacher_id = ?"
+            params = (str(teacher_id), *params)
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    st.id, st.title, st.category, st.pedagogical_approach, st.created_at{extra_columns},{_SUMMARY_SUBQUERIES}
+                FROM stories st
+                WHERE 1 = 1 {teacher_filter} {keyset}
+                ORDER BY st.created_at DESC, st.id DESC
+                LIMIT ?
+                """,
+                (*params, limit)
+            )
+            rows = cursor.fetchall()
+        return [self._to_summary(row, extras) for row in rows]
+
+    def search(
+        self,
+        terms: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        limit: int = 10,
+        after: Optional[Tuple[float, str]] = None
+    ) -> List[StorySummary]:
+        """
+        Busca cuentos por texto. Sin índices FULLTEXT: los candidatos se filtran con
+        LIKE y la relevancia se calcula con match_score (misma semántica que MySQL).
+        """
+        filters = filters or {}
+        if not terms:
+            return []
+
+        conditions = []
+        params: list = []
+        if filters.get("teacher_id"):
+            conditions.append("st.teacher_id = ?")
+            params.append(str(filters["teacher_id"]))
+        if filters.get("category"):
+            conditions.append("st.category = ?")
+            params.append(filters["category"])
+        if filters.get("pedagogical_approach"):
+            conditions.append("st.pedagogical_approach = ?")
+            params.append(filters["pedagogical_approach"])
+        if filters.get("created_from"):
+            conditions.append("st.created_at >= ?")
+            params.append(to_db_datetime(filters["created_from"]))
+        if filters.get("created_to"):
+            conditions.append("st.created_at < ?")
+            params.append(to_db_datetime(filters["created_to"]))
+        if terms[0].isascii():
+            # Prefiltro: el primer término aparece en el cuento o en algún escenario
+            # (LIKE de SQLite solo ignora mayúsculas en ASCII)
+            pattern = f"%{terms[0]}%"
+            conditions.append(
+                "(st.title || ' ' || st.content || ' ' || st.context LIKE ? "
+                "OR EXISTS (SELECT 1 FROM scenarios sc WHERE sc.story_id = st.id AND sc.description LIKE ?))"
+            )
+            params.extend((pattern, pattern))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    st.id, st.title, st.category, st.pedagogical_approach, st.created_at,
+                    st.title || ' ' || st.content || ' ' || st.context AS text,{_SUMMARY_SUBQUERIES}
+                FROM stories st
+                {where}
+                """,
+                params
+            )
+            candidates = cursor.fetchall()
+            scored = []
+            for row in candidates:
+                cursor.execute("SELECT description FROM scenarios WHERE story_id = ?", (row["id"],))
+                relevance = match_score(row["text"], terms) + sum(
+                    match_score(scenario["description"], terms) * SCENARIO_MATCH_WEIGHT
+                    for scenario in cursor.fetchall()
+                )
+                if relevance > 0:
+                    scored.append((relevance, row))
+
+        scored.sort(key=lambda item: (item[0], item[1]["id"]), reverse=True)
+        if after:
+            score, last_id = after
+            scored = [item for item in scored if (item[0], item[1]["id"]) < (score, str(last_id))]
+        return [self._to_summary(row, (), {"relevance": relevance}) for relevance, row in scored[:limit]]
+
+    def update(self, story: Story) -> bool:
+        """Actualiza un cuento existente."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE stories
+                SET title = ?, content = ?, context = ?, category = ?, pedagogical_approach = ?, teacher_id = ?
+                WHERE id = ?
+                """,
+                (
+                    story.title, story.content, story.context, story.category, story.pedagogical_approach,
+                    str(story.teacher_id) if story.teacher_id else None, str(story.id)
+                )
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, story_id: UUID) -> bool:
+        """Elimina un cuento (escenarios e imágenes en cascada)."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM stories WHERE id = ?", (str(story_id),))
+            return cursor.rowcount > 0
+
+    @staticmethod
+    def _keyset_condition(after: Optional[Tuple[datetime, str]], alias: str = "") -> Tuple[str, tuple]:
+        if not after:
+            return "", ()
+        created_at, last_id = after
+        column = f"{alias}." if alias else ""
+        value = to_db_datetime(created_at)
+        return (
+            f"AND ({column}created_at < ? OR ({column}created_at = ? AND {column}id < ?))",
+            (value, value, str(last_id))
+        )
+
+    @classmethod
+    def _assemble_illustrated(cls, rows) -> Dict[str, Any]:
+        story = cls._to_story(rows[0])
+        scenarios: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if not row["scenario_id"]:
+                continue
+            scenario_data = scenarios.get(row["scenario_id"])
+            if scenario_data is None:
+                scenario_data = Scenario(
+                    id=UUID(row["scenario_id"]),
+                    story_id=story.id,
+                    description=row["scenario_description"],
+                    sequence_number=row["scenario_sequence_number"],
+                    prompt_for_image=row["scenario_prompt_for_image"],
+                    created_at=from_db_datetime(row["scenario_created_at"])
+                ).to_dict()
+                scenario_data["image"] = None
+                scenarios[row["scenario_id"]] = scenario_data
+            if row["image_id"]:
+                scenario_data["image"] = Image(
+                    id=UUID(row["image_id"]),
+                    scenario_id=UUID(row["scenario_id"]),
+                    prompt=row["image_prompt"],
+                    image_url=row["image_url"],
+                    created_at=from_db_datetime(row["image_created_at"])
+                ).to_dict()
+
+        return {"story": story.to_dict(), "scenarios": list(scenarios.values())}
+
+    @staticmethod
+    def _to_story(row) -> Story:
+        return Story(
+            id=UUID(row["id"]),
+            title=row["title"],
+            content=row["content"],
+            context=row["context"],
+            category=row["category"],
+            pedagogical_approach=row["pedagogical_approach"],
+            teacher_id=UUID(row["teacher_id"]) if row["teacher_id"] else None,
+            created_at=from_db_datetime(row["created_at"])
+        )
+
+    @staticmethod
+    def _to_summary(row, extras: Sequence[str], additional: Optional[Dict[str, Any]] = None) -> StorySummary:
+        extra = {name: row[name] for name in extras}
+        extra.update(additional or {})
+        return StorySummary(
+            id=UUID(row["id"]),
+            title=row["title"],
+            category=row["category"],
+            pedagogical_approach=row["pedagogical_approach"],
+            created_at=from_db_datetime(row["created_at"]),
+            cover_image_url=row["cover_image_url"],
+            scenario_count=row["scenario_count"],
+            extra=extra
+        )
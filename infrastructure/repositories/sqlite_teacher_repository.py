@@ -0,0 +1,97 @@
+from typing import List, Optional, Sequence
+from uuid import UUID
+
+from domain.entities.teacher import Teacher
+from domain.interfaces.repositories.teacher_repository import TeacherRepository
+from infrastructure.database.sqlite_connection import SQLiteDatabase, from_db_datetime, to_db_datetime
+from infrastructure.repositories.multi_get import fetch_in_chunks, in_input_order, unique_ids
+
+class SQLiteTeacherRepository(TeacherRepository):
+    """Implementación SQLite del repositorio de profesores (pruebas y benchmarks)."""
+    
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+    
+    def create(self, teacher: Teacher) -> UUID:
+        """Crea un nuevo profesor en la base de datos."""
+        query = """
+        INSERT INTO teachers (id, username, email, password_hash, school, grade, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        values = (
+            str(teacher.id),
+            teacher.username,
+            teacher.email,
+            teacher.password_hash,
+            teacher.school,
+            teacher.grade,
+            to_db_datetime(teacher.created_at)
+        )
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute(query, values)
+        
+        return teacher.id
+    
+    def get_by_id(self, teacher_id: UUID) -> Optional[Teacher]:
+        """Obtiene un profesor por su ID."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM teachers WHERE id = ?", (str(teacher_id),))
+            result = cursor.fetchone()
+        
+        return self._to_teacher(result) if result else None
+    
+    def get_many(self, teacher_ids: Sequence[UUID]) -> List[Teacher]:
+        """Obtiene varios profesores con consultas IN (...) por bloques, en el orden pedido."""
+        ids = unique_ids(teacher_ids)
+        with self.db.get_cursor() as cursor:
+            results = fetch_in_chunks(
+                cursor, "SELECT * FROM teachers WHERE id IN ({placeholders})", [str(i) for i in ids], "?"
+            )
+        return in_input_order(ids, {teacher.id: teacher for teacher in map(self._to_teacher, results)})
+    
+    def get_by_email(self, email: str) -> Optional[Teacher]:
+        """Obtiene un profesor por su email."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT * FROM teachers WHERE email = ?", (email,))
+            result = cursor.fetchone()
+        
+        return self._to_teacher(result) if result else None
+    
+    def update(self, teacher: Teacher) -> bool:
+        """Actualiza un profesor existente."""
+        query = """
+        UPDATE teachers
+        SET username = ?, email = ?, password_hash = ?, school = ?, grade = ?
+        WHERE id = ?
+        """
+        values = (
+            teacher.username,
+            teacher.email,
+            teacher.password_hash,
+            teacher.school,
+            teacher.grade,
+            str(teacher.id)
+        )
+        
+        with self.db.get_cursor() as cursor:
+            cursor.execute(query, values)
+            return cursor.rowcount > 0
+    
+    def delete(self, teacher_id: UUID) -> bool:
+        """Elimina un profesor por su ID (sus cuentos quedan sin profesor)."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM teachers WHERE id = ?", (str(teacher_id),))
+            return cursor.rowcount > 0
+    
+    @staticmethod
+    def _to_teacher(result) -> Teacher:
+        return Teacher(
+            id=UUID(result["id"]),
+            username=result["username"],
+            email=result["email"],
+            password_hash=result["password_hash"],
+            school=result["school"],
+            grade=result["grade"],
+            created_at=from_db_datetime(result["created_at"])
+        )
@@ -0,0 +1,38 @@
+from typing import Optional
+from uuid import UUID
+
+from domain.interfaces.repositories.teacher_stats_repository import TeacherStatsRepository
+from domain.value_objects.teacher_activity_stats import TeacherActivityStats
+from infrastructure.database.sqlite_connection import SQLiteDatabase, from_db_datetime
+
+class SQLiteTeacherStatsRepository(TeacherStatsRepository):
+    """
+    Implementación SQLite de las estadísticas de actividad. Sin tabla de
+    acumulados: se calculan al leer recorriendo los cuentos del profesor.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def get_activity(self, teacher_id: UUID) -> TeacherActivityStats:
+        """Calcula las estadísticas de un profesor a partir de sus cuentos."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT category, pedagogical_approach, content, created_at
+                FROM stories WHERE teacher_id = ?
+                """,
+                (str(teacher_id),)
+            )
+            return TeacherActivityStats.from_stories(
+                {**row, "created_at": from_db_datetime(row["created_at"])}
+                for row in map(dict, cursor)
+            )
+
+    def rebuild(self, teacher_id: Optional[UUID] = None) -> int:
+        """No hay acumulados que recalcular; retorna la cantidad de profesores."""
+        if teacher_id:
+            return 1
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS total FROM teachers")
+            return cursor.fetchone()["total"]
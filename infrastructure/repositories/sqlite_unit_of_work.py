@@ -0,0 +1,14 @@
+from typing import ContextManager
+
+from domain.interfaces.repositories.unit_of_work import UnitOfWork
+from infrastructure.database.sqlite_connection import SQLiteDatabase
+
+class SQLiteUnitOfWork(UnitOfWork):
+    """Implementación SQLite de la unidad de trabajo (BEGIN ... COMMIT sobre la conexión compartida)."""
+    
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+    
+    def transaction(self) -> ContextManager[None]:
+        """Abre una transacción sobre la conexión compartida por los repositorios."""
+        return self.db.transaction()
@@ -0,0 +1,23 @@
+import re
+from typing import Optional, Sequence
+
+# Peso de una coincidencia en la descripción de un escenario frente a una en el cuento
+SCENARIO_MATCH_WEIGHT = 0.5
+
+
+def match_score(text: Optional[str], terms: Sequence[str]) -> float:
+    """
+    Relevancia de un texto para repositorios sin índices FULLTEXT: cantidad de palabras
+    que empiezan por algún término, o 0 si falta alguno (misma semántica que
+    '+término*' en modo BOOLEAN de MySQL).
+    """
+    if not text or not terms:
+        return 0.0
+    lowered = text.lower()
+    score = 0
+    for term in terms:
+        occurrences = len(re.findall(rf"\b{re.escape(term)}\w*", lowered))
+        if not occurrences:
+            return 0.0
+        score += occurrences
+    return float(score)
@@ -0,0 +1,39 @@
+import logging
+from typing import List, Dict, Any
+
+from domain.interfaces.services.scenario_extractor import AsyncScenarioExtractorService
+from infrastructure.services.gemini_rest_client import GeminiRestClient
+from infrastructure.services.gemini_scenario_extractor import GeminiScenarioExtractor
+
+logger = logging.getLogger(__name__)
+
+class AsyncGeminiScenarioExtractor(GeminiScenarioExtractor, AsyncScenarioExtractorService):
+    """
+    Extractor de escenarios con Gemini para el pipeline asíncrono: mismo prompt y
+    mismo parseo que GeminiScenarioExtractor, con la llamada a la API vía GeminiRestClient.
+    """
+    
+    def __init__(self, client: GeminiRestClient):
+        super().__init__(client.api_key)
+        self.client = client
+    
+    async def extract_scenarios_async(
+        self, 
+        title: str, 
+        content: str, 
+        num_scenarios: int = 6,
+        pedagogical_approach: str = "traditional"
+    ) -> List[Dict[str, Any]]:
+        """
+        Extrae los escenarios clave de un cuento para su ilustración.
+        """
+        prompt = self._build_prompt(title, content, num_scenarios, pedagogical_approach)
+        
+        try:
+            scenarios_text = await self.client.generate_content(self.model_name, prompt)
+            return self._parse_scenarios(scenarios_text)
+            
+        except Exception as e:
+            logger.error("Error al extraer escenarios: %s", e)
+            # Retornar una lista vacía en caso de error
+            return []
@@ -0,0 +1,38 @@
+from typing import Dict, Any, Optional
+
+from domain.interfaces.services.story_generator import AsyncStoryGeneratorService
+from infrastructure.services.gemini_rest_client import GeminiRestClient
+from infrastructure.services.gemini_story_generator import GeminiStoryGenerator
+
+class AsyncGeminiStoryGenerator(GeminiStoryGenerator, AsyncStoryGeneratorService):
+    """
+    Generador de cuentos con Gemini para el pipeline asíncrono: mismo prompt y
+    mismo parseo que GeminiStoryGenerator, con la llamada a la API vía GeminiRestClient.
+    """
+    
+    def __init__(self, client: GeminiRestClient):
+        super().__init__(client.api_key)
+        self.client = client
+    
+    async def generate_story_async(
+        self, 
+        context: str, 
+        category: str,
+        pedagogical_approach: str = "traditional",
+        target_age: Optional[str] = None,
+        max_length: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Genera un cuento basado en el contexto y la categoría proporcionados.
+        """
+        prompt = self._build_prompt(context, category, pedagogical_approach, target_age, max_length)
+        
+        try:
+            content = await self.client.generate_content(self.model_name, prompt)
+            return self._parse_story(content)
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
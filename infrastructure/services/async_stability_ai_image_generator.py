@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+from domain.interfaces.services.image_generator import AsyncImageGeneratorService
+from domain.exceptions.domain_exceptions import ImageGenerationException, ExternalServiceException
+from infrastructure.services.stability_ai_image_generator import StabilityAIImageGenerator
+from infrastructure.storage.content_addressed_store import ContentAddressedImageStore
+from infrastructure.storage.preview_image_store import PreviewImageStore
+
+logger = logging.getLogger(__name__)
+
+class AsyncStabilityAIImageGenerator(StabilityAIImageGenerator, AsyncImageGeneratorService):
+    """
+    Generador de imágenes con Stability AI para el pipeline asíncrono. La solicitud
+    a la API usa un httpx.AsyncClient compartido; guardar el archivo (disco y, con
+    MySQL, la fila de image_blobs) es bloqueante y se hace en un hilo del executor.
+    Un semáforo limita las generaciones en curso del proceso (ver ASYNC_IMAGE_CONCURRENCY).
+    """
+    
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        api_key: Optional[str] = None,
+        image_storage_path: Optional[str] = None,
+        image_store: Optional[ContentAddressedImageStore] = None,
+        preview_store: Optional[PreviewImageStore] = None,
+        max_concurrency: int = 16
+    ):
+        super().__init__(api_key, image_storage_path, image_store, preview_store)
+        self.http_client = http_client
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def generate_image_async(
+        self, 
+        prompt: str,
+        pedagogical_approach: str = "traditional",
+        style: str = "children_illustration",
+        width: int = 512,
+        height: int = 512,
+        preview: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Genera una imagen basada en el prompt proporcionado usando la API de Stability AI.
+        Con preview=True la imagen se guarda en el almacenamiento temporal de previews.
+        """
+        logger.info("Iniciando generación de imagen - Enfoque: %s", pedagogical_approach)
+        
+        try:
+            params = self._build_generation_params(prompt, pedagogical_approach, width, height)
+            
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            async with self._semaphore:
+                response = await self._send_generation_request_async(params)
+            
+            return await asyncio.to_thread(
+                self._store_generated_image, response, params["prompt"], pedagogical_approach, preview
+            )
+            
+        except ExternalServiceException as e:
+            logger.error("Error de servicio externo: %s", e)
+            raise e
+        except Exception as e:
+            logger.error("Error general al generar imagen: %s", e)
+            raise ImageGenerationException(f"Error al generar imagen: {str(e)}")
+    
+    async def _send_generation_request_async(self, params: Dict[str, Any]) -> httpx.Response:
+        """Envía solicitud de generación a la API de Stability AI."""
+        headers = {
+            "Accept": "image/*",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+        
+        try:
+            start_time = time.time()
+            
+            response = await self.http_client.post(
+                self.api_base_url,
+                headers=headers,
+                files={key: (None, str(value)) for key, value in params.items()}
+            )
+            
+            elapsed_time = time.time() - start_time
+            logger.info("Respuesta de Stability AI recibida en %.2fs - Status: %s", elapsed_time, response.status_code)
+            
+            if response.is_error:
+                error_message = f"HTTP {response.status_code}: {response.text}"
+                logger.error("Error en respuesta de Stability AI: %s", error_message)
+                raise ExternalServiceException("Stability AI", error_message)
+            
+            return response
+            
+        except httpx.HTTPError as e:
+            logger.error("Error en solicitud HTTP a Stability AI: %s", e)
+            raise ExternalServiceException("Stability AI", str(e))
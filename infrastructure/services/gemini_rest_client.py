@@ -0,0 +1,56 @@
+import logging
+import time
+from typing import Any, Dict
+
+import httpx
+
+from domain.exceptions.domain_exceptions import ExternalServiceException
+
+logger = logging.getLogger(__name__)
+
+GEMINI_API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+class GeminiRestClient:
+    """
+    Cliente asíncrono de la API REST de Gemini (generateContent) sobre un
+    httpx.AsyncClient compartido: cada llamada espera la respuesta sin ocupar un
+    hilo, a diferencia del SDK síncrono google-generativeai.
+    """
+
+    def __init__(self, api_key: str, http_client: httpx.AsyncClient, base_url: str = GEMINI_API_BASE_URL):
+        if not api_key:
+            raise ValueError("Se requiere la clave de API de Gemini")
+        self.api_key = api_key
+        self.http_client = http_client
+        self.base_url = base_url.rstrip('/')
+
+    async def generate_content(self, model_name: str, prompt: str) -> str:
+        """
+        Genera contenido para un prompt de texto y retorna el texto de la respuesta.
+        Lanza ExternalServiceException si la API responde con error o bloquea el prompt.
+        """
+        started = time.time()
+        try:
+            response = await self.http_client.post(
+                f"{self.base_url}/models/{model_name}:generateContent",
+                headers={"x-goog-api-key": self.api_key},
+                json={"contents": [{"parts": [{"text": prompt}]}]}
+            )
+        except httpx.HTTPError as e:
+            raise ExternalServiceException("Gemini", str(e), e)
+
+        logger.info("Respuesta de Gemini recibida en %.2fs - Status: %s", time.time() - started, response.status_code)
+        if response.is_error:
+            raise ExternalServiceException("Gemini", f"HTTP {response.status_code}: {response.text}")
+
+        return self._response_text(response.json())
+
+    @staticmethod
+    def _response_text(payload: Dict[str, Any]) -> str:
+        candidates = payload.get("candidates") or []
+        if not candidates:
+            reason = (payload.get("promptFeedback") or {}).get("blockReason", "sin candidatos")
+            raise ExternalServiceException("Gemini", f"La respuesta no contiene texto ({reason})")
+        parts = (candidates[0].get("content") or {}).get("parts") or []
+        return "".join(part.get("text", "") for part in parts)
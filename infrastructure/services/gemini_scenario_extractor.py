@@ -1,9 +1,12 @@
+import logging
 from typing import List, Dict, Any
 import os
 import google.generativeai as genai
 
 from domain.interfaces.services.scenario_extractor import ScenarioExtractorService
 
+logger = logging.getLogger(__name__)
+
 class GeminiScenarioExtractor(ScenarioExtractorService):
     """Implementación del extractor de escenarios usando Google Gemini."""
     
@@ -14,11 +17,16 @@ class GeminiScenarioExtractor(ScenarioExtractorService):
             raise ValueError("Se requiere la clave de API de Gemini") # en caso de que no se haya proporcionado (esto paso cambiando por momento por que no tenemos un usario clave para la implementacion)
         
         # Configurar la API de Gemini
+        self.api_key = api_key
         genai.configure(api_key=api_key)
         
         # Modelo a utilizar - Gemini 2.0 Flash de Google
         self.model_name = 'gemini-2.0-flash'
     
+    def reset_after_fork(self) -> None:
+        """Hook post-fork: los canales gRPC no sobreviven a un fork; configure() crea clientes nuevos."""
+        genai.configure(api_key=self.api_key)
+    
     def extract_scenarios(
         self, 
         title: str, 
@@ -55,7 +63,7 @@ class GeminiScenarioExtractor(ScenarioExtractorService):
             return scenarios
             
         except Exception as e:
-            print(f"Error al extraer escenarios: {e}")
+            logger.error("Error al extraer escenarios: %s", e)
             # Retornar una lista vacía en caso de error
             return []
     
@@ -13,11 +13,16 @@ class GeminiStoryGenerator(StoryGeneratorService):
             raise ValueError("Se requiere la clave de API de Gemini")
         
         # Configurar la API de Gemini
+        self.api_key = api_key
         genai.configure(api_key=api_key)
         
         # Modelo a utilizar
         self.model_name = 'gemini-2.0-flash'
     
+    def reset_after_fork(self) -> None:
+        """Hook post-fork: los canales gRPC no sobreviven a un fork; configure() crea clientes nuevos."""
+        genai.configure(api_key=self.api_key)
+    
     def generate_story(
         self, 
         context: str, 
@@ -44,23 +49,7 @@ class GeminiStoryGenerator(StoryGeneratorService):
             response = model.generate_content(prompt)
             
             # Procesar la respuesta
-            content = response.text
-            
-            # Extraer título y contenido
-            lines = content.strip().split('\n')
-            title = lines[0].strip()
-            
-            # Eliminar caracteres especiales del título como "#" si está formateado en Markdown
-            title = title.lstrip('#').strip()
-            
-            # El resto es el contenido
-            story_content = '\n'.join(lines[1:]).strip()
-            
-            return {
-                "success": True,
-                "title": title,
-                "content": story_content
-            }
+            return self._parse_story(response.text)
             
         except Exception as e:
             return {
@@ -68,6 +57,26 @@ class GeminiStoryGenerator(StoryGeneratorService):
                 "error": str(e)
             }
     
+    def _parse_story(self, content: str) -> Dict[str, Any]:
+        """
+        Separa la respuesta del modelo en título (primera línea) y contenido.
+        """
+        # Extraer título y contenido
+        lines = content.strip().split('\n')
+        title = lines[0].strip()
+        
+        # Eliminar caracteres especiales del título como "#" si está formateado en Markdown
+        title = title.lstrip('#').strip()
+        
+        # El resto es el contenido
+        story_content = '\n'.join(lines[1:]).strip()
+        
+        return {
+            "success": True,
+            "title": title,
+            "content": story_content
+        }
+    
     def _build_prompt(
         self, 
         context: str, 
@@ -4,12 +4,13 @@ import json
 import time
 from PIL import Image
 from typing import Dict, Any, Optional, Tuple
-import uuid
 import dotenv
 import logging
 
 from domain.interfaces.services.image_generator import ImageGeneratorService
 from domain.exceptions.domain_exceptions import ImageGenerationException, ExternalServiceException
+from infrastructure.storage.content_addressed_store import ContentAddressedImageStore
+from infrastructure.storage.preview_image_store import PreviewImageStore
 
 # Configurar logger para este módulo
 logger = logging.getLogger(__name__)
@@ -17,7 +18,13 @@ logger = logging.getLogger(__name__)
 class StabilityAIImageGenerator(ImageGeneratorService):
     """Implementación del generador de imágenes usando la API de Stability AI."""
     
-    def __init__(self, api_key: Optional[str] = None, image_storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        image_storage_path: Optional[str] = None,
+        image_store: Optional[ContentAddressedImageStore] = None,
+        preview_store: Optional[PreviewImageStore] = None
+    ):
         # Cargar variables de entorno
         dotenv.load_dotenv()
         
@@ -27,7 +34,7 @@ class StabilityAIImageGenerator(ImageGeneratorService):
             logger.error("No se encontró la clave API de Stability AI")
             raise ValueError("Se requiere clave API de Stability AI. Configúrela en STABILITY_API_KEY.")
         
-        logger.info(f"API key de Stability configurada: {self.api_key[:5]}...")
+        logger.info("API key de Stability configurada: %s...", self.api_key[:5])
         
         # Configurar el directorio de almacenamiento de imágenes
         self.image_storage_path = image_storage_path or os.path.abspath(
@@ -36,9 +43,15 @@ class StabilityAIImageGenerator(ImageGeneratorService):
         
         # Crear directorio si no existe
         if not os.path.exists(self.image_storage_path):
-            logger.info(f"Creando directorio de imágenes: {self.image_storage_path}")
+            logger.info("Creando directorio de imágenes: %s", self.image_storage_path)
             os.makedirs(self.image_storage_path, exist_ok=True)
         
+        # Almacén direccionado por contenido: imágenes idénticas comparten archivo
+        self.image_store = image_store or ContentAddressedImageStore(self.image_storage_path)
+        
+        # Almacenamiento temporal de previews (si no se configura, van al permanente)
+        self.preview_store = preview_store
+        
         # URL base de la API
         self.api_base_url = "https://api.stability.ai/v2beta/stable-image/generate/core"
         logger.info("StabilityAIImageGenerator inicializado correctamente")
@@ -49,71 +62,96 @@ class StabilityAIImageGenerator(ImageGeneratorService):
         pedagogical_approach: str = "traditional",
         style: str = "children_illustration",
         width: int = 512,
-        height: int = 512
+        height: int = 512,
+        preview: bool = False
     ) -> Dict[str, Any]:
         """
         Genera una imagen basada en el prompt proporcionado usando la API de Stability AI.
+        Con preview=True la imagen se guarda en el almacenamiento temporal de previews.
         """
-        logger.info(f"Iniciando generación de imagen - Enfoque: {pedagogical_approach}")
+        logger.info("Iniciando generación de imagen - Enfoque: %s", pedagogical_approach)
         
         try:
-            # Aplicar estilo pedagógico
-            enhanced_prompt, negative_prompt, style_preset = self._apply_pedagogical_style(
-                prompt, pedagogical_approach
-            )
-            
-            # Determinar relación de aspecto
-            aspect_ratio = self._get_aspect_ratio(width, height)
-            
-            # Configurar parámetros para la API
-            params = {
-                "prompt": enhanced_prompt,
-                "negative_prompt": negative_prompt,
-                "aspect_ratio": aspect_ratio,
-                "seed": 0,
-                "style_preset": style_preset,
-                "output_format": "png"
-            }
+            params = self._build_generation_params(prompt, pedagogical_approach, width, height)
             
             # Realizar solicitud a la API
             response = self._send_generation_request(params)
             
-            # Verificar filtro de contenido
-            finish_reason = response.headers.get("finish-reason")
-            if finish_reason == 'CONTENT_FILTERED':
-                logger.warning("La generación no pasó el filtro de contenido de Stability AI")
-                return {
-                    "success": False,
-                    "error": "La generación no pasó el filtro de contenido de Stability AI"
-                }
-            
-            # Obtener semilla y guardar imagen
-            seed = response.headers.get("seed", "unknown")
-            filename = f"{uuid.uuid4()}.png"
-            filepath = os.path.join(self.image_storage_path, filename)
-            
-            with open(filepath, "wb") as f:
-                f.write(response.content)
-            
-            relative_path = f"/static/images/{filename}"
-            
-            logger.info(f"Imagen generada exitosamente - Seed: {seed}")
-            
-            return {
-                "success": True,
-                "image_url": relative_path,
-                "prompt": enhanced_prompt,
-                "pedagogical_approach": pedagogical_approach,
-                "seed": seed
-            }
+            return self._store_generated_image(response, params["prompt"], pedagogical_approach, preview)
             
         except ExternalServiceException as e:
-            logger.error(f"Error de servicio externo: {str(e)}")
+            logger.error("Error de servicio externo: %s", e)
             raise e
         except Exception as e:
-            logger.error(f"Error general al generar imagen: {str(e)}")
+            logger.error("Error general al generar imagen: %s", e)
             raise ImageGenerationException(f"Error al generar imagen: {str(e)}")
     
+    def _build_generation_params(
+        self,
+        prompt: str,
+        pedagogical_approach: str,
+        width: int,
+        height: int
+    ) -> Dict[str, Any]:
+        """Parámetros de la API: prompt con el estilo pedagógico aplicado y relación de aspecto."""
+        # Aplicar estilo pedagógico
+        enhanced_prompt, negative_prompt, style_preset = self._apply_pedagogical_style(
+            prompt, pedagogical_approach
+        )
+        
+        # Determinar relación de aspecto
+        aspect_ratio = self._get_aspect_ratio(width, height)
+        
+        return {
+            "prompt": enhanced_prompt,
+            "negative_prompt": negative_prompt,
+            "aspect_ratio": aspect_ratio,
+            "seed": 0,
+            "style_preset": style_preset,
+            "output_format": "png"
+        }
+    
+    def _store_generated_image(
+        self,
+        response,
+        enhanced_prompt: str,
+        pedagogical_approach: str,
+        preview: bool
+    ) -> Dict[str, Any]:
+        """
+        Guarda la imagen de una respuesta de la API (requests o httpx) en el almacén
+        permanente o en el de previews, salvo que el filtro de contenido la haya bloqueado.
+        """
+        # Verificar filtro de contenido
+        finish_reason = response.headers.get("finish-reason")
+        if finish_reason == 'CONTENT_FILTERED':
+            logger.warning("La generación no pasó el filtro de contenido de Stability AI")
+            return {
+                "success": False,
+                "error": "La generación no pasó el filtro de contenido de Stability AI"
+            }
+        
+        # Obtener semilla y guardar imagen (sha256 del contenido como nombre)
+        seed = response.headers.get("seed", "unknown")
+        store = self.preview_store if preview and self.preview_store else self.image_store
+        relative_path = store.save(response.content, extension="png")
+        
+        logger.info("Imagen generada exitosamente - Seed: %s", seed)
+        
+        return {
+            "success": True,
+            "image_url": relative_path,
+            "prompt": enhanced_prompt,
+            "pedagogical_approach": pedagogical_approach,
+            "seed": seed
+        }
+    
+    def promote_preview(self, image_url: str) -> str:
+        """Promueve una imagen de preview al almacén permanente (enlace, sin copia)."""
+        if not self.preview_store:
+            return image_url
+        return self.preview_store.promote(image_url, self.image_store)
+    
     def _apply_pedagogical_style(
         self, 
         prompt: str, 
@@ -173,17 +211,17 @@ class StabilityAIImageGenerator(ImageGeneratorService):
             )
             
             elapsed_time = time.time() - start_time
-            logger.info(f"Respuesta de Stability AI recibida en {elapsed_time:.2f}s - Status: {response.status_code}")
+            logger.info("Respuesta de Stability AI recibida en %.2fs - Status: %s", elapsed_time, response.status_code)
             
             if not response.ok:
                 error_message = f"HTTP {response.status_code}: {response.text}"
-                logger.error(f"Error en respuesta de Stability AI: {error_message}")
+                logger.error("Error en respuesta de Stability AI: %s", error_message)
                 raise ExternalServiceException("Stability AI", error_message)
             
             return response
             
         except requests.RequestException as e:
-            logger.error(f"Error en solicitud HTTP a Stability AI: {str(e)}")
+            logger.error("Error en solicitud HTTP a Stability AI: %s", e)
             raise ExternalServiceException("Stability AI", str(e))
     
     def _get_aspect_ratio(self, width: int, height: int) -> str:
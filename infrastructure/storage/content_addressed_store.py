@@ -0,0 +1,233 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from infrastructure.database.connection import DatabaseConnection
+from infrastructure.storage.storage_layout import StorageLayout
+
+logger = logging.getLogger(__name__)
+
+# Nombre de archivo direccionado por contenido: <sha256>.<extensión>
+_BLOB_FILENAME = re.compile(r'^([0-9a-f]{64})\.([a-z0-9]+)$')
+
+
+def blob_hash_from_url(image_url: Optional[str]) -> Optional[str]:
+    """
+    Extrae el hash sha256 de una URL de imagen direccionada por contenido.
+    Retorna None para URLs antiguas (uuid4.png) que no pertenecen al almacén.
+    """
+    if not image_url:
+        return None
+    match = _BLOB_FILENAME.match(image_url.rsplit('/', 1)[-1])
+    return match.group(1) if match else None
+
+
+def add_references(cursor, image_urls: Iterable[str], delta: int) -> None:
+    """
+    Ajusta el conteo de referencias de los blobs usados por las URLs dadas.
+    Se ejecuta con el cursor del repositorio para quedar en la misma transacción
+    que el INSERT/UPDATE/DELETE de la tabla images.
+    """
+    counts = Counter(
+        blob_hash for blob_hash in (blob_hash_from_url(url) for url in image_urls) if blob_hash
+    )
+    if not counts:
+        return
+    cursor.executemany(
+        "UPDATE image_blobs SET ref_count = GREATEST(ref_count + %s, 0) WHERE hash = %s",
+        [(delta * count, blob_hash) for blob_hash, count in counts.items()]
+    )
+
+
+class ContentAddressedImageStore:
+    """
+    Almacén de imágenes direccionado por contenido.
+
+    Cada archivo se guarda como <sha256>.<ext> dentro de los subdirectorios que
+    indique la distribución configurada (por defecto ab/cd/abcd...png, tomados del
+    propio hash), de modo que bytes idénticos comparten un
+    único archivo. La tabla image_blobs lleva el conteo de referencias desde la
+    tabla images; los blobs sin referencias los recupera reclaim(), que ejecuta
+    cada pasada de ImageGarbageCollector (programada o por CLI).
+    Con track_blobs=False (repositorios SQLite o en memoria) no se usa image_blobs
+    y los archivos solo los recupera el recolector de archivos huérfanos.
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        url_prefix: str = "/static/images",
+        grace_seconds: int = 3600,
+        layout: Optional[StorageLayout] = None,
+        track_blobs: bool = True
+    ):
+        self.storage_path = storage_path
+        self.url_prefix = url_prefix.rstrip('/')
+        self.grace_seconds = grace_seconds
+        self.layout = layout or StorageLayout()
+        self.track_blobs = track_blobs
+        self.db = DatabaseConnection() if track_blobs else None
+        os.makedirs(self.storage_path, exist_ok=True)
+
+    def save(self, data: bytes, extension: str = "png") -> str:
+        """
+        Guarda los bytes de una imagen y retorna su URL relativa.
+        Si el contenido ya existe no se vuelve a escribir.
+        """
+        blob_hash = hashlib.sha256(data).hexdigest()
+        extension = extension.lower().lstrip('.')
+
+        # Registrar (o refrescar) el blob antes de escribir: reclaim() respeta
+        # last_seen_at, así que un blob recién visto nunca se borra bajo nuestros pies.
+        self._register_blob(blob_hash, extension, len(data))
+
+        relative_path = self.relative_path(blob_hash, extension)
+        filepath = os.path.join(self.storage_path, relative_path)
+
+        if os.path.exists(filepath):
+            # Refrescar mtime para que el GC de archivos respete el periodo de gracia
+            os.utime(filepath)
+            logger.info("Imagen deduplicada: %s", blob_hash)
+        else:
+            self._write_atomically(filepath, data)
+
+        return f"{self.url_prefix}/{relative_path}"
+
+    def adopt(self, source_path: str, blob_hash: str, extension: str = "png") -> str:
+        """
+        Incorpora al almacén un archivo ya escrito en disco (p. ej. un preview)
+        enlazándolo en su ruta definitiva, y retorna su URL relativa.
+        """
+        extension = extension.lower().lstrip('.')
+        self._register_blob(blob_hash, extension, os.path.getsize(source_path))
+
+        relative_path = self.relative_path(blob_hash, extension)
+        filepath = os.path.join(self.storage_path, relative_path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        try:
+            os.link(source_path, filepath)
+        except FileExistsError:
+            os.utime(filepath)
+        except OSError as e:
+            # Distinto sistema de archivos o enlaces no soportados: última opción
+            logger.warning("No se pudo enlazar %s (%s); se copiará el archivo", source_path, e)
+            with open(source_path, "rb") as f:
+                self._write_atomically(filepath, f.read())
+
+        return f"{self.url_prefix}/{relative_path}"
+
+    def relative_path(self, blob_hash: str, extension: str = "png") -> str:
+        """Ruta relativa (según la distribución configurada) de un blob."""
+        return self.layout.relative_path(f"{blob_hash}.{extension}")
+
+    def path_for_url(self, image_url: str) -> Optional[str]:
+        """Ruta absoluta en disco de una URL del almacén, o None si no le pertenece."""
+        blob_hash = blob_hash_from_url(image_url)
+        if not blob_hash:
+            return None
+        extension = image_url.rsplit('.', 1)[-1].lower()
+        return os.path.join(self.storage_path, self.relative_path(blob_hash, extension))
+
+    def reclaim(self, batch_size: int = 500) -> Dict[str, int]:
+        """
+        Elimina los blobs sin referencias cuyo último uso supera el periodo de gracia.
+
+        Cada blob se bloquea (SELECT ... FOR UPDATE) y se verifica contra la tabla
+        images antes de borrar el archivo, dentro de la misma transacción. Si aparece
+        una referencia no contabilizada, se corrige el conteo en lugar de borrar.
+        """
+        reclaimed_files = 0
+        reclaimed_bytes = 0
+        repaired = 0
+        if not self.track_blobs:
+            return {"reclaimed_files": 0, "reclaimed_bytes": 0, "repaired_counts": 0}
+
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT hash FROM image_blobs
+                WHERE ref_count = 0 AND last_seen_at < NOW() - INTERVAL %s SECOND
+                LIMIT %s
+                """,
+                (self.grace_seconds, batch_size)
+            )
+            candidates = [row["hash"] for row in cursor.fetchall()]
+
+        for blob_hash in candidates:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT hash, extension, size_bytes FROM image_blobs
+                    WHERE hash = %s AND ref_count = 0
+                      AND last_seen_at < NOW() - INTERVAL %s SECOND
+                    FOR UPDATE
+                    """,
+                    (blob_hash, self.grace_seconds)
+                )
+                blob = cursor.fetchone()
+                if not blob:
+                    continue
+
+                relative_path = self.relative_path(blob["hash"], blob["extension"])
+                cursor.execute(
+                    "SELECT COUNT(*) AS refs FROM images WHERE image_url = %s",
+                    (f"{self.url_prefix}/{relative_path}",)
+                )
+                refs = cursor.fetchone()["refs"]
+                if refs:
+                    cursor.execute(
+                        "UPDATE image_blobs SET ref_count = %s WHERE hash = %s",
+                        (refs, blob_hash)
+                    )
+                    repaired += 1
+                    continue
+
+                cursor.execute("DELETE FROM image_blobs WHERE hash = %s", (blob_hash,))
+                try:
+                    os.remove(os.path.join(self.storage_path, relative_path))
+                    reclaimed_bytes += blob["size_bytes"]
+                except FileNotFoundError:
+                    pass
+                reclaimed_files += 1
+
+        logger.info(
+            "Blobs recuperados: %s (%s bytes), conteos reparados: %s", reclaimed_files, reclaimed_bytes, repaired
+        )
+        return {
+            "reclaimed_files": reclaimed_files,
+            "reclaimed_bytes": reclaimed_bytes,
+            "repaired_counts": repaired
+        }
+
+    def _register_blob(self, blob_hash: str, extension: str, size_bytes: int) -> None:
+        """Crea la fila del blob o refresca su last_seen_at si ya existe."""
+        if not self.track_blobs:
+            return
+        with self.db.get_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO image_blobs (hash, extension, size_bytes, ref_count, created_at, last_seen_at)
+                VALUES (%s, %s, %s, 0, NOW(), NOW())
+                ON DUPLICATE KEY UPDATE last_seen_at = NOW()
+                """,
+                (blob_hash, extension, size_bytes)
+            )
+
+    def _write_atomically(self, filepath: str, data: bytes) -> None:
+        """Escribe en un archivo temporal y lo renombra para no exponer archivos a medias."""
+        directory = os.path.dirname(filepath)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,222 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from infrastructure.database.connection import DatabaseConnection
+from infrastructure.storage.content_addressed_store import ContentAddressedImageStore, blob_hash_from_url
+from infrastructure.storage.storage_layout import StorageLayout, iter_files
+
+logger = logging.getLogger(__name__)
+
+
+class ImageGarbageCollector:
+    """
+    Recolector de basura para los archivos de imagen del disco.
+
+    Recorre el directorio de imágenes de forma incremental (os.scandir) y compara
+    los archivos por lotes contra images.image_url, sin cargar nunca el listado
+    completo en memoria. Elimina los archivos sin referencias cuya última
+    modificación supera el periodo de gracia. Con blob_store, cada pasada también
+    recupera los blobs del almacén direccionado por contenido que image_blobs
+    marca sin referencias (ContentAddressedImageStore.reclaim).
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        url_prefix: str = "/static/images",
+        grace_seconds: int = 86400,
+        batch_size: int = 500,
+        dry_run: bool = False,
+        blob_store: Optional[ContentAddressedImageStore] = None
+    ):
+        self.storage_path = storage_path
+        self.url_prefix = url_prefix.rstrip('/')
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.blob_store = blob_store
+        self.db = DatabaseConnection()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def collect(self) -> Dict[str, int]:
+        """
+        Ejecuta una pasada completa del recolector.
+
+        Returns:
+            Resumen con archivos revisados, eliminados, bytes recuperados y errores.
+        """
+        started = time.time()
+        cutoff = started - self.grace_seconds
+        report = {
+            "scanned_files": 0,
+            "deleted_files": 0,
+            "reclaimed_bytes": 0,
+            "reclaimed_blobs": 0,
+            "repaired_counts": 0,
+            "errors": 0
+        }
+
+        batch = []
+        for relative_path, entry in iter_files(self.storage_path):
+            report["scanned_files"] += 1
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            # Los archivos recientes pueden pertenecer a un preview o a un guardado en curso
+            if stat.st_mtime >= cutoff:
+                continue
+            batch.append((relative_path, entry.path, stat.st_size))
+            if len(batch) >= self.batch_size:
+                self._collect_batch(batch, report)
+                batch = []
+
+        if batch:
+            self._collect_batch(batch, report)
+
+        if self.blob_store is not None and not self.dry_run:
+            self._reclaim_blobs(report)
+
+        report["elapsed_ms"] = int((time.time() - started) * 1000)
+        logger.info(
+            "GC de imágenes: %s archivos y %s blobs eliminados, %s bytes recuperados de %s revisados%s",
+            report['deleted_files'], report['reclaimed_blobs'], report['reclaimed_bytes'], report['scanned_files'],
+            ' (dry-run)' if self.dry_run else ''
+        )
+        return report
+
+    def start_schedule(self, interval_seconds: int) -> None:
+        """Ejecuta collect() periódicamente en un hilo daemon."""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop_event.wait(interval_seconds):
+                try:
+                    self.collect()
+                except Exception as e:
+                    logger.error("Error en GC programado de imágenes: %s", e)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=run, name="image-gc", daemon=True)
+        self._thread.start()
+        logger.info("GC de imágenes programado cada %ss", interval_seconds)
+
+    def stop_schedule(self) -> None:
+        """Detiene la ejecución periódica."""
+        self._stop_event.set()
+
+    def _reclaim_blobs(self, report: Dict[str, int]) -> None:
+        """Recupera por lotes los blobs con ref_count = 0 hasta que un lote no llegue lleno."""
+        while True:
+            reclaimed = self.blob_store.reclaim(self.batch_size)
+            report["reclaimed_blobs"] += reclaimed["reclaimed_files"]
+            report["reclaimed_bytes"] += reclaimed["reclaimed_bytes"]
+            report["repaired_counts"] += reclaimed["repaired_counts"]
+            if reclaimed["reclaimed_files"] + reclaimed["repaired_counts"] < self.batch_size:
+                return
+
+    def _collect_batch(self, batch: List[Tuple[str, str, int]], report: Dict[str, int]) -> None:
+        """Elimina los archivos del lote que ninguna fila de images referencia."""
+        urls = [f"{self.url_prefix}/{relative_path}" for relative_path, _, _ in batch]
+        # Durante una migración de distribución un archivo ya movido puede seguir
+        # referenciado por su URL plana antigua: ambas cuentan como referencia.
+        legacy_urls = [f"{self.url_prefix}/{os.path.basename(relative_path)}" for relative_path, _, _ in batch]
+        hashes = [blob_hash for blob_hash in (blob_hash_from_url(url) for url in urls) if blob_hash]
+
+        with self.db.get_cursor() as cursor:
+            lookup = list(set(urls) | set(legacy_urls))
+            placeholders = ", ".join(["%s"] * len(lookup))
+            cursor.execute(
+                f"SELECT image_url FROM images WHERE image_url IN ({placeholders})",
+                lookup
+            )
+            referenced = {row["image_url"] for row in cursor.fetchall()}
+
+            # Blobs con referencias o vistos dentro del periodo de gracia (p. ej. un
+            # preview que reutiliza un archivo existente) se conservan.
+            protected = set()
+            if hashes:
+                placeholders = ", ".join(["%s"] * len(hashes))
+                cursor.execute(
+                    f"""
+                    SELECT hash FROM image_blobs
+                    WHERE hash IN ({placeholders})
+                      AND (ref_count > 0 OR last_seen_at >= NOW() - INTERVAL %s SECOND)
+                    """,
+                    hashes + [self.grace_seconds]
+                )
+                protected = {row["hash"] for row in cursor.fetchall()}
+
+        deleted_hashes = []
+        for (relative_path, path, size), url, legacy_url in zip(batch, urls, legacy_urls):
+            blob_hash = blob_hash_from_url(url)
+            if url in referenced or legacy_url in referenced or blob_hash in protected:
+                continue
+            if self.dry_run:
+                report["deleted_files"] += 1
+                report["reclaimed_bytes"] += size
+                continue
+            try:
+                os.remove(path)
+                report["deleted_files"] += 1
+                report["reclaimed_bytes"] += size
+                if blob_hash:
+                    deleted_hashes.append(blob_hash)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                report["errors"] += 1
+                logger.error("No se pudo eliminar %s: %s", relative_path, e)
+
+        if deleted_hashes:
+            placeholders = ", ".join(["%s"] * len(deleted_hashes))
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM image_blobs WHERE hash IN ({placeholders}) AND ref_count = 0",
+                    deleted_hashes
+                )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m infrastructure.storage.image_garbage_collector"""
+    from config import (
+        IMAGE_STORAGE_PATH, IMAGE_GC_GRACE_SECONDS, IMAGE_BLOB_GRACE_SECONDS, IMAGE_STORAGE_LAYOUT,
+        IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH
+    )
+
+    parser = argparse.ArgumentParser(description="Elimina imágenes huérfanas del disco")
+    parser.add_argument("--path", default=IMAGE_STORAGE_PATH, help="Directorio de imágenes")
+    parser.add_argument("--grace-seconds", type=int, default=IMAGE_GC_GRACE_SECONDS,
+                        help="Antigüedad mínima de un archivo para poder eliminarlo")
+    parser.add_argument("--batch-size", type=int, default=500, help="Archivos por consulta a la BD")
+    parser.add_argument("--blob-grace-seconds", type=int, default=IMAGE_BLOB_GRACE_SECONDS,
+                        help="Tiempo desde el último uso de un blob sin referencias para poder eliminarlo")
+    parser.add_argument("--skip-blobs", action="store_true",
+                        help="No recuperar los blobs sin referencias de image_blobs")
+    parser.add_argument("--dry-run", action="store_true", help="Solo reportar, sin eliminar")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    collector = ImageGarbageCollector(
+        storage_path=args.path,
+        grace_seconds=args.grace_seconds,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        blob_store=None if args.skip_blobs else ContentAddressedImageStore(
+            args.path, grace_seconds=args.blob_grace_seconds,
+            layout=StorageLayout.from_config(IMAGE_STORAGE_LAYOUT, IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH)
+        )
+    )
+    print(json.dumps(collector.collect(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
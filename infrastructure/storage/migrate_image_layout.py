@@ -0,0 +1,139 @@
+import argparse
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from infrastructure.database.connection import DatabaseConnection
+from infrastructure.storage.storage_layout import StorageLayout, iter_files
+
+logger = logging.getLogger(__name__)
+
+
+class ImageLayoutMigration:
+    """
+    Migra los archivos de imagen existentes a la distribución configurada.
+
+    Fase 1: mueve cada archivo a su ruta según la distribución (os.replace, atómico
+    dentro del mismo sistema de archivos), recorriendo el directorio en streaming.
+    Fase 2: reescribe images.image_url por lotes, paginando por id.
+
+    Ambas fases son idempotentes, así que la migración puede interrumpirse y
+    relanzarse. Mientras tanto, la capa de compatibilidad de StorageLayout.resolve()
+    sigue sirviendo las URLs antiguas.
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        layout: StorageLayout,
+        url_prefix: str = "/static/images",
+        batch_size: int = 500,
+        dry_run: bool = False
+    ):
+        self.storage_path = storage_path
+        self.layout = layout
+        self.url_prefix = url_prefix.rstrip('/')
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.db = DatabaseConnection()
+
+    def run(self) -> Dict[str, int]:
+        """Ejecuta ambas fases y retorna un resumen."""
+        report = {"moved_files": 0, "skipped_files": 0, "updated_rows": 0}
+        self.move_files(report)
+        self.rewrite_urls(report)
+        logger.info(
+            "Migración de distribución: %s archivos movidos, %s filas actualizadas%s",
+            report['moved_files'], report['updated_rows'], ' (dry-run)' if self.dry_run else ''
+        )
+        return report
+
+    def move_files(self, report: Dict[str, int]) -> None:
+        """Fase 1: mueve los archivos a su ubicación según la distribución."""
+        for relative_path, entry in iter_files(self.storage_path):
+            if relative_path.endswith('.tmp'):
+                continue
+            target = self.layout.relative_path(relative_path)
+            if target == relative_path:
+                report["skipped_files"] += 1
+                continue
+
+            report["moved_files"] += 1
+            if self.dry_run:
+                continue
+
+            target_path = os.path.join(self.storage_path, target)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            os.replace(entry.path, target_path)
+
+        if not self.dry_run:
+            self._remove_empty_dirs()
+
+    def rewrite_urls(self, report: Dict[str, int]) -> None:
+        """Fase 2: reescribe images.image_url por lotes de batch_size filas."""
+        last_id = ""
+        prefix = f"{self.url_prefix}/"
+        while True:
+            with self.db.get_cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, image_url FROM images WHERE id > %s ORDER BY id LIMIT %s",
+                    (last_id, self.batch_size)
+                )
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1]["id"]
+
+            updates = []
+            for row in rows:
+                image_url = row["image_url"]
+                if not image_url or not image_url.startswith(prefix):
+                    continue
+                current = image_url[len(prefix):]
+                target = self.layout.relative_path(current)
+                if target != current:
+                    updates.append((f"{prefix}{target}", row["id"]))
+
+            report["updated_rows"] += len(updates)
+            if updates and not self.dry_run:
+                with self.db.get_cursor() as cursor:
+                    cursor.executemany("UPDATE images SET image_url = %s WHERE id = %s", updates)
+
+    def _remove_empty_dirs(self) -> None:
+        """Elimina los subdirectorios que hayan quedado vacíos tras mover archivos."""
+        for dirpath, _, _ in os.walk(self.storage_path, topdown=False):
+            if dirpath == self.storage_path:
+                continue
+            try:
+                os.rmdir(dirpath)
+            except OSError:
+                pass
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m infrastructure.storage.migrate_image_layout"""
+    from config import IMAGE_STORAGE_PATH, IMAGE_STORAGE_LAYOUT, IMAGE_SHARD_DEPTH, IMAGE_SHARD_WIDTH
+
+    parser = argparse.ArgumentParser(description="Migra static/images a la distribución configurada")
+    parser.add_argument("--path", default=IMAGE_STORAGE_PATH, help="Directorio de imágenes")
+    parser.add_argument("--layout", default=IMAGE_STORAGE_LAYOUT, choices=["flat", "sharded"])
+    parser.add_argument("--depth", type=int, default=IMAGE_SHARD_DEPTH, help="Niveles de subdirectorios")
+    parser.add_argument("--width", type=int, default=IMAGE_SHARD_WIDTH, help="Caracteres por nivel")
+    parser.add_argument("--batch-size", type=int, default=500, help="Filas por lote de actualización")
+    parser.add_argument("--dry-run", action="store_true", help="Solo reportar, sin mover ni actualizar")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    migration = ImageLayoutMigration(
+        storage_path=args.path,
+        layout=StorageLayout.from_config(args.layout, args.depth, args.width),
+        batch_size=args.batch_size,
+        dry_run=args.dry_run
+    )
+    print(json.dumps(migration.run(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
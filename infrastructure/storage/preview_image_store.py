@@ -0,0 +1,157 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from infrastructure.storage.content_addressed_store import ContentAddressedImageStore, blob_hash_from_url
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewImageStore:
+    """
+    Almacenamiento temporal para las imágenes de preview.
+
+    Los previews se escriben en un directorio propio, separado del almacenamiento
+    permanente, con un TTL y un tamaño máximo: al superarse, se eliminan primero los
+    archivos más antiguos. Al guardar un preview en la biblioteca, sus imágenes se
+    promueven al almacén permanente con un enlace duro (sin copiar bytes).
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        url_prefix: str = "/static/previews",
+        ttl_seconds: int = 86400,
+        max_bytes: int = 1073741824,
+        eviction_interval_seconds: int = 60
+    ):
+        self.storage_path = storage_path
+        self.url_prefix = url_prefix.rstrip('/')
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.eviction_interval_seconds = eviction_interval_seconds
+        self._last_eviction = 0.0
+        self._eviction_lock = threading.Lock()
+        os.makedirs(self.storage_path, exist_ok=True)
+
+    def reset_after_fork(self) -> None:
+        """Hook post-fork: recrea el lock de evicción, que pudo copiarse tomado."""
+        self._eviction_lock = threading.Lock()
+
+    def save(self, data: bytes, extension: str = "png") -> str:
+        """Guarda una imagen de preview y retorna su URL relativa."""
+        blob_hash = hashlib.sha256(data).hexdigest()
+        filename = f"{blob_hash}.{extension.lower().lstrip('.')}"
+        filepath = os.path.join(self.storage_path, filename)
+
+        if os.path.exists(filepath):
+            os.utime(filepath)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=self.storage_path, suffix='.tmp')
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, filepath)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        self._maybe_evict()
+        return f"{self.url_prefix}/{filename}"
+
+    def is_preview_url(self, image_url: Optional[str]) -> bool:
+        """Indica si una URL apunta al almacenamiento de previews."""
+        return bool(image_url) and image_url.startswith(f"{self.url_prefix}/")
+
+    def promote(self, image_url: str, image_store: ContentAddressedImageStore) -> str:
+        """
+        Mueve una imagen de preview al almacén permanente y retorna la nueva URL.
+
+        Usa un enlace duro, por lo que la operación es atómica y no copia bytes; el
+        nombre de preview sigue siendo válido hasta que expire. URLs que no sean de
+        preview se retornan sin cambios.
+        """
+        if not self.is_preview_url(image_url):
+            return image_url
+
+        blob_hash = blob_hash_from_url(image_url)
+        filename = image_url.rsplit('/', 1)[-1]
+        source_path = os.path.join(self.storage_path, filename)
+        if not blob_hash or not os.path.exists(source_path):
+            raise FileNotFoundError(f"La imagen de preview ya no existe: {image_url}")
+
+        extension = filename.rsplit('.', 1)[-1]
+        return image_store.adopt(source_path, blob_hash, extension)
+
+    def evict(self) -> Dict[str, int]:
+        """
+        Elimina previews expirados y, si el directorio supera max_bytes,
+        los más antiguos hasta volver al límite.
+        """
+        now = time.time()
+        cutoff = now - self.ttl_seconds
+        survivors = []
+        total_bytes = 0
+        evicted_files = 0
+        evicted_bytes = 0
+
+        with os.scandir(self.storage_path) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime < cutoff:
+                    if self._remove(entry.path):
+                        evicted_files += 1
+                        evicted_bytes += stat.st_size
+                    continue
+                survivors.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        if total_bytes > self.max_bytes:
+            survivors.sort()
+            for _, size, path in survivors:
+                if total_bytes <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    evicted_files += 1
+                    evicted_bytes += size
+                total_bytes -= size
+
+        if evicted_files:
+            logger.info("Previews eliminados: %s (%s bytes)", evicted_files, evicted_bytes)
+        return {
+            "evicted_files": evicted_files,
+            "evicted_bytes": evicted_bytes,
+            "remaining_bytes": total_bytes
+        }
+
+    def _maybe_evict(self) -> None:
+        """Ejecuta evict() como máximo una vez por intervalo y sin bloquear otras escrituras."""
+        if time.time() - self._last_eviction < self.eviction_interval_seconds:
+            return
+        if not self._eviction_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_eviction = time.time()
+            self.evict()
+        except Exception as e:
+            logger.error("Error al limpiar previews: %s", e)
+        finally:
+            self._eviction_lock.release()
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
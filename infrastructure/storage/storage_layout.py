@@ -0,0 +1,80 @@
+import hashlib
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+_HEX_DIGEST = re.compile(r'^[0-9a-f]{64}$')
+
+
+def iter_files(root: str) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Recorre recursivamente un directorio produciendo (ruta relativa, entrada)
+    sin construir el listado completo en memoria.
+    """
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        try:
+            with os.scandir(os.path.join(root, relative_dir)) as entries:
+                for entry in entries:
+                    relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(relative_path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield relative_path, entry
+        except FileNotFoundError:
+            continue
+
+
+class StorageLayout:
+    """
+    Distribución de archivos de imagen en disco.
+
+    Con depth > 0 cada archivo se ubica bajo subdirectorios tomados del prefijo de
+    un hash (ab/cd/archivo.png): el propio sha256 para archivos direccionados por
+    contenido, o el sha256 del nombre para archivos antiguos (uuid4.png). Con
+    depth = 0 el directorio es plano.
+    """
+
+    def __init__(self, depth: int = 2, width: int = 2):
+        if depth < 0 or width <= 0 or depth * width > 64:
+            raise ValueError("Configuración de subdirectorios no válida")
+        self.depth = depth
+        self.width = width
+
+    @classmethod
+    def from_config(cls, layout: str, depth: int, width: int) -> 'StorageLayout':
+        """Construye la distribución a partir de IMAGE_STORAGE_LAYOUT ('flat' o 'sharded')."""
+        if layout == "flat":
+            return cls(depth=0, width=width)
+        if layout == "sharded":
+            return cls(depth=depth, width=width)
+        raise ValueError(f"Distribución de almacenamiento desconocida: {layout}")
+
+    def relative_path(self, filename: str) -> str:
+        """Ruta relativa donde debe vivir un archivo según esta distribución."""
+        filename = os.path.basename(filename)
+        if not self.depth:
+            return filename
+
+        stem = filename.split('.', 1)[0].lower()
+        key = stem if _HEX_DIGEST.match(stem) else hashlib.sha256(stem.encode('utf-8')).hexdigest()
+        shards = [key[i * self.width:(i + 1) * self.width] for i in range(self.depth)]
+        return "/".join(shards + [filename])
+
+    def resolve(self, root: str, requested_path: str) -> Optional[str]:
+        """
+        Resuelve la ruta relativa existente para una ruta solicitada.
+
+        Capa de compatibilidad: una URL antigua (plana, o de otra distribución) se
+        busca también en la ubicación que le corresponde con la distribución actual.
+        """
+        normalized = os.path.normpath(requested_path)
+        if os.path.isabs(normalized) or normalized.startswith('..'):
+            return None
+
+        candidates = [normalized, self.relative_path(normalized), os.path.basename(normalized)]
+        for candidate in candidates:
+            if os.path.isfile(os.path.join(root, candidate)):
+                return candidate
+        return None
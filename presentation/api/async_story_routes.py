@@ -0,0 +1,114 @@
+import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic import ValidationError
+
+from application.dtos.request_dtos import GenerateStoryRequest
+from application.services.async_illustration_orchestrator import AsyncIllustrationOrchestratorService
+
+# Rutas que el servidor ASGI atiende con el pipeline asíncrono en lugar de Flask:
+# (método, ruta) -> handler(data) que retorna (respuesta, código HTTP)
+AsyncHandler = Callable[[Dict[str, Any]], Awaitable[Tuple[Dict[str, Any], int]]]
+async_story_routes: Dict[Tuple[str, str], AsyncHandler] = {}
+
+PEDAGOGICAL_APPROACHES = ['montessori', 'waldorf', 'traditional']
+
+# La inyección de dependencias se realizará en asgi.py
+async_illustration_orchestrator: Optional[AsyncIllustrationOrchestratorService] = None
+
+def init_routes(async_orchestrator: AsyncIllustrationOrchestratorService):
+    """Inicializa el orquestador asíncrono que usan las rutas."""
+    global async_illustration_orchestrator
+    async_illustration_orchestrator = async_orchestrator
+
+def route(path: str, method: str = 'POST'):
+    """Registra un handler asíncrono para (método, ruta)."""
+    def register(handler: AsyncHandler) -> AsyncHandler:
+        async_story_routes[(method, path)] = handler
+        return handler
+    return register
+
+@route('/generate-illustrated-story')
+async def generate_illustrated_story(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    Versión asíncrona de POST /api/generate-illustrated-story (guarda en BD).
+    """
+    story_request, error = _parse_generate_request(data)
+    if error:
+        return error
+
+    result = await async_illustration_orchestrator.create_illustrated_story(story_request, save_to_db=True)
+
+    if not result.get('success', False):
+        return {
+            'success': False,
+            'error': result.get('error', 'Error al generar el cuento ilustrado'),
+            'step': result.get('step', 'unknown')
+        }, 500
+
+    return result, 200
+
+@route('/preview-illustrated-story')
+async def preview_illustrated_story(data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """
+    Versión asíncrona de POST /api/preview-illustrated-story (no guarda en BD).
+    """
+    story_request, error = _parse_generate_request(data)
+    if error:
+        return error
+
+    result = await async_illustration_orchestrator.create_illustrated_story(story_request, save_to_db=False)
+
+    if not result.get('success', False):
+        return {
+            'success': False,
+            'error': result.get('error', 'Error al generar el cuento preview'),
+            'step': result.get('step', 'unknown')
+        }, 500
+
+    # Agregar metadata específica del preview
+    result['preview_info'] = {
+        'generated_at': datetime.datetime.now().isoformat(),
+        'is_preview': True,
+        'can_save': True,  # Indicar que este contenido puede ser guardado posteriormente
+        'expires_info': 'Este preview es temporal. Guárdalo en tu biblioteca para conservarlo.'
+    }
+
+    return result, 200
+
+def _parse_generate_request(
+    data: Optional[Dict[str, Any]]
+) -> Tuple[Optional[GenerateStoryRequest], Optional[Tuple[Dict[str, Any], int]]]:
+    """
+    Valida el cuerpo de una petición de generación con las mismas reglas que las
+    rutas Flask. Retorna el DTO o la respuesta de error.
+    """
+    if not data:
+        return None, ({'success': False, 'error': 'No se recibieron datos JSON'}, 400)
+
+    for field in ('context', 'category'):
+        if field not in data:
+            return None, ({'success': False, 'error': f'Se requiere el campo {field}'}, 400)
+
+    pedagogical_approach = data.get('pedagogical_approach', 'traditional')
+    if pedagogical_approach not in PEDAGOGICAL_APPROACHES:
+        return None, ({
+            'success': False,
+            'error': 'Enfoque pedagógico no válido. Opciones: montessori, waldorf, traditional'
+        }, 400)
+
+    if not async_illustration_orchestrator:
+        return None, ({'success': False, 'error': 'Servicio orquestador no inicializado'}, 500)
+
+    try:
+        return GenerateStoryRequest(
+            context=data['context'],
+            category=data['category'],
+            pedagogical_approach=pedagogical_approach,
+            teacher_id=data.get('teacher_id'),
+            target_age=data.get('target_age'),
+            max_length=data.get('max_length'),
+            num_illustrations=data.get('num_illustrations', 6)
+        ), None
+    except ValidationError as dto_error:
+        return None, ({'success': False, 'error': f'Error al crear DTO: {str(dto_error)}'}, 400)
@@ -2,16 +2,16 @@ from flask import Blueprint, request, jsonify
 import json
 
 from application.services.auth_service import AuthenticationService
+from presentation.api.route_services import bind_route_services, route_service
 
 auth_routes = Blueprint('auth_routes', __name__)
 
 
-auth_service = None
+auth_service = route_service('auth_routes', 'auth_service')
 
-def init_routes(auth_svc):
-    """Inicializa los servicios necesarios para las rutas."""
-    global auth_service
-    auth_service = auth_svc
+def init_routes(app, auth_svc):
+    """Inicializa los servicios necesarios para las rutas de la aplicación."""
+    bind_route_services(app, 'auth_routes', auth_service=auth_svc)
 
 @auth_routes.route('/login', methods=['POST'])
 def login():
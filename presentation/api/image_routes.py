@@ -1,4 +1,5 @@
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, request, jsonify
+import logging
 import os
 import uuid
 
@@ -8,21 +9,25 @@ from application.services.scenario_service import ScenarioService
 from application.services.story_service import StoryService
 from domain.entities.story import Story
 from domain.exceptions.domain_exceptions import DomainException
+from presentation.api.static_routes import serve_stored_image
+from presentation.api.route_services import bind_route_services, route_service
+
+logger = logging.getLogger(__name__)
 
 image_routes = Blueprint('image_routes', __name__)
 
-image_service = None
-image_storage_path = None
-story_service = None
-scenario_service = None
+image_service = route_service('image_routes', 'image_service')
+story_service = route_service('image_routes', 'story_service')
+scenario_service = route_service('image_routes', 'scenario_service')
 
-def init_routes(image_svc, storage_path, story_svc=None, scenario_svc=None):
-    """Inicializa los servicios necesarios para las rutas."""
-    global image_service, image_storage_path, story_service, scenario_service
-    image_service = image_svc
-    image_storage_path = storage_path
-    story_service = story_svc
-    scenario_service = scenario_svc
+def init_routes(app, image_svc, story_svc=None, scenario_svc=None):
+    """Inicializa los servicios necesarios para las rutas de la aplicación."""
+    bind_route_services(
+        app, 'image_routes',
+        image_service=image_svc,
+        story_service=story_svc,
+        scenario_service=scenario_svc
+    )
 
 @image_routes.route('/generate-image', methods=['POST'])
 def generate_image():
@@ -71,7 +76,7 @@ def generate_scenarios_and_images(story_id):
     Extrae escenarios y genera imágenes para un cuento existente.
     """
     try:
-        print(f"\n====== GENERANDO ESCENARIOS E IMÁGENES PARA CUENTO {story_id} ======")
+        logger.info("Generando escenarios e imágenes para el cuento %s", story_id)
         
         # Verificar que los servicios necesarios estén disponibles
         if not story_service or not scenario_service:
@@ -88,9 +93,6 @@ def generate_scenarios_and_images(story_id):
                 'error': f'Cuento con ID {story_id} no encontrado'
             }), 404
         
-        print(f"Cuento encontrado: {story_data['title']}")
-        print(f"Enfoque pedagógico: {story_data.get('pedagogical_approach', 'traditional')}")
-        
         # Crear entidad Story
         from domain.entities.story import Story
         story = Story.from_dict(story_data)
@@ -102,14 +104,13 @@ def generate_scenarios_and_images(story_id):
             else:
                 data = {}
         except Exception as e:
-            print(f"Error al procesar JSON: {e}")
+            logger.warning("Error al procesar JSON: %s", e)
             data = {}
             
         num_scenarios = int(data.get('num_scenarios', 4))
-        print(f"Número de escenarios a generar: {num_scenarios}")
         
         # Extraer escenarios
-        print(f"Extrayendo {num_scenarios} escenarios...")
+        logger.debug("Extrayendo %d escenarios", num_scenarios)
         
         # Aquí verificamos si el método acepta pedagogical_approach
         try:
@@ -118,9 +119,7 @@ def generate_scenarios_and_images(story_id):
                 num_scenarios=num_scenarios
             )
         except Exception as e:
-            print(f"Error al extraer escenarios: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error al extraer escenarios: %s", e)
             return jsonify({
                 'success': False,
                 'error': f'Error al extraer escenarios: {str(e)}'
@@ -132,14 +131,13 @@ def generate_scenarios_and_images(story_id):
                 'error': 'No se pudieron extraer escenarios del cuento'
             }), 500
         
-        print(f"Se extrajeron {len(scenarios)} escenarios")
+        logger.debug("Se extrajeron %d escenarios", len(scenarios))
         
         # Generar imágenes para cada escenario
         images = []
         for idx, scenario in enumerate(scenarios):
-            print(f"\nGenerando imagen {idx+1}/{len(scenarios)} para escenario {scenario['id']}")
             prompt = scenario.get('prompt_for_image', '')
-            print(f"Prompt: {prompt[:100]}...")
+            logger.debug("Generando imagen %d/%d para escenario %s", idx + 1, len(scenarios), scenario['id'])
             
             image_request = GenerateImageRequest(
                 prompt=prompt,
@@ -153,14 +151,11 @@ def generate_scenarios_and_images(story_id):
                 )
                 
                 if result.get('success', False):
-                    print(f"Imagen generada correctamente: {result.get('image_url')}")
                     images.append(result["image"])
                 else:
-                    print(f"Error al generar imagen: {result.get('error')}")
+                    logger.warning("Error al generar imagen: %s", result.get('error'))
             except Exception as e:
-                print(f"Excepción al generar imagen: {str(e)}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Excepción al generar imagen: %s", e)
         
         # Preparar respuesta
         return jsonify({
@@ -172,9 +167,7 @@ def generate_scenarios_and_images(story_id):
         }), 200
         
     except Exception as e:
-        print(f"ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al generar escenarios e imágenes: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -228,12 +221,7 @@ def get_story_images(story_id):
 @image_routes.route('/static/images/<path:filename>')
 def serve_image(filename):
     """
-    Sirve una imagen estática desde el sistema de archivos.
+    Sirve una imagen estática desde el sistema de archivos. Los 404 y los 416 de
+    rangos no satisfacibles se propagan tal cual (ver handle_exception en app.py).
     """
-    try:
-        return send_from_directory(image_storage_path, filename)
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Error al cargar la imagen: {str(e)}'
-        }), 404
\ No newline at end of file
+    return serve_stored_image(filename)
\ No newline at end of file
@@ -7,14 +7,14 @@ from application.dtos.profile_dtos import UpdateProfileRequest, ChangePasswordRe
 from presentation.middleware.auth_middleware import auth_required
 from presentation.middleware.error_handler import error_handler
 from presentation.middleware.request_validator import validate_request
+from presentation.api.route_services import bind_route_services, route_service
 
 profile_routes = Blueprint('profile_routes', __name__)
 
-profile_service = None
+profile_service = route_service('profile_routes', 'profile_service')
 
-def init_routes(profile_svc):
-    global profile_service
-    profile_service = profile_svc
+def init_routes(app, profile_svc):
+    bind_route_services(app, 'profile_routes', profile_service=profile_svc)
 
 
 @profile_routes.route('/profile', methods=['GET'])
@@ -199,27 +199,15 @@ def get_profile_stats(teacher_id: str):
         period = request.args.get('period', 'month')
         include_charts = request.args.get('include_charts', 'false').lower() == 'true'
         
-        stats = {
-            "stories_by_month": {"2024-11": 3, "2024-12": 5, "2025-01": 2},
-            "stories_by_category": {"Aventura": 4, "Ciencia": 3, "Fantasía": 3},
-            "stories_by_approach": {"traditional": 6, "montessori": 3, "waldorf": 1},
-            "average_story_length": 450.5,
-            "most_active_day": "Miércoles"
-        }
-        
-        if include_charts:
-            stats["chart_data"] = {
-                "monthly_activity": [
-                    {"month": "Nov", "stories": 3},
-                    {"month": "Dic", "stories": 5}, 
-                    {"month": "Ene", "stories": 2}
-                ],
-                "category_distribution": [
-                    {"category": "Aventura", "count": 4, "percentage": 40},
-                    {"category": "Ciencia", "count": 3, "percentage": 30},
-                    {"category": "Fantasía", "count": 3, "percentage": 30}
-                ]
-            }
+        result = profile_service.get_profile_stats(teacher_id, include_charts)
+        
+        if not result.get("success", False):
+            return jsonify({
+                'success': False,
+                'error': result.get("error", "Error al obtener estadísticas")
+            }), 404 if "no encontrado" in result.get("error", "").lower() else 500
+        
+        stats = result["stats"]
         
         return jsonify({
             'success': True,
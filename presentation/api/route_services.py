@@ -0,0 +1,29 @@
+from typing import Any, Dict
+
+from flask import Flask, current_app
+from werkzeug.local import LocalProxy
+
+# Clave en app.extensions con los servicios de cada módulo de rutas
+EXTENSION_NAME = "tiyc_routes"
+
+
+def bind_route_services(app: Flask, module: str, **services: Any) -> None:
+    """
+    Guarda en app.extensions los servicios que usa un módulo de rutas. Cada
+    aplicación de create_app tiene los suyos, así que crear otra (por ejemplo en
+    los tests, con otro REPOSITORY_BACKEND) no cambia los de las anteriores.
+    """
+    app.extensions.setdefault(EXTENSION_NAME, {})[module] = services
+
+
+def route_services(module: str) -> Dict[str, Any]:
+    """Servicios de un módulo de rutas en la aplicación en curso (current_app)."""
+    return current_app.extensions[EXTENSION_NAME][module]
+
+
+def route_service(module: str, name: str) -> LocalProxy:
+    """
+    Proxy al servicio name del módulo en la aplicación en curso: las vistas lo
+    usan como antes usaban la variable global del módulo.
+    """
+    return LocalProxy(lambda: route_services(module)[name])
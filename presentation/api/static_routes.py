@@ -0,0 +1,86 @@
+import mimetypes
+from urllib.parse import quote
+
+from flask import Blueprint, Response, abort, send_from_directory
+from werkzeug.security import safe_join
+
+from infrastructure.storage.content_addressed_store import blob_hash_from_url
+from presentation.api.route_services import bind_route_services, route_services
+
+static_routes = Blueprint('static_routes', __name__)
+
+# Un año: el máximo recomendado para recursos inmutables
+IMMUTABLE_MAX_AGE = 31536000
+
+def init_routes(app, image_path, preview_path, layout=None, mode="flask", internal_prefix="/_protected",
+                legacy_cache_seconds=86400, preview_cache_seconds=86400):
+    """
+    Inicializa la configuración de la aplicación para servir imágenes.
+
+    mode:
+        - "flask": Flask/Werkzeug envía el archivo (con soporte de rangos y peticiones condicionales).
+        - "x-accel": se responde con X-Accel-Redirect y nginx envía el archivo.
+        - "x-sendfile": se responde con X-Sendfile (Apache mod_xsendfile, lighttpd).
+          Requiere app.config['USE_X_SENDFILE'] = True.
+    """
+    if mode not in ("flask", "x-accel", "x-sendfile"):
+        raise ValueError(f"Modo de servicio de imágenes no válido: {mode}")
+    bind_route_services(
+        app, 'static_routes',
+        image_storage_path=image_path,
+        preview_storage_path=preview_path,
+        storage_layout=layout,
+        serving_mode=mode,
+        accel_prefix=internal_prefix.rstrip('/'),
+        legacy_max_age=legacy_cache_seconds,
+        preview_max_age=preview_cache_seconds
+    )
+
+def send_image_file(root, filename, internal_location, max_age, immutable=False):
+    """
+    Construye la respuesta para un archivo de imagen según el modo configurado.
+    En los modos de proxy el worker de Python nunca lee ni transmite los bytes.
+    """
+    if safe_join(root, filename) is None:
+        abort(404)
+
+    settings = route_services('static_routes')
+    if settings['serving_mode'] == "x-accel":
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = Response(status=200, mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = quote(f"{settings['accel_prefix']}/{internal_location}/{filename}")
+    else:
+        # En modo "x-sendfile" Flask emite X-Sendfile por USE_X_SENDFILE; en modo
+        # "flask" Werkzeug atiende Range, If-None-Match e If-Modified-Since.
+        response = send_from_directory(root, filename, max_age=max_age, conditional=True)
+
+    cache_control = f"public, max-age={max_age}"
+    if immutable:
+        cache_control += ", immutable"
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+def serve_stored_image(filename):
+    """Sirve una imagen del almacenamiento permanente (resolviendo URLs antiguas)."""
+    settings = route_services('static_routes')
+    image_storage_path = settings['image_storage_path']
+    resolved = filename
+    if settings['storage_layout']:
+        resolved = settings['storage_layout'].resolve(image_storage_path, filename)
+        if not resolved:
+            abort(404)
+
+    # Las URLs direccionadas por contenido nunca cambian de bytes
+    if blob_hash_from_url(resolved):
+        return send_image_file(image_storage_path, resolved, "images", IMMUTABLE_MAX_AGE, immutable=True)
+    return send_image_file(image_storage_path, resolved, "images", settings['legacy_max_age'])
+
+@static_routes.route('/static/images/<path:filename>')
+def serve_image(filename):
+    return serve_stored_image(filename)
+
+@static_routes.route('/static/previews/<path:filename>')
+def serve_preview_image(filename):
+    # Los previews son inmutables mientras existan, pero expiran con su TTL
+    settings = route_services('static_routes')
+    return send_image_file(settings['preview_storage_path'], filename, "previews", settings['preview_max_age'])
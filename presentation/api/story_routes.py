@@ -2,7 +2,7 @@ from flask import Blueprint, request, jsonify
 from typing import Dict, Any
 import json
 import datetime
-import traceback
+import logging
 from uuid import UUID
 
 from application.services.story_service import StoryService
@@ -14,22 +14,31 @@ from domain.exceptions.domain_exceptions import DomainException
 from domain.entities.story import Story
 from domain.entities.scenario import Scenario
 from domain.entities.image import Image
+from presentation.middleware.auth_middleware import auth_required
+from presentation.api.route_services import bind_route_services, route_service
+
+logger = logging.getLogger(__name__)
 
 story_routes = Blueprint('story_routes', __name__)
 
-# La inyección de dependencias se realizará en el archivo principal
-story_service = None
-scenario_service = None
-image_service = None
-illustration_orchestrator_service = None
+# Máximo de cuentos por petición en /illustrated-stories/batch
+MAX_BATCH_STORIES = 50
+
+# La inyección de dependencias se realiza en create_app (servicios por aplicación)
+story_service = route_service('story_routes', 'story_service')
+scenario_service = route_service('story_routes', 'scenario_service')
+image_service = route_service('story_routes', 'image_service')
+illustration_orchestrator_service = route_service('story_routes', 'illustration_orchestrator_service')
 
-def init_routes(story_svc, illustration_orchestrator_svc, scenario_svc=None, image_svc=None):
-    """Inicializa los servicios necesarios para las rutas."""
-    global story_service, illustration_orchestrator_service, scenario_service, image_service
-    story_service = story_svc
-    illustration_orchestrator_service = illustration_orchestrator_svc
-    scenario_service = scenario_svc
-    image_service = image_svc
+def init_routes(app, story_svc, illustration_orchestrator_svc, scenario_svc=None, image_svc=None):
+    """Inicializa los servicios necesarios para las rutas de la aplicación."""
+    bind_route_services(
+        app, 'story_routes',
+        story_service=story_svc,
+        illustration_orchestrator_service=illustration_orchestrator_svc,
+        scenario_service=scenario_svc,
+        image_service=image_svc
+    )
 
 @story_routes.route('/generate-illustrated-story', methods=['POST'])
 def generate_illustrated_story():
@@ -38,52 +47,44 @@ def generate_illustrated_story():
     GUARDA EN BASE DE DATOS - Este es el flujo original.
     """
     try:
-        # Log inicial
-        print("------ INICIO DE GENERACIÓN DE CUENTO ILUSTRADO (CON GUARDADO) ------")
-        print(f"Timestamp: {datetime.datetime.now().isoformat()}")
-        
-        # Log de datos recibidos
-        print("Recibiendo solicitud POST...")
+        logger.info("Inicio de generación de cuento ilustrado (con guardado)")
         data = request.json
-        print(f"Datos recibidos: {json.dumps(data, indent=2, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Datos recibidos: %s", json.dumps(data, ensure_ascii=False))
         
         # Validar los datos de entrada
-        print("Validando datos de entrada...")
         if not data:
-            print("ERROR: No se recibieron datos JSON")
+            logger.warning("Generación rechazada: no se recibieron datos JSON")
             return jsonify({
                 'success': False,
                 'error': 'No se recibieron datos JSON'
             }), 400
             
         if 'context' not in data:
-            print("ERROR: Falta el campo 'context'")
+            logger.warning("Generación rechazada: falta el campo 'context'")
             return jsonify({
                 'success': False,
                 'error': 'Se requiere el campo context'
             }), 400
             
         if 'category' not in data:
-            print("ERROR: Falta el campo 'category'")
+            logger.warning("Generación rechazada: falta el campo 'category'")
             return jsonify({
                 'success': False,
                 'error': 'Se requiere el campo category'
             }), 400
         
         # Validar el enfoque pedagógico
-        print("Validando enfoque pedagógico...")
         pedagogical_approach = data.get('pedagogical_approach', 'traditional')
-        print(f"Enfoque pedagógico recibido: {pedagogical_approach}")
         
         if pedagogical_approach not in ['montessori', 'waldorf', 'traditional']:
-            print(f"ERROR: Enfoque pedagógico no válido: {pedagogical_approach}")
+            logger.warning("Generación rechazada: enfoque pedagógico no válido: %s", pedagogical_approach)
             return jsonify({
                 'success': False,
                 'error': 'Enfoque pedagógico no válido. Opciones: montessori, waldorf, traditional'
             }), 400
         
         # Crear el DTO de solicitud
-        print("Creando DTO de solicitud...")
         try:
             story_request = GenerateStoryRequest(
                 context=data['context'],
@@ -94,25 +95,17 @@ def generate_illustrated_story():
                 max_length=data.get('max_length'),
                 num_illustrations=data.get('num_illustrations', 6)
             )
-            print(f"DTO creado correctamente")
         except Exception as dto_error:
-            print(f"ERROR al crear DTO: {str(dto_error)}")
-            import traceback
-            print("Traceback de error en DTO:")
-            traceback.print_exc()
+            logger.warning("Generación rechazada: error al crear DTO: %s", dto_error)
             return jsonify({
                 'success': False,
                 'error': f'Error al crear DTO: {str(dto_error)}'
             }), 400
         
         # Usar illustration_orchestrator_service con save_to_db=True (comportamiento original)
-        print("Llamando al orquestador de ilustraciones (CON GUARDADO)...")
         try:
-            # Verificar si el servicio está inicializado
-            print(f"¿illustration_orchestrator_service inicializado? {illustration_orchestrator_service is not None}")
-            
             if not illustration_orchestrator_service:
-                print("ERROR: illustration_orchestrator_service no inicializado")
+                logger.error("illustration_orchestrator_service no inicializado")
                 return jsonify({
                     'success': False,
                     'error': 'Servicio orquestador no inicializado'
@@ -123,24 +116,29 @@ def generate_illustrated_story():
                 request=story_request, 
                 save_to_db=True  # ⭐ COMPORTAMIENTO ORIGINAL: GUARDAR EN BD
             )
-            print(f"Resultado de generación: {json.dumps(result, indent=2, ensure_ascii=False)}")
+            # El resultado completo ocupa varios KB: solo se serializa en DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resultado de generación: %s", json.dumps(result, ensure_ascii=False))
             
             if not result.get('success', False):
-                print(f"ERROR reportado por orquestador: {result.get('error', 'Error desconocido')}")
+                logger.error(
+                    "Error reportado por orquestador: %s", result.get('error', 'Error desconocido'),
+                    extra={'step': result.get('step', 'unknown')}
+                )
                 return jsonify({
                     'success': False,
                     'error': result.get('error', 'Error al generar el cuento ilustrado'),
                     'step': result.get('step', 'unknown')
                 }), 500
             
-            print("------ ÉXITO EN GENERACIÓN DE CUENTO ILUSTRADO (GUARDADO) ------")
+            logger.info(
+                "Cuento ilustrado generado y guardado con %d escenarios y %d imágenes",
+                len(result.get('scenarios', [])), len(result.get('images', []))
+            )
             return jsonify(result), 200
             
         except Exception as service_error:
-            print(f"ERROR al llamar al orquestrador: {str(service_error)}")
-            import traceback
-            print("Traceback de error en orquestador:")
-            traceback.print_exc()
+            logger.exception("Error al llamar al orquestador: %s", service_error)
             return jsonify({
                 'success': False,
                 'error': f'Error en orquestador: {str(service_error)}'
@@ -148,14 +146,8 @@ def generate_illustrated_story():
         
     except Exception as e:
         # Capturar y registrar cualquier excepción no manejada
-        print(f"ERROR GENERAL NO MANEJADO: {str(e)}")
-        import traceback
-        print("Traceback completo:")
-        traceback.print_exc()
-        
-        # Incluir información sobre el tipo de excepción
         error_type = type(e).__name__
-        print(f"Tipo de excepción: {error_type}")
+        logger.exception("Error general no manejado (%s): %s", error_type, e)
         
         return jsonify({
             'success': False,
@@ -176,53 +168,44 @@ def preview_illustrated_story():
     pueden generar múltiples versiones y solo guardar la que más les guste.
     """
     try:
-        # Log inicial con indicador de PREVIEW
-        print("------ INICIO DE GENERACIÓN DE CUENTO ILUSTRADO (PREVIEW MODE) ------")
-        print(f"Timestamp: {datetime.datetime.now().isoformat()}")
-        print("⭐ MODO PREVIEW: No se guardará en base de datos")
-        
-        # Log de datos recibidos
-        print("Recibiendo solicitud POST para preview...")
+        logger.info("Inicio de generación de cuento ilustrado (modo preview, sin guardado)")
         data = request.json
-        print(f"Datos recibidos: {json.dumps(data, indent=2, ensure_ascii=False)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Datos recibidos: %s", json.dumps(data, ensure_ascii=False))
         
         # Validar los datos de entrada (misma validación que el endpoint original)
-        print("Validando datos de entrada...")
         if not data:
-            print("ERROR: No se recibieron datos JSON")
+            logger.warning("Preview rechazado: no se recibieron datos JSON")
             return jsonify({
                 'success': False,
                 'error': 'No se recibieron datos JSON'
             }), 400
             
         if 'context' not in data:
-            print("ERROR: Falta el campo 'context'")
+            logger.warning("Preview rechazado: falta el campo 'context'")
             return jsonify({
                 'success': False,
                 'error': 'Se requiere el campo context'
             }), 400
             
         if 'category' not in data:
-            print("ERROR: Falta el campo 'category'")
+            logger.warning("Preview rechazado: falta el campo 'category'")
             return jsonify({
                 'success': False,
                 'error': 'Se requiere el campo category'
             }), 400
         
         # Validar el enfoque pedagógico
-        print("Validando enfoque pedagógico...")
         pedagogical_approach = data.get('pedagogical_approach', 'traditional')
-        print(f"Enfoque pedagógico recibido: {pedagogical_approach}")
         
         if pedagogical_approach not in ['montessori', 'waldorf', 'traditional']:
-            print(f"ERROR: Enfoque pedagógico no válido: {pedagogical_approach}")
+            logger.warning("Preview rechazado: enfoque pedagógico no válido: %s", pedagogical_approach)
             return jsonify({
                 'success': False,
                 'error': 'Enfoque pedagógico no válido. Opciones: montessori, waldorf, traditional'
             }), 400
         
         # Crear el DTO de solicitud (idéntico al endpoint original)
-        print("Creando DTO de solicitud para preview...")
         try:
             story_request = GenerateStoryRequest(
                 context=data['context'],
@@ -233,25 +216,17 @@ def preview_illustrated_story():
                 max_length=data.get('max_length'),
                 num_illustrations=data.get('num_illustrations', 6)
             )
-            print(f"DTO creado correctamente para preview")
         except Exception as dto_error:
-            print(f"ERROR al crear DTO: {str(dto_error)}")
-            import traceback
-            print("Traceback de error en DTO:")
-            traceback.print_exc()
+            logger.warning("Preview rechazado: error al crear DTO: %s", dto_error)
             return jsonify({
                 'success': False,
                 'error': f'Error al crear DTO: {str(dto_error)}'
             }), 400
         
         # ⭐ DIFERENCIA CLAVE: Usar save_to_db=False para modo preview
-        print("Llamando al orquestador de ilustraciones (MODO PREVIEW)...")
         try:
-            # Verificar si el servicio está inicializado
-            print(f"¿illustration_orchestrator_service inicializado? {illustration_orchestrator_service is not None}")
-            
             if not illustration_orchestrator_service:
-                print("ERROR: illustration_orchestrator_service no inicializado")
+                logger.error("illustration_orchestrator_service no inicializado")
                 return jsonify({
                     'success': False,
                     'error': 'Servicio orquestador no inicializado'
@@ -263,10 +238,15 @@ def preview_illustrated_story():
                 save_to_db=False  # ⭐ DIFERENCIA CRÍTICA: NO GUARDAR EN BD
             )
             
-            print(f"Resultado de generación preview: {json.dumps(result, indent=2, ensure_ascii=False)}")
+            # El resultado completo ocupa varios KB: solo se serializa en DEBUG
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resultado de generación preview: %s", json.dumps(result, ensure_ascii=False))
             
             if not result.get('success', False):
-                print(f"ERROR reportado por orquestador en preview: {result.get('error', 'Error desconocido')}")
+                logger.error(
+                    "Error reportado por orquestador en preview: %s", result.get('error', 'Error desconocido'),
+                    extra={'step': result.get('step', 'unknown')}
+                )
                 return jsonify({
                     'success': False,
                     'error': result.get('error', 'Error al generar el cuento preview'),
@@ -281,16 +261,15 @@ def preview_illustrated_story():
                 'expires_info': 'Este preview es temporal. Guárdalo en tu biblioteca para conservarlo.'
             }
             
-            print("------ ÉXITO EN GENERACIÓN DE CUENTO PREVIEW ------")
-            print(f"✅ Preview generado con {len(result.get('scenarios', []))} escenarios y {len(result.get('images', []))} imágenes")
+            logger.info(
+                "Preview generado con %d escenarios y %d imágenes",
+                len(result.get('scenarios', [])), len(result.get('images', []))
+            )
             
             return jsonify(result), 200
             
         except Exception as service_error:
-            print(f"ERROR al llamar al orquestrador en preview: {str(service_error)}")
-            import traceback
-            print("Traceback de error en orquestador preview:")
-            traceback.print_exc()
+            logger.exception("Error al llamar al orquestador en preview: %s", service_error)
             return jsonify({
                 'success': False,
                 'error': f'Error en orquestador preview: {str(service_error)}'
@@ -298,14 +277,8 @@ def preview_illustrated_story():
         
     except Exception as e:
         # Capturar y registrar cualquier excepción no manejada
-        print(f"ERROR GENERAL NO MANEJADO EN PREVIEW: {str(e)}")
-        import traceback
-        print("Traceback completo preview:")
-        traceback.print_exc()
-        
-        # Incluir información sobre el tipo de excepción
         error_type = type(e).__name__
-        print(f"Tipo de excepción en preview: {error_type}")
+        logger.exception("Error general no manejado en preview (%s): %s", error_type, e)
         
         return jsonify({
             'success': False,
@@ -410,25 +383,32 @@ def regenerate_scenario_image(scenario_id):
         }), 200
         
     except Exception as e:
-        print(f"ERROR en regenerate_scenario_image: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error en regenerate_scenario_image: %s", e)
         return jsonify({
             'success': False,
             'error': f'Error al regenerar imagen: {str(e)}'
         }), 500
 
+def _parse_fields(fields_param):
+    """
+    Interpreta el parámetro fields= de los listados (lista separada por comas).
+    Sin él, los listados devuelven solo el resumen de cada cuento.
+    """
+    if not fields_param:
+        return ()
+    return tuple(name.strip() for name in fields_param.split(',') if name.strip())
+
 def _save_preview_to_database(preview_data):
     """
     Función auxiliar que toma datos de preview y los persiste en BD.
-    Reutiliza todos los repositorios existentes.
+    El cuento, sus escenarios y sus imágenes se guardan en una sola transacción.
     """
     try:
         # Acceder a los servicios a través del orquestador
         scenario_svc = illustration_orchestrator_service.scenario_service
         image_svc = illustration_orchestrator_service.image_service
         
-        # 1. Guardar el Story
+        # 1. Construir el Story
         story_data = preview_data['story']
         story = Story(
             title=story_data['title'],
@@ -440,40 +420,41 @@ def _save_preview_to_database(preview_data):
             created_at=datetime.datetime.now()
         )
         
-        story_id = story_service.story_repository.create(story)
-        
-        # 2. Guardar los Scenarios
-        scenarios_data = preview_data['scenarios']
+        # 2. Construir los Scenarios
+        scenarios = []
         scenario_mapping = {}  # mapeo de IDs temporales a IDs reales
         
-        for scenario_data in scenarios_data:
+        for scenario_data in preview_data['scenarios']:
             scenario = Scenario(
-                story_id=story_id,
+                story_id=story.id,
                 description=scenario_data['description'],
                 sequence_number=scenario_data['sequence_number'],
                 prompt_for_image=scenario_data['prompt_for_image'],
                 created_at=datetime.datetime.now()
             )
-            
-            real_scenario_id = scenario_svc.scenario_repository.create(scenario)
-            scenario_mapping[scenario_data['id']] = str(real_scenario_id)
+            scenarios.append(scenario)
+            scenario_mapping[scenario_data['id']] = scenario.id
         
-        # 3. Guardar las Images usando el mapeo de scenario IDs
-        images_data = preview_data.get('images', [])
+        # 3. Construir las Images usando el mapeo de scenario IDs
+        images = []
         
-        for image_data in images_data:
-            temp_scenario_id = image_data['scenario_id']
-            real_scenario_id = scenario_mapping.get(temp_scenario_id)
+        for image_data in preview_data.get('images', []):
+            real_scenario_id = scenario_mapping.get(image_data['scenario_id'])
             
             if real_scenario_id:
-                image = Image(
-                    scenario_id=UUID(real_scenario_id),
+                # Promover la imagen del almacenamiento temporal de previews al permanente
+                # (fuera de la transacción: implica operaciones de archivo)
+                image_url = image_svc.promote_preview_image(image_data['image_url'])
+                
+                images.append(Image(
+                    scenario_id=real_scenario_id,
                     prompt=image_data['prompt'],
-                    image_url=image_data['image_url'],
+                    image_url=image_url,
                     created_at=datetime.datetime.now()
-                )
-                
-                image_svc.image_repository.create(image)
+                ))
+        
+        # 4. Persistir todo con un único commit
+        story_id = illustration_orchestrator_service.save_illustrated_story(story, scenarios, images)
         
         return {
             'success': True,
@@ -493,7 +474,7 @@ def get_story(story_id):
     Obtiene un cuento por su ID.
     """
     try:
-        print(f"📖 Obteniendo cuento: {story_id}")
+        logger.debug("Obteniendo cuento: %s", story_id)
         
         if not story_service:
             return jsonify({
@@ -515,9 +496,7 @@ def get_story(story_id):
         }), 200
         
     except Exception as e:
-        print(f"ERROR al obtener cuento: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al obtener cuento: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -529,7 +508,7 @@ def get_illustrated_story(story_id):
     Obtiene un cuento ilustrado completo por su ID.
     """
     try:
-        print(f"🎨 Obteniendo cuento ilustrado: {story_id}")
+        logger.debug("Obteniendo cuento ilustrado: %s", story_id)
         
         if not illustration_orchestrator_service:
             return jsonify({
@@ -548,9 +527,51 @@ def get_illustrated_story(story_id):
         return jsonify(result), 200
         
     except Exception as e:
-        print(f"ERROR al obtener cuento ilustrado: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al obtener cuento ilustrado: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@story_routes.route('/illustrated-stories/batch', methods=['POST'])
+@auth_required
+def get_illustrated_stories_batch(teacher_id):
+    """
+    Obtiene varios cuentos ilustrados en una sola petición.
+    Recibe {"ids": [...]} y retorna un resultado por id, en el mismo orden, con su
+    estado (ok, not_found, invalid_id o forbidden) en lugar de fallar el lote completo.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        story_ids = data.get('ids')
+        
+        if not isinstance(story_ids, list) or not story_ids or not all(isinstance(i, str) for i in story_ids):
+            return jsonify({
+                'success': False,
+                'error': 'Se requiere ids: una lista de identificadores de cuentos'
+            }), 400
+        
+        if len(story_ids) > MAX_BATCH_STORIES:
+            return jsonify({
+                'success': False,
+                'error': f'Se permiten como máximo {MAX_BATCH_STORIES} cuentos por petición'
+            }), 400
+        
+        if not illustration_orchestrator_service:
+            return jsonify({
+                'success': False,
+                'error': 'Servicio orquestador no inicializado'
+            }), 500
+        
+        results = illustration_orchestrator_service.get_illustrated_stories(story_ids, teacher_id)
+        
+        return jsonify({
+            'success': True,
+            'stories': results
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error al obtener lote de cuentos ilustrados: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -559,10 +580,11 @@ def get_illustrated_story(story_id):
 @story_routes.route('/stories/recent', methods=['GET'])
 def get_recent_stories():
     """
-    Obtiene los cuentos más recientes.
+    Obtiene los cuentos más recientes (resumen de cada cuento).
+    Parámetros: limit, cursor y fields=content,context,teacher_id para incluir más campos.
     """
     try:
-        print("📚 Obteniendo cuentos recientes")
+        logger.debug("Obteniendo cuentos recientes")
         
         if not story_service:
             return jsonify({
@@ -570,18 +592,72 @@ def get_recent_stories():
                 'error': 'Servicio de cuentos no inicializado'
             }), 500
         
-        limit = request.args.get('limit', default=10, type=int)
-        stories = story_service.get_recent_stories(limit)
+        limit = max(1, min(100, request.args.get('limit', default=10, type=int)))
+        cursor = request.args.get('cursor')
+        fields = _parse_fields(request.args.get('fields'))
+        
+        try:
+            page = story_service.get_recent_stories(limit, cursor, fields)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         return jsonify({
             'success': True,
-            'stories': stories
+            'stories': page['stories'],
+            'next_cursor': page['next_cursor']
         }), 200
         
     except Exception as e:
-        print(f"ERROR al obtener cuentos recientes: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al obtener cuentos recientes: %s", e)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@story_routes.route('/stories/search', methods=['GET'])
+def search_stories():
+    """
+    Busca cuentos por texto en título, contenido, contexto y escenarios, por relevancia.
+    Parámetros: q (obligatorio), teacher_id, category, approach, from, to (AAAA-MM-DD),
+    limit y cursor.
+    """
+    try:
+        if not story_service:
+            return jsonify({
+                'success': False,
+                'error': 'Servicio de cuentos no inicializado'
+            }), 500
+        
+        limit = max(1, min(100, request.args.get('limit', default=10, type=int)))
+        
+        try:
+            page = story_service.search_stories(
+                request.args.get('q', ''),
+                limit=limit,
+                cursor=request.args.get('cursor'),
+                teacher_id=request.args.get('teacher_id'),
+                category=request.args.get('category'),
+                pedagogical_approach=request.args.get('approach'),
+                created_from=request.args.get('from'),
+                created_to=request.args.get('to')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'stories': page['stories'],
+            'next_cursor': page['next_cursor']
+        }), 200
+        
+    except Exception as e:
+        logger.exception("Error al buscar cuentos: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -590,10 +666,11 @@ def get_recent_stories():
 @story_routes.route('/stories/teacher/<teacher_id>', methods=['GET'])
 def get_teacher_stories(teacher_id):
     """
-    Obtiene los cuentos creados por un profesor específico.
+    Obtiene los cuentos creados por un profesor específico (resumen de cada cuento).
+    Parámetros: limit, cursor y fields=content,context,teacher_id para incluir más campos.
     """
     try:
-        print(f"👨‍🏫 Obteniendo cuentos del profesor: {teacher_id}")
+        logger.debug("Obteniendo cuentos del profesor: %s", teacher_id)
         
         if not story_service:
             return jsonify({
@@ -601,18 +678,26 @@ def get_teacher_stories(teacher_id):
                 'error': 'Servicio de cuentos no inicializado'
             }), 500
         
-        limit = request.args.get('limit', default=10, type=int)
-        stories = story_service.get_stories_by_teacher(teacher_id, limit)
+        limit = max(1, min(100, request.args.get('limit', default=10, type=int)))
+        cursor = request.args.get('cursor')
+        fields = _parse_fields(request.args.get('fields'))
+        
+        try:
+            page = story_service.get_stories_by_teacher(teacher_id, limit, cursor, fields)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         return jsonify({
             'success': True,
-            'stories': stories
+            'stories': page['stories'],
+            'next_cursor': page['next_cursor']
         }), 200
         
     except Exception as e:
-        print(f"ERROR al obtener cuentos del profesor: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error al obtener cuentos del profesor: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1,9 +1,11 @@
 from functools import wraps
-import traceback
-from flask import request, jsonify
+import logging
+from flask import current_app, request, jsonify
 
 from application.services.auth_service import AuthenticationService
 
+logger = logging.getLogger(__name__)
+
 def auth_required(f):
     """
     Decorador para proteger rutas que requieren autenticación.
@@ -12,12 +14,10 @@ def auth_required(f):
     def decorated(*args, **kwargs):
         try:
             # Obtener el token de autorización
-            print("DEBUG: Verificando autenticación")
             auth_header = request.headers.get('Authorization')
 
-            print(f"DEBUG: Header de autorización: {auth_header}")
             if not auth_header or not auth_header.startswith('Bearer '):
-                print("DEBUG: Token de autorización no proporcionado o inválido")
+                logger.debug("Token de autorización no proporcionado o inválido en %s", request.path)
                 return jsonify({
                     'success': False,
                     'error': 'Se requiere token de autorización'
@@ -25,9 +25,8 @@ def auth_required(f):
                 
             token = auth_header.split(' ')[1]
             
-            # Verificar el token (obteniendo el servicio de autenticación globalmente)
-            from app import auth_service
-            token_result = auth_service.verify_token(token)
+            # Verificar el token con el servicio de autenticación de la aplicación
+            token_result = current_app.auth_service.verify_token(token)
             
             if not token_result.get('valid', False):
                 return jsonify({
@@ -40,8 +39,7 @@ def auth_required(f):
             
             return f(*args, **kwargs)
         except Exception as e:
-            print(f"DEBUG: Error en la autenticación: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("Error en la autenticación: %s", e)
             return jsonify({
                 'success': False,
                 'error': f'Error de autenticación: {str(e)}'
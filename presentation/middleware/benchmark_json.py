@@ -0,0 +1,109 @@
+import argparse
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from domain.entities.image import Image
+from domain.entities.scenario import Scenario
+from domain.entities.story import Story
+from presentation.middleware.json_provider import OrjsonProvider, orjson
+
+logger = logging.getLogger(__name__)
+
+WORD = "bosque"
+
+
+def illustrated_story_payload(num_scenarios: int = 6, prompt_words: int = 200) -> Dict[str, Any]:
+    """Respuesta con la forma de /api/generate-illustrated-story (cuento, escenarios e imágenes)."""
+    story = Story(
+        title="El zorro que aprendió a compartir",
+        content=" ".join([WORD] * 600),
+        context="Un zorro aprende a compartir con los animales del bosque",
+        category="valores"
+    )
+    scenarios = [
+        Scenario(story.id, f"Escena {i}", i, " ".join(["forest"] * prompt_words))
+        for i in range(1, num_scenarios + 1)
+    ]
+    images = [Image(scenario.id, scenario.prompt_for_image, f"/static/images/ab/cd/{i:064x}.png")
+              for i, scenario in enumerate(scenarios)]
+    return {
+        "success": True,
+        "story": story.to_dict(),
+        "scenarios": [scenario.to_dict() for scenario in scenarios],
+        "images": [image.to_dict() for image in images],
+        "summary": f"Se generaron {len(images)} imágenes de {len(scenarios)} escenarios",
+        "mode": "saved"
+    }
+
+
+def library_payload(stories: int = 50) -> Dict[str, Any]:
+    """Respuesta con la forma de /api/stories/recent: una página de resúmenes."""
+    summaries = []
+    for i in range(stories):
+        story = Story(f"Cuento {i}", " ".join([WORD] * 80), "Contexto del cuento", "valores").to_dict()
+        story.update({"scenario_count": 6, "image_count": 6, "cover_image_url": "/static/images/ab/cd/x.png"})
+        summaries.append(story)
+    return {"success": True, "stories": summaries, "next_cursor": "eyJpZCI6ICIxIn0="}
+
+
+class JsonBenchmark:
+    """
+    Compara el costo de serializar respuestas con el proveedor JSON estándar de
+    Flask y con OrjsonProvider: tiempo por respuesta de app.json.response() y
+    tamaño del cuerpo, para un cuento ilustrado completo y una página de la biblioteca.
+    """
+
+    def __init__(self, iterations: int = 2000):
+        self.iterations = iterations
+        self.app = Flask(__name__)
+
+    def run(self) -> List[Dict[str, Any]]:
+        payloads = {
+            "illustrated_story": illustrated_story_payload(),
+            "library_page": library_payload()
+        }
+        providers = {"stdlib": DefaultJSONProvider(self.app)}
+        if orjson is not None:
+            providers["orjson"] = OrjsonProvider(self.app)
+        else:
+            logger.warning("orjson no está instalado: solo se mide el proveedor estándar")
+
+        results = []
+        with self.app.app_context():
+            for payload_name, payload in payloads.items():
+                for provider_name, provider in providers.items():
+                    results.append(self._measure(payload_name, provider_name, lambda: provider.response(payload)))
+        return results
+
+    def _measure(self, payload_name: str, provider_name: str, serialize: Callable[[], Any]) -> Dict[str, Any]:
+        body = serialize().get_data()
+        started = time.perf_counter()
+        for _ in range(self.iterations):
+            serialize()
+        elapsed = time.perf_counter() - started
+        return {
+            "payload": payload_name,
+            "provider": provider_name,
+            "bytes": len(body),
+            "microseconds_per_response": round(elapsed / self.iterations * 1e6, 1)
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada CLI: python -m presentation.middleware.benchmark_json"""
+    parser = argparse.ArgumentParser(description="Compara los proveedores JSON (estándar y orjson)")
+    parser.add_argument("--iterations", type=int, default=2000, help="Serializaciones por combinación")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(JsonBenchmark(iterations=args.iterations).run(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+import gzip
+import io
+import zlib
+from typing import IO, Optional
+
+from flask import Flask, jsonify, request
+from werkzeug.exceptions import BadRequest, HTTPException, RequestEntityTooLarge, UnsupportedMediaType
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import get_input_stream
+
+from config import COMPRESSION_MIN_BYTES, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se negocia gzip
+    brotli = None
+
+# Tipos que vale la pena comprimir (las imágenes ya van comprimidas)
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/html", "text/plain", "text/css", "application/javascript"}
+# Content-Encoding aceptados en los cuerpos de petición
+REQUEST_ENCODINGS = {"gzip", "deflate"} | ({"br"} if brotli is not None else set())
+# Tamaño de los bloques leídos del cuerpo comprimido de una petición
+_READ_CHUNK_BYTES = 64 * 1024
+
+
+class ResponseCompressor:
+    """
+    Negocia y aplica la compresión de un cuerpo de respuesta: brotli si el
+    cliente lo acepta y está instalado, si no gzip, y solo para tipos de texto a
+    partir de min_bytes (por debajo, la cabecera y el costo de CPU no compensan).
+    """
+
+    def __init__(self, min_bytes: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.min_bytes = min_bytes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    @staticmethod
+    def is_compressible(mimetype: Optional[str]) -> bool:
+        return mimetype in COMPRESSIBLE_MIMETYPES
+
+    def choose_encoding(self, accept_encoding: Optional[str], mimetype: Optional[str], size: int) -> Optional[str]:
+        """Retorna 'br', 'gzip' o None (enviar sin comprimir)."""
+        if size < self.min_bytes or not self.is_compressible(mimetype) or not accept_encoding:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        candidates = [("br", accepted.quality("br"))] if brotli is not None else []
+        candidates.append(("gzip", accepted.quality("gzip")))
+        # Con la misma calidad gana el primero (brotli: cuerpos más pequeños para JSON)
+        encoding, quality = max(candidates, key=lambda candidate: candidate[1])
+        return encoding if quality > 0 else None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+
+def create_response_compressor() -> ResponseCompressor:
+    """Crea el compresor con COMPRESSION_MIN_BYTES y los niveles de config.py."""
+    return ResponseCompressor(COMPRESSION_MIN_BYTES, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY)
+
+
+def decompress_stream(stream: IO[bytes], encoding: str, max_bytes: int) -> bytes:
+    """
+    Descomprime un cuerpo gzip, deflate o brotli leyéndolo por bloques. Lanza
+    RequestEntityTooLarge en cuanto el resultado supera max_bytes (así un cuerpo
+    pequeño y muy comprimido no puede agotar la memoria) y BadRequest si los
+    datos no son válidos.
+    """
+    output = bytearray()
+
+    def check_size():
+        if len(output) > max_bytes:
+            raise RequestEntityTooLarge(f"El cuerpo descomprimido supera {max_bytes} bytes")
+
+    try:
+        if encoding == "br":
+            decompressor = brotli.Decompressor()
+            while True:
+                chunk = stream.read(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                output += decompressor.process(chunk, output_buffer_limit=max_bytes + 1 - len(output))
+                check_size()
+                while not decompressor.can_accept_more_data():
+                    output += decompressor.process(b"", output_buffer_limit=max_bytes + 1 - len(output))
+                    check_size()
+            finished = decompressor.is_finished()
+        else:
+            # gzip: cabecera gzip; deflate: formato zlib (RFC 9110)
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS if encoding == "gzip" else zlib.MAX_WBITS)
+            while True:
+                chunk = stream.read(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                while chunk:
+                    output += decompressor.decompress(chunk, max_bytes + 1 - len(output))
+                    check_size()
+                    chunk = decompressor.unconsumed_tail
+            output += decompressor.flush()
+            check_size()
+            finished = decompressor.eof
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        raise BadRequest(f"Cuerpo {encoding} inválido: {e}")
+
+    if not finished:
+        raise BadRequest(f"Cuerpo {encoding} incompleto")
+    return bytes(output)
+
+
+def init_compression(
+    app: Flask,
+    compressor: Optional[ResponseCompressor] = None,
+    max_request_bytes: int = 10 * 1024 * 1024
+) -> None:
+    """
+    Comprime las respuestas grandes según Accept-Encoding (ver ResponseCompressor)
+    y acepta cuerpos de petición con Content-Encoding gzip, deflate o br (por
+    ejemplo el cuento completo que envía /save-previewed-story), que se
+    descomprimen antes de que la vista lea request.get_json. Sin compressor solo
+    se instala la descompresión de peticiones.
+    """
+    @app.before_request
+    def _decompress_request_body():
+        encoding = request.headers.get("Content-Encoding", "").strip().lower()
+        if encoding in ("", "identity"):
+            return None
+        # Errores de descompresión con el mismo formato JSON que el resto de la API
+        # (y que las rutas asíncronas de asgi.py), no la página HTML de werkzeug
+        try:
+            if encoding not in REQUEST_ENCODINGS:
+                raise UnsupportedMediaType(f"Content-Encoding no soportado: {encoding}")
+            environ = request.environ
+            body = decompress_stream(get_input_stream(environ), encoding, max_request_bytes)
+        except HTTPException as e:
+            return jsonify({'success': False, 'error': e.description}), e.code
+
+        environ["wsgi.input"] = io.BytesIO(body)
+        environ["CONTENT_LENGTH"] = str(len(body))
+        environ.pop("HTTP_CONTENT_ENCODING", None)
+        # La petición aún no leyó el cuerpo: descartar lo que haya calculado del original
+        for cached in ("stream", "content_length", "content_encoding"):
+            request.__dict__.pop(cached, None)
+        return None
+
+    if compressor is None:
+        return
+
+    @app.after_request
+    def _compress_response(response):
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or request.method == "HEAD"
+            or not compressor.is_compressible(response.mimetype)
+        ):
+            return response
+
+        body = response.get_data()
+        # La representación depende de Accept-Encoding aunque esta vez no se comprima
+        response.vary.add("Accept-Encoding")
+        encoding = compressor.choose_encoding(
+            request.headers.get("Accept-Encoding"), response.mimetype, len(body)
+        )
+        if encoding is None:
+            return response
+
+        response.set_data(compressor.compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
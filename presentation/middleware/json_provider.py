@@ -0,0 +1,70 @@
+import logging
+from typing import Any
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el proveedor de Flask
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de Flask sobre orjson: serializa las respuestas de jsonify y
+    parsea los cuerpos de request.get_json varias veces más rápido que el módulo
+    json de la librería estándar.
+
+    UUID, datetime, date y dataclasses se serializan de forma nativa (fechas en
+    ISO 8601, igual que los to_dict de las entidades). Lo que orjson no admite
+    (enteros de más de 64 bits, argumentos como indent, la salida con sangría de
+    modo debug) se delega al proveedor estándar.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._orjson_dumps(obj).decode("utf-8")
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError hereda de ValueError: Flask la traduce en un 400
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Con sangría (modo debug) se mantiene la salida del proveedor estándar
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        try:
+            body = self._orjson_dumps(obj)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+    def _orjson_dumps(self, obj: Any) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
+def init_json_provider(app: Flask, provider: str = "orjson") -> None:
+    """
+    Instala el proveedor JSON de la aplicación: 'orjson' (si está instalado) o
+    'stdlib' (el proveedor predeterminado de Flask).
+    """
+    if provider == "orjson":
+        if orjson is None:
+            logger.warning("orjson no está instalado; se usa el serializador JSON estándar")
+            return
+        app.json = OrjsonProvider(app)
+    elif provider != "stdlib":
+        raise ValueError(f"JSON_PROVIDER desconocido: {provider} (opciones: orjson, stdlib)")
@@ -0,0 +1,63 @@
+import logging
+from typing import Dict
+
+from flask import Flask, g, request
+
+from config import DB_N_PLUS_ONE_THRESHOLD
+from infrastructure.database.query_instrumentation import (
+    QueryProfile, begin_query_profile, current_query_profile, end_query_profile
+)
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+N_PLUS_ONE_HEADER = "X-DB-N-Plus-One"
+PROFILE_HEADERS = [QUERY_COUNT_HEADER, QUERY_TIME_HEADER, N_PLUS_ONE_HEADER]
+
+
+def init_query_profiler(app: Flask) -> None:
+    """
+    Perfila las consultas de cada petición: registra los posibles N+1 (misma
+    sentencia repetida desde el mismo origen) y, en modo debug, devuelve la
+    cantidad de consultas y el tiempo total de base de datos en cabeceras.
+    """
+
+    @app.before_request
+    def _begin_query_profile():
+        g.query_profile_token = begin_query_profile()
+
+    @app.after_request
+    def _report_query_profile(response):
+        profile = current_query_profile()
+        if profile is None:
+            return response
+
+        response.headers.update(report_query_profile(profile, request.method, request.path, app.debug))
+        return response
+
+    @app.teardown_request
+    def _end_query_profile(exc=None):
+        token = g.pop("query_profile_token", None)
+        if token is not None:
+            end_query_profile(token)
+
+
+def report_query_profile(profile: QueryProfile, method: str, path: str, debug: bool = False) -> Dict[str, str]:
+    """
+    Registra los posibles N+1 de una petición y retorna las cabeceras de perfil
+    que se agregan a la respuesta (solo en modo debug).
+    """
+    suspects = profile.n_plus_one(DB_N_PLUS_ONE_THRESHOLD)
+    for suspect in suspects:
+        logger.warning(
+            "Posible N+1 en %s %s: %d ejecuciones (%.1f ms) desde %s: %s",
+            method, path, suspect['count'], suspect['total_ms'], suspect['call_site'], suspect['statement'][:300]
+        )
+
+    if not debug:
+        return {}
+    headers = {QUERY_COUNT_HEADER: str(profile.count), QUERY_TIME_HEADER: f"{profile.total_ms:.1f}"}
+    if suspects:
+        headers[N_PLUS_ONE_HEADER] = str(len(suspects))
+    return headers
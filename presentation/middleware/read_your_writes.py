@@ -0,0 +1,69 @@
+import math
+import time
+from typing import Optional
+
+from flask import Flask, g, request
+from werkzeug.http import dump_cookie
+
+from infrastructure.database.connection import begin_request_scope, end_request_scope, primary_pinned_until
+
+# Cookie (o cabecera, para clientes que no envían cookies) con el instante (epoch)
+# hasta el que la sesión debe leer del primario tras su última escritura
+PIN_COOKIE = "tiyc_primary_until"
+PIN_HEADER = "X-Primary-Pinned-Until"
+
+
+def init_read_your_writes(app: Flask) -> None:
+    """
+    Mantiene la consistencia "leer lo propio escrito" con réplicas de lectura:
+    cada petición parte del valor que trae la sesión, y si escribe se devuelve el
+    nuevo plazo en la cookie y en la cabecera para que las peticiones siguientes
+    también lean del primario hasta entonces.
+    """
+
+    @app.before_request
+    def _begin_routing_scope():
+        incoming = incoming_pin(request.cookies.get(PIN_COOKIE), request.headers.get(PIN_HEADER))
+        g.read_your_writes = (begin_request_scope(incoming), incoming)
+
+    @app.after_request
+    def _propagate_pin(response):
+        scope = g.get("read_your_writes")
+        until = outgoing_pin(scope[1]) if scope else None
+        if until:
+            response.set_cookie(PIN_COOKIE, f"{until:.3f}", **_pin_cookie_options(until))
+            response.headers[PIN_HEADER] = f"{until:.3f}"
+        return response
+
+    @app.teardown_request
+    def _end_routing_scope(exc=None):
+        scope = g.pop("read_your_writes", None)
+        if scope:
+            end_request_scope(scope[0])
+
+
+def incoming_pin(cookie_value: Optional[str], header_value: Optional[str]) -> float:
+    """Plazo que trae la sesión en la cookie o, si no la hay, en la cabecera."""
+    return _parse_pin(cookie_value or header_value)
+
+
+def outgoing_pin(incoming: float) -> Optional[float]:
+    """Nuevo plazo a devolver si la petición escribió (lo extiende respecto del recibido)."""
+    until = primary_pinned_until()
+    return until if until > incoming and until > time.time() else None
+
+
+def pin_cookie_header(until: float) -> str:
+    """Valor de Set-Cookie con el plazo, para respuestas que no pasan por Flask (ver asgi.py)."""
+    return dump_cookie(PIN_COOKIE, f"{until:.3f}", **_pin_cookie_options(until))
+
+
+def _pin_cookie_options(until: float) -> dict:
+    return {"max_age": math.ceil(until - time.time()), "httponly": True, "samesite": "Lax"}
+
+
+def _parse_pin(value) -> float:
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from infrastructure.repositories.repository_factory import create_repositories
+
+
+def _require_mysql():
+    """
+    Los tests de MySQL escriben datos: solo corren con TEST_MYSQL=1 y las variables
+    DB_* apuntando a una base de pruebas con las migraciones aplicadas.
+    """
+    if os.getenv("TEST_MYSQL", "").lower() not in ("1", "true", "yes"):
+        pytest.skip("MySQL desactivado (definir TEST_MYSQL=1 y DB_* de una base de pruebas)")
+    from infrastructure.database.connection import DatabaseConnection
+    try:
+        with DatabaseConnection().get_cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+    except Exception as e:
+        pytest.skip(f"Servidor MySQL no disponible: {e}")
+
+
+@pytest.fixture(params=["memory", "sqlite", "mysql"])
+def repositories(request):
+    """Conjunto de repositorios de cada backend; la misma suite corre contra todos."""
+    if request.param == "mysql":
+        _require_mysql()
+    return create_repositories(request.param, ":memory:")
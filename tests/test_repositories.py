@@ -0,0 +1,244 @@
+"""
+Suite común de los repositorios: corre contra cada backend de create_repositories
+(ver el fixture repositories en conftest.py).
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from domain.entities.image import Image
+from domain.entities.scenario import Scenario
+from domain.entities.story import Story
+from domain.entities.teacher import Teacher
+
+
+def make_teacher(repositories):
+    suffix = uuid.uuid4().hex[:12]
+    teacher = Teacher(f"profe_{suffix}", f"profe_{suffix}@example.com", "hash")
+    repositories.teacher.create(teacher)
+    return teacher
+
+
+def make_story(repositories, teacher=None, title="Cuento", content="Había una vez", category="valores",
+               created_at=None, scenario_descriptions=()):
+    story = Story(
+        title=title,
+        content=content,
+        context="Contexto del cuento",
+        category=category,
+        teacher_id=teacher.id if teacher else None,
+        created_at=created_at
+    )
+    repositories.story.create(story)
+    scenarios = []
+    for number, description in enumerate(scenario_descriptions, start=1):
+        scenario = Scenario(story.id, description, number, f"prompt {number}")
+        repositories.scenario.create(scenario)
+        repositories.image.create(Image(scenario.id, scenario.prompt_for_image, f"/static/images/{scenario.id}.png"))
+        scenarios.append(scenario)
+    return story, scenarios
+
+
+def unique_term():
+    """Término que solo aparece en los cuentos del test (la base MySQL puede tener otros datos)."""
+    return "zq" + uuid.uuid4().hex[:10]
+
+
+# --- Paginación por keyset ---
+
+def test_teacher_stories_page_by_keyset(repositories):
+    teacher = make_teacher(repositories)
+    base = datetime(2025, 3, 1, 12, 0, 0)
+    # Dos cuentos con la misma fecha: el id desempata
+    created = [base + timedelta(minutes=minutes) for minutes in (0, 1, 2, 2, 3)]
+    stories = [make_story(repositories, teacher, created_at=moment)[0] for moment in created]
+    expected = [story.id for story in sorted(stories, key=lambda s: (s.created_at, str(s.id)), reverse=True)]
+
+    seen, after = [], None
+    while True:
+        page = repositories.story.get_by_teacher_id(teacher.id, limit=2, after=after)
+        if not page:
+            break
+        seen.extend(story.id for story in page)
+        after = (page[-1].created_at, str(page[-1].id))
+
+    assert seen == expected
+
+
+def test_summaries_page_by_keyset_with_scenario_count(repositories):
+    teacher = make_teacher(repositories)
+    base = datetime(2025, 4, 1, 9, 0, 0)
+    stories = [
+        make_story(repositories, teacher, created_at=base + timedelta(hours=hours), scenario_descriptions=["a", "b"])[0]
+        for hours in range(3)
+    ]
+
+    first = repositories.story.get_summaries(teacher_id=teacher.id, limit=2)
+    rest = repositories.story.get_summaries(
+        teacher_id=teacher.id, limit=2, after=(first[-1].created_at, str(first[-1].id))
+    )
+
+    assert [summary.id for summary in first + rest] == [story.id for story in reversed(stories)]
+    assert all(summary.scenario_count == 2 for summary in first + rest)
+    assert all(summary.cover_image_url for summary in first + rest)
+
+
+# --- Búsqueda ---
+
+def test_search_matches_story_text_and_scenarios(repositories):
+    term = unique_term()
+    in_title, _ = make_story(repositories, title=f"El {term} del bosque")
+    in_scenario, _ = make_story(repositories, scenario_descriptions=[f"Un {term} en el río"])
+    make_story(repositories, title="Sin coincidencias")
+
+    results = repositories.story.search([term])
+
+    assert {summary.id for summary in results} == {in_title.id, in_scenario.id}
+    assert all(summary.extra["relevance"] > 0 for summary in results)
+
+
+def test_search_requires_every_term(repositories):
+    term, other = unique_term(), unique_term()
+    both, _ = make_story(repositories, title=f"{term} y {other}")
+    make_story(repositories, title=f"Solo {term}")
+
+    assert [summary.id for summary in repositories.story.search([term, other])] == [both.id]
+
+
+def test_search_applies_filters(repositories):
+    term = unique_term()
+    teacher = make_teacher(repositories)
+    wanted, _ = make_story(repositories, teacher, title=f"{term} valiente", category="valores")
+    make_story(repositories, teacher, title=f"{term} curioso", category="ciencia")
+    make_story(repositories, make_teacher(repositories), title=f"{term} de otro profesor", category="valores")
+
+    results = repositories.story.search([term], {"teacher_id": teacher.id, "category": "valores"})
+
+    assert [summary.id for summary in results] == [wanted.id]
+
+
+def test_search_pages_with_relevance_cursor(repositories):
+    term = unique_term()
+    for number in range(5):
+        make_story(repositories, title=f"{term} número {number}")
+    single_page = [summary.id for summary in repositories.story.search([term], limit=10)]
+
+    seen, after = [], None
+    while True:
+        page = repositories.story.search([term], limit=2, after=after)
+        if not page:
+            break
+        seen.extend(summary.id for summary in page)
+        after = (page[-1].extra["relevance"], str(page[-1].id))
+
+    assert len(single_page) == 5
+    assert seen == single_page
+
+
+# --- Cascadas ---
+
+def test_delete_story_cascades_to_scenarios_and_images(repositories):
+    story, scenarios = make_story(repositories, scenario_descriptions=["uno", "dos"])
+
+    assert repositories.story.delete(story.id)
+
+    assert repositories.story.get_by_id(story.id) is None
+    assert repositories.story.get_illustrated(story.id) is None
+    assert repositories.scenario.get_by_story_id(story.id) == []
+    assert all(repositories.image.get_by_scenario_id(scenario.id) is None for scenario in scenarios)
+
+
+def test_delete_scenario_cascades_to_its_image(repositories):
+    story, (kept, removed) = make_story(repositories, scenario_descriptions=["uno", "dos"])
+
+    assert repositories.scenario.delete(removed.id)
+
+    assert repositories.image.get_by_scenario_id(removed.id) is None
+    assert repositories.image.get_by_scenario_id(kept.id) is not None
+    assert [scenario.id for scenario in repositories.scenario.get_by_story_id(story.id)] == [kept.id]
+
+
+def test_delete_teacher_keeps_stories_without_owner(repositories):
+    teacher = make_teacher(repositories)
+    story, _ = make_story(repositories, teacher)
+
+    assert repositories.teacher.delete(teacher.id)
+
+    assert repositories.teacher.get_by_id(teacher.id) is None
+    assert repositories.story.get_by_id(story.id).teacher_id is None
+
+
+# --- Unidad de trabajo ---
+
+def test_unit_of_work_rolls_back_every_repository(repositories):
+    story = Story("Cuento", "Había una vez", "Contexto", "valores")
+    scenario = Scenario(story.id, "escena", 1, "prompt")
+
+    with pytest.raises(RuntimeError):
+        with repositories.unit_of_work.transaction():
+            repositories.story.create(story)
+            repositories.scenario.create(scenario)
+            raise RuntimeError("fallo a mitad del guardado")
+
+    assert repositories.story.get_by_id(story.id) is None
+    assert repositories.scenario.get_by_id(scenario.id) is None
+
+
+def test_unit_of_work_commits_every_repository(repositories):
+    story = Story("Cuento", "Había una vez", "Contexto", "valores")
+    scenario = Scenario(story.id, "escena", 1, "prompt")
+
+    with repositories.unit_of_work.transaction():
+        repositories.story.create(story)
+        repositories.scenario.create_many([scenario])
+
+    assert repositories.story.get_by_id(story.id) is not None
+    assert [s.id for s in repositories.scenario.get_by_story_id(story.id)] == [scenario.id]
+
+
+# --- Multi-get ---
+
+def test_get_many_keeps_input_order_and_skips_missing(repositories):
+    stories = [make_story(repositories, title=f"Cuento {number}")[0] for number in range(3)]
+    missing = uuid.uuid4()
+    requested = [stories[2].id, missing, stories[0].id, stories[2].id, stories[1].id]
+
+    found = repositories.story.get_many(requested)
+
+    assert [story.id for story in found] == [stories[2].id, stories[0].id, stories[1].id]
+
+
+def test_get_illustrated_many_keeps_input_order(repositories):
+    first, _ = make_story(repositories, scenario_descriptions=["uno"])
+    second, _ = make_story(repositories, scenario_descriptions=["dos", "tres"])
+
+    found = repositories.story.get_illustrated_many([second.id, first.id])
+
+    assert [item["story"]["id"] for item in found] == [str(second.id), str(first.id)]
+    assert [len(item["scenarios"]) for item in found] == [2, 1]
+
+
+# --- Ids como texto ---
+
+def test_multi_gets_accept_string_ids(repositories):
+    teacher = make_teacher(repositories)
+    story, (scenario,) = make_story(repositories, teacher, scenario_descriptions=["uno"])
+    image = repositories.image.get_by_scenario_id(scenario.id)
+
+    assert [s.id for s in repositories.story.get_many([str(story.id)])] == [story.id]
+    assert [s.id for s in repositories.scenario.get_many([str(scenario.id)])] == [scenario.id]
+    assert [i.id for i in repositories.image.get_many([str(image.id)])] == [image.id]
+    assert [i.id for i in repositories.image.get_by_scenario_ids([str(scenario.id)])] == [image.id]
+    assert [t.id for t in repositories.teacher.get_many([str(teacher.id)])] == [teacher.id]
+    assert [item["story"]["id"] for item in repositories.story.get_illustrated_many([str(story.id)])] == [str(story.id)]
+
+
+def test_single_gets_accept_string_ids(repositories):
+    teacher = make_teacher(repositories)
+    story, (scenario,) = make_story(repositories, teacher, scenario_descriptions=["uno"])
+
+    assert repositories.teacher.get_by_id(str(teacher.id)).id == teacher.id
+    assert repositories.story.get_by_id(str(story.id)).id == story.id
+    assert repositories.image.get_by_scenario_id(str(scenario.id)) is not None
+    assert [s.id for s in repositories.story.get_by_teacher_id(str(teacher.id))] == [story.id]
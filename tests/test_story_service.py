@@ -0,0 +1,35 @@
+"""
+Validación de parámetros de StoryService: los valores mal formados se rechazan con
+ValueError (la ruta responde 400) en lugar de devolver una página vacía.
+"""
+import pytest
+
+from application.services.story_service import StoryService
+from tests.test_repositories import make_story, make_teacher
+
+
+@pytest.fixture
+def story_service(repositories):
+    return StoryService(None, repositories.story, repositories.unit_of_work)
+
+
+def test_stories_by_teacher_rejects_malformed_teacher_id(story_service):
+    with pytest.raises(ValueError, match="teacher_id"):
+        story_service.get_stories_by_teacher("no-es-un-uuid")
+
+
+def test_stories_by_teacher_rejects_malformed_cursor(story_service, repositories):
+    teacher = make_teacher(repositories)
+
+    with pytest.raises(ValueError):
+        story_service.get_stories_by_teacher(str(teacher.id), cursor="no-es-un-cursor")
+
+
+def test_stories_by_teacher_pages_valid_teacher(story_service, repositories):
+    teacher = make_teacher(repositories)
+    story, _ = make_story(repositories, teacher)
+
+    page = story_service.get_stories_by_teacher(str(teacher.id))
+
+    assert [summary["id"] for summary in page["stories"]] == [str(story.id)]
+    assert page["next_cursor"] is None
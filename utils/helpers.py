@@ -1,12 +1,49 @@
 import uuid
 import re
-from typing import Dict, Any, Optional, List
+import json
+import base64
+import os
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = [0, 0]  # último (milisegundo, contador) emitido
+
+def uuid7() -> uuid.UUID:
+    """
+    Genera un UUID versión 7 (RFC 9562): 48 bits de timestamp en milisegundos
+    seguidos de bits aleatorios. Los ids quedan ordenados por tiempo de creación,
+    así que las inserciones se agrupan al final del índice en lugar de dispersarse.
+    Dentro del mismo milisegundo un contador de 12 bits mantiene el orden.
+    """
+    with _uuid7_lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+        last_ms, counter = _uuid7_last
+        if timestamp_ms <= last_ms:
+            timestamp_ms = last_ms
+            counter += 1
+            if counter > 0xFFF:
+                timestamp_ms += 1
+                counter = 0
+        else:
+            counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        _uuid7_last[0], _uuid7_last[1] = timestamp_ms, counter
+
+    random_bits = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0b10 << 62
+    value |= random_bits
+    return uuid.UUID(int=value)
 
 def generate_uuid():
     """
-    Genera un UUID único para identificadores de entidades.
+    Genera un UUID único (v7, ordenado por tiempo) para identificadores de entidades.
     """
-    return str(uuid.uuid4())
+    return str(uuid7())
 
 def sanitize_filename(filename):
     """
@@ -53,4 +90,46 @@ def paginate_results(items: List[Dict[str, Any]], page: int = 1, page_size: int
         'total_pages': total_pages,
         'has_next': page < total_pages,
         'has_prev': page > 1
-    }
\ No newline at end of file
+    }
+
+def _encode_cursor_payload(payload: list) -> str:
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _decode_cursor_payload(cursor: str) -> list:
+    padded = cursor + '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+
+def encode_cursor(created_at: datetime, item_id: str) -> str:
+    """
+    Codifica la posición de un elemento como un cursor opaco para paginación por keyset.
+    """
+    return _encode_cursor_payload([created_at.isoformat(), str(item_id)])
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decodifica un cursor generado por encode_cursor.
+    Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        created_at, item_id = _decode_cursor_payload(cursor)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(item_id))
+    except Exception:
+        raise ValueError("Cursor de paginación no válido")
+
+def encode_score_cursor(score: float, item_id: str) -> str:
+    """
+    Codifica la posición de un resultado ordenado por relevancia (búsquedas).
+    """
+    return _encode_cursor_payload([score, str(item_id)])
+
+def decode_score_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decodifica un cursor generado por encode_score_cursor.
+    Lanza ValueError si el cursor no es válido.
+    """
+    try:
+        score, item_id = _decode_cursor_payload(cursor)
+        return float(score), str(uuid.UUID(item_id))
+    except Exception:
+        raise ValueError("Cursor de paginación no válido")
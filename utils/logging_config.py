@@ -1,39 +1,135 @@
+import atexit
+import copy
+import datetime
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
 
-def configure_logging(app, log_level=logging.INFO):
+from flask.logging import default_handler
+
+from utils.post_fork import register_post_fork_hook
+
+# Atributos propios de LogRecord: cualquier otro atributo llegó por extra={...}
+# y se incluye como campo del registro JSON
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# Handler de la cola (en el logger raíz) y listener que escribe en los destinos
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON: fecha, nivel, logger, mensaje,
+    origen, proceso e hilo, más los campos pasados con extra={...} y la traza de
+    la excepción si la hay.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler que conserva la traza de la excepción en exc_text en lugar de
+    concatenarla al mensaje, para que JsonFormatter la emita como campo aparte.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolver los argumentos aquí: pueden cambiar antes de que el listener los lea
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(app, log_level=logging.INFO, console: bool = True):
     """
     Configura el sistema de logging para la aplicación Flask.
+
+    Todos los loggers propagan al raíz, que solo encola los registros: un
+    QueueListener en su propio hilo los formatea como JSON y los escribe en
+    logs/app.log (con rotación) y, si console es True, en stdout. Así la
+    escritura en disco nunca ocurre en el hilo de la petición.
+
+    Llamarla de nuevo (otra create_app en el mismo proceso) solo ajusta el nivel.
     """
-    # Asegurar que el directorio de logs exista
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
-    os.makedirs(logs_dir, exist_ok=True)
-    
-    # Crear el manejador de archivo con rotación
-    log_file = os.path.join(logs_dir, 'app.log')
-    file_handler = RotatingFileHandler(log_file, maxBytes=10485760, backupCount=10)
-    
-    # Definir formato para los logs
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(log_level)
-    
-    # Configurar el logger de la aplicación Flask
-    app.logger.addHandler(file_handler)
-    app.logger.setLevel(log_level)
-    
-    # Configurar el logger raíz también
+    global _queue_handler, _listener
+
     root_logger = logging.getLogger()
-    root_logger.addHandler(file_handler)
     root_logger.setLevel(log_level)
-    
-    # Eliminar handlers por defecto
-    app.logger.handlers = [file_handler]
-    
-    # Log de inicio
+    # app.logger propaga al raíz; sin su handler por defecto cada registro se escribe una sola vez
+    app.logger.removeHandler(default_handler)
+    app.logger.setLevel(logging.NOTSET)
+
+    if _queue_handler is None:
+        # Asegurar que el directorio de logs exista
+        logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
+        os.makedirs(logs_dir, exist_ok=True)
+
+        formatter = JsonFormatter()
+        file_handler = RotatingFileHandler(os.path.join(logs_dir, 'app.log'), maxBytes=10485760, backupCount=10)
+        file_handler.setFormatter(formatter)
+        handlers = [file_handler]
+        if console:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        _queue_handler = StructuredQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        root_logger.addHandler(_queue_handler)
+        # Vaciar la cola al salir, y reiniciar el listener en cada worker tras un fork
+        atexit.register(_stop_listener)
+        register_post_fork_hook(_restart_listener_after_fork)
+
     app.logger.info('Logging configurado y aplicación iniciada')
-    
-    return app
\ No newline at end of file
+
+    return app
+
+
+def _stop_listener() -> None:
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _restart_listener_after_fork() -> None:
+    """
+    El hilo del listener no existe en el proceso hijo y la cola heredada pudo
+    quedar con su lock tomado: el hijo usa una cola nueva con su propio listener.
+    """
+    global _listener
+    if _queue_handler is None:
+        return
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
@@ -0,0 +1,32 @@
+import logging
+import os
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+# Hooks que se ejecutan en el proceso hijo tras cada fork, en orden de registro
+_post_fork_hooks: List[Callable[[], None]] = []
+
+
+def register_post_fork_hook(hook: Callable[[], None]) -> Callable[[], None]:
+    """
+    Registra una función que reinicializa, en el proceso hijo de un fork (p. ej. un
+    worker de gunicorn con preload_app), un recurso creado antes del fork: sockets,
+    conexiones o locks que el hijo no debe compartir con el padre.
+    """
+    _post_fork_hooks.append(hook)
+    return hook
+
+
+def run_post_fork_hooks() -> None:
+    """Ejecuta los hooks registrados. Un hook que falla no impide ejecutar los demás."""
+    for hook in _post_fork_hooks:
+        try:
+            hook()
+        except Exception as e:
+            logger.error("Error en hook post-fork %s: %s", getattr(hook, '__qualname__', hook), e)
+
+
+# Se ejecutan con cualquier os.fork(), sea cual sea el servidor que lo haga
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=run_post_fork_hooks)